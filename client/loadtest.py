@@ -0,0 +1,25 @@
+import argparse
+import asyncio
+from src.server import LoadTest, TICK_RATE
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Maras: The Legacy of Olympus - server load test")
+    parser.add_argument("--players", default="10,25,50,100", help="comma separated number of bots in each step")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per step")
+    parser.add_argument("--processes", type=int, default=2, help="worker processes running the bots")
+    parser.add_argument("--map", default="maps/map.json", help="tile map simulated by the server")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation ticks per second")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the bots' decisions")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    steps = [int(players) for players in args.players.split(",")]
+    load_test = LoadTest(steps, args.duration, args.processes, args.map, args.tick_rate, args.seed)
+    try:
+        asyncio.run(load_test.run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,52 @@
+import argparse
+import os
 import pygame
 import sys
 from ui import Menu
 from src.game_logic.game import Game
+from src.rendering import RenderQuality, QUALITY_PRESETS, DEFAULT_QUALITY
+from src.network import NetworkClient
+from src.systems import InputRecorder, InputReplayer
+from src.utils import metrics, assets, SurfaceCache, CACHE_DIRECTORY, frame_pacer, GAMEPLAY_FPS, MENU_FPS
 
-def initialize_pygame():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Maras: The Legacy of Olympus")
+    parser.add_argument("--record", metavar="PATH", help="record input commands and state hashes to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded input log and verify state hashes")
+    parser.add_argument("--realtime", action="store_true", help="render the replay at normal speed instead of running headless")
+    parser.add_argument("--event-log", metavar="PATH", help="append combat and game events to PATH as JSON lines")
+    parser.add_argument("--metrics", metavar="PATH", help="write Prometheus metrics to PATH every few seconds")
+    parser.add_argument("--asset-cache", metavar="DIR", default=CACHE_DIRECTORY, help="keep decoded images in DIR to skip decoding PNGs on the next start")
+    parser.add_argument("--no-asset-cache", action="store_true", help="decode every image from its PNG")
+    parser.add_argument("--quality", choices=sorted(QUALITY_PRESETS), default=DEFAULT_QUALITY, help="render quality preset")
+    parser.add_argument("--render-scale", type=float, help="render the world at this fraction of the display resolution, overriding the preset")
+    parser.add_argument("--dynamic-resolution", action="store_true", help="lower the render scale while frames take too long to draw")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="play on a game server instead of simulating the world locally")
+    parser.add_argument("--name", default="player", help="the name to log in to the server with")
+    parser.add_argument("--latency", type=float, default=0, help="simulated round-trip latency to the server in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0, help="simulated extra delay of up to this many milliseconds per message")
+    return parser.parse_args()
+
+def initialize_pygame(screen_size=None):
     pygame.init()
     screen_info = pygame.display.Info()
-    SCREEN_SIZE = (screen_info.current_w, screen_info.current_h)
+    SCREEN_SIZE = screen_size or (screen_info.current_w, screen_info.current_h)
     screen = pygame.display.set_mode(SCREEN_SIZE)
     pygame.display.set_caption("Map Chunk Rendering")
     return SCREEN_SIZE, screen
 
+def load_assets(menu):
+    # Images are decoded by worker threads while the menu shows how far along they are
+    assets.start()
+    clock = pygame.time.Clock()
+    while assets.loading:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                exit_game()
+        menu.render_progress(assets.poll())
+        pygame.display.flip()
+        clock.tick(60)
+
 def handle_menu_choice(menu, choice):
     if choice == "play":
         return False
@@ -23,47 +59,101 @@ def update_fps_text(font, clock, screen):
     text_rect.bottomright = screen.get_rect().bottomright
     screen.blit(fps_text, text_rect)
 
-def run_game_loop(game, menu):
-    clock = pygame.time.Clock()
-    show_menu = True
+def run_game_loop(game):
     font = pygame.font.Font(None, 36)
 
     while game.running:
-        if show_menu:
-            choice = menu_loop(menu)
-            show_menu = handle_menu_choice(menu, choice)
-        else:
-            game.handle_events()
-            game.update()
-            game.render()
+        game.handle_events()
+        game.update()
+        frame_pacer.tick(GAMEPLAY_FPS)
 
-        # Remove the frame rate cap
-        clock.tick(60)
-        
-        update_fps_text(font, clock, game.screen)
-        pygame.display.flip()
+        # The world keeps its pace in the background, but only a few frames are drawn
+        if frame_pacer.should_render():
+            game.render()
+            update_fps_text(font, frame_pacer.clock, game.screen)
+            pygame.display.flip()
 
 def menu_loop(menu):
+    # The menu only changes on input, so it sleeps until an event arrives and redraws after it
+    redraw = True
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return "quit"
-        
-        menu.render()
-        pygame.display.flip()
-        choice = menu.handle_events()
+        if redraw:
+            menu.render()
+            pygame.display.flip()
+            frame_pacer.tick(MENU_FPS)
+        events = frame_pacer.wait()
+        choice = menu.handle_events(events)
         if choice:
             return choice
+        redraw = bool(events)
 
 def exit_game():
     pygame.quit()
     sys.exit()
 
+def run_replay(path, realtime):
+    replayer = InputReplayer(path)
+    if not realtime:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    SCREEN_SIZE, screen = initialize_pygame(replayer.screen_size)
+    replayer.start()
+    game = Game(SCREEN_SIZE, screen)
+    result = replayer.run(game, realtime=realtime)
+
+    print(f"Replayed {result.ticks} ticks in {result.elapsed:.3f}s ({result.ticks / max(result.elapsed, 1e-9):.0f} ticks/s)")
+    if result.mismatches:
+        print(f"State diverged on {len(result.mismatches)} ticks, first at tick {result.mismatches[0]}")
+        sys.exit(1)
+    pygame.quit()
+
+def connect(args):
+    host, _, port = args.connect.rpartition(":")
+    client = NetworkClient(host or "127.0.0.1", int(port), args.name, args.latency, args.jitter)
+    try:
+        client.connect()
+    except OSError as e:
+        print(f"Could not connect to {args.connect}: {e}")
+        sys.exit(1)
+    return client
+
 def main():
+    args = parse_args()
+    if args.replay:
+        run_replay(args.replay, args.realtime)
+        return
+
     SCREEN_SIZE, screen = initialize_pygame()
-    game = Game(SCREEN_SIZE, screen)
     menu = Menu(screen)
-    run_game_loop(game, menu)
+    if not args.no_asset_cache:
+        assets.cache = SurfaceCache(args.asset_cache)
+    load_assets(menu)
+    handle_menu_choice(menu, menu_loop(menu))
+    # Logged in only once the game starts: nothing reads the server's snapshots before the game loop runs,
+    # and a client that leaves them unread is dropped as too slow
+    client = connect(args) if args.connect else None
+    recorder = None
+    if args.record:
+        recorder = InputRecorder(args.record, SCREEN_SIZE)
+        recorder.start()
+    game = Game(SCREEN_SIZE, screen, client)
+    game.recorder = recorder
+    quality = QUALITY_PRESETS[args.quality]
+    if args.render_scale:
+        quality = RenderQuality(min(max(args.render_scale, 0.25), 1.0), quality.viewport_factor)
+    game.renderer.set_quality(quality, args.dynamic_resolution)
+    if args.event_log:
+        game.event_log.start_file_drain(args.event_log)
+    metrics_dumper = metrics.start_file_dump(args.metrics) if args.metrics else None
+    try:
+        run_game_loop(game)
+    finally:
+        game.event_log.stop_file_drain()
+        if metrics_dumper:
+            metrics_dumper.stop()
+        if recorder:
+            recorder.close()
+        if client:
+            client.close()
 
 if __name__ == "__main__":
     main()
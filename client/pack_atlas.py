@@ -0,0 +1,32 @@
+import argparse
+import json
+from src.utils.assets import MANIFEST_FILE
+from src.utils.atlas import ATLAS_DIRECTORY, ATLAS_SIZE, MAX_SPRITE_SIZE, find_sprites, build_atlases
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Maras: The Legacy of Olympus - pack small sprites into texture atlases")
+    parser.add_argument("--manifest", default=MANIFEST_FILE, help="asset manifest to update with the atlas pages")
+    parser.add_argument("--output", default=ATLAS_DIRECTORY, help="directory the atlas pages are written to")
+    parser.add_argument("--size", type=int, default=ATLAS_SIZE, help="width and maximum height of a page in pixels")
+    parser.add_argument("--max-sprite-size", type=int, default=MAX_SPRITE_SIZE, help="largest image packed, in pixels either way")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    sprites = find_sprites(max_size=min(args.max_sprite_size, args.size))
+    indexes = build_atlases(sprites, args.output, args.size)
+
+    with open(args.manifest, encoding="utf-8") as f:
+        manifest = json.load(f)
+    packed = set(sprites)
+    images = [entry for entry in manifest["images"] if entry["path"] not in packed]
+    with open(args.manifest, "w", encoding="utf-8") as f:
+        f.write('{\n    "atlases": [\n')
+        f.write(",\n".join(f"        {json.dumps(index)}" for index in indexes))
+        f.write('\n    ],\n    "images": [\n')
+        f.write(",\n".join(f"        {json.dumps(entry)}" for entry in images))
+        f.write("\n    ]\n}\n")
+    print(f"Packed {len(sprites)} images into {len(indexes)} atlas pages in {args.output}")
+
+if __name__ == "__main__":
+    main()
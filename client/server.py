@@ -0,0 +1,52 @@
+import argparse
+import asyncio
+from src.game_logic import ZONES
+from src.server import GameServer, ZoneWorld, ZoneCluster, PartitionedWorld, PlayerStore, TICK_RATE, DB_FILE, METRICS_PORT
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Maras: The Legacy of Olympus - game server")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=7777, help="TCP port to listen on")
+    parser.add_argument("--map", default="maps/map.json", help="tile map simulated by this server")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation ticks per second")
+    parser.add_argument("--db", default=DB_FILE, help="SQLite file players are saved in; empty to not save")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                        help="port serving Prometheus metrics on HOST, zone i on METRICS_PORT + i; 0 to not serve them")
+    parser.add_argument("--zones", action="store_true",
+                        help="serve every zone in its own process, zone i on port PORT + i, handing players off between them")
+    parser.add_argument("--regions", metavar="COLUMNSxROWS",
+                        help="split the map into a grid of regions, each simulated by its own process, e.g. 2x2")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.zones:
+        cluster = ZoneCluster(args.host, args.port, args.tick_rate, db_file=args.db or None, metrics_port=args.metrics_port or None)
+        cluster.start()
+        try:
+            cluster.join()
+        except KeyboardInterrupt:
+            cluster.stop()
+        return
+    if args.regions:
+        columns, rows = (int(count) for count in args.regions.lower().split("x"))
+        zone = next(zone for zone in ZONES.values() if zone.map_file == args.map)
+        world = PartitionedWorld(zone, columns, rows, args.tick_rate)
+    else:
+        world = ZoneWorld(args.map)
+    store = PlayerStore(args.db) if args.db else None
+    if store is not None:
+        store.start()
+    server = GameServer(world, args.host, args.port, args.tick_rate, store=store, metrics_port=args.metrics_port or None)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store is not None:
+            store.close()
+        if args.regions:
+            world.close()
+
+if __name__ == "__main__":
+    main()
@@ -2,4 +2,4 @@
 from .player import Player, MAX_PLAYER_HEALTH
 from .enemy import Enemy
 from .npc import NPC
-from .skill import Skill
\ No newline at end of file
+from .skill import Skill, default_skills, SHAPE_SINGLE, SHAPE_CIRCLE, SHAPE_CONE, SHAPE_LINE
\ No newline at end of file
@@ -2,7 +2,10 @@
 
 import math
 import random
-import time
+from src.utils import sim_clock, metrics
+
+ENEMY_DEATHS = metrics.counter("enemy_deaths_total", "Enemies killed")
+ENEMY_RESPAWNS = metrics.counter("enemy_respawns_total", "Enemies that came back after being killed")
 
 class Enemy:
     """
@@ -65,6 +68,41 @@ class Enemy:
         """Set a new y-coordinate for the enemy."""
         self._y = value
 
+    def get_state(self):
+        """
+        Get the state of the enemy in a picklable form.
+
+        Returns:
+            dict: Position, spawn point, level, health and attack and respawn timers.
+        """
+        return {
+            "position": (self._x, self._y),
+            "initial_position": (self.initial_x, self.initial_y),
+            "level": self.level,
+            "health": self.health,
+            "alive": self.alive,
+            "last_attack_time": self.last_attack_time,
+            "attack_cooldown": self.attack_cooldown,
+            "respawn_time": self.respawn_time,
+            "respawn_timer": self.respawn_timer,
+        }
+
+    def set_state(self, state):
+        """
+        Restore state saved by `get_state`. The level is fixed at construction and not restored.
+
+        Args:
+            state (dict): The saved state.
+        """
+        self._x, self._y = state["position"]
+        self.initial_x, self.initial_y = state["initial_position"]
+        self.health = state["health"]
+        self.alive = state["alive"]
+        self.last_attack_time = state["last_attack_time"]
+        self.attack_cooldown = state["attack_cooldown"]
+        self.respawn_time = state["respawn_time"]
+        self.respawn_timer = state["respawn_timer"]
+
     def get_health_percentage(self):
         """
         Get the current health as a percentage of the maximum health.
@@ -79,12 +117,14 @@ class Enemy:
         Update the enemy's state, including movement towards the player if within chase distance.
 
         Args:
-            player (Player): The player object to interact with.
+            player (Player): The player object to interact with, or None when no player is nearby.
         """
         if not self.alive:
-            if time.time() >= self.respawn_timer:
+            if sim_clock.time() >= self.respawn_timer:
                 self.respawn()
             return
+        if player is None:
+            return
 
         distance_to_player = self._calculate_distance(player._x, player._y)
 
@@ -99,6 +139,7 @@ class Enemy:
         self.health = self.max_health
         self.alive = True
         self.respawn_time = self._random_respawn_time()
+        ENEMY_RESPAWNS.inc()
 
     def attack_player(self, player):
         """
@@ -107,7 +148,7 @@ class Enemy:
         Args:
             player (Player): The player object to attack.
         """
-        current_time = time.time()
+        current_time = sim_clock.time()
         if self._is_within_range(player._x, player._y, self.attack_range) and (current_time - self.last_attack_time) >= self.attack_cooldown:
             random_attack_damage = random.randint(1, 3) + (self.level - 1)  # Increase damage with level
             player.take_damage(random_attack_damage)
@@ -120,10 +161,17 @@ class Enemy:
 
         Args:
             damage (float): The amount of damage to be taken.
+
+        Returns:
+            bool: True if this hit killed the enemy, False otherwise.
         """
+        if not self.alive:
+            return False
         self.health -= damage
         if self.health <= 0:
             self.destroy()
+            return True
+        return False
 
     def get_experience_reward(self):
         """
@@ -137,11 +185,16 @@ class Enemy:
         return int(base_experience + (self.level - 1) * level_multiplier)
     
     def destroy(self):
-        """Mark the enemy as dead and start the respawn timer."""
+        """
+        Mark the enemy as dead, drop its loot and start the respawn timer.
+
+        Experience is not awarded here; the attacker collects the rewards of every
+        enemy its skill killed and applies them in one update.
+        """
         self.alive = False
-        self.respawn_timer = time.time() + self.respawn_time
-        # Notify the game to increment the player's kill count and add experience
-        self.game.player.increase_kill_count(self.get_experience_reward())
+        ENEMY_DEATHS.inc()
+        self.respawn_timer = sim_clock.time() + self.respawn_time
+        self.game.world_items.drop_loot(self)
 
     def _calculate_distance(self, target_x, target_y):
         """
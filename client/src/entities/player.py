@@ -1,36 +1,40 @@
 # src/entities/player.py
 import pygame
-from src.utils import Stack
+from src.utils import Inventory, EventLog, sim_clock, metrics, DAMAGE, KILL, LEVEL_UP, RESPAWN, ITEM_GAINED
 import math
 
 DEFAULT_PLAYER_SIZE = 100
 INITIAL_PLAYER_POSITION = (10000 / 2, 10000 / 2)
 MAX_PLAYER_HEALTH = 100
 
+PLAYER_RESPAWNS = metrics.counter("player_respawns_total", "Players respawned after dying")
+
 class Player:
     """
     Represents the player in the game, handling position, health, inventory, and animations.
     """
     
-    def __init__(self, sprite_sheet, size=DEFAULT_PLAYER_SIZE, attack_damage=0, attack_range=100, enemy_kill_count=0):
+    def __init__(self, sprite_sheet, size=DEFAULT_PLAYER_SIZE, attack_damage=0, attack_range=100, enemy_kill_count=0, event_log=None):
         """
         Initialize the Player instance.
 
         Args:
-            sprite_sheet (SpriteSheet): The sprite sheet containing player animations.
+            sprite_sheet (SpriteSheet): The sprite sheet containing player animations, or None on a headless server.
             size (int): The size of the player sprite.
             attack_damage (int): The damage dealt by the player in an attack.
             attack_range (int): The range within which the player can attack enemies.
             enemy_kill_count (int): The initial count of enemies killed by the player.
+            event_log (EventLog): The log combat, level and inventory events are written to.
         """
         self._size = size
         self._x, self._y = INITIAL_PLAYER_POSITION
         self.rect = pygame.Rect(self._x, self._y, size, size)
-        self.inventory = Stack()
+        self.inventory = Inventory()
         self.health = MAX_PLAYER_HEALTH
         self.attack_damage = attack_damage
         self.attack_range = attack_range
         self.enemy_kill_count = enemy_kill_count
+        self.event_log = event_log if event_log is not None else EventLog()
         
         self.sprite_sheet = sprite_sheet
         self.animation_list = {}
@@ -38,7 +42,7 @@ class Player:
         self.action = 0  # 0: idle, 1: walk, 2: jump, 3: attack_1, 4: attack_2, 5: get_hit, 6: die
         self.load_animation(self.action)
         self.image = self.animation_list[self.action][self.frame_index]
-        self.update_time = pygame.time.get_ticks()
+        self.update_time = sim_clock.get_ticks()
         self.current_attack = None
 
         self.skills = []
@@ -71,11 +75,14 @@ class Player:
             # Number of frames for each animation (idle, walk, jump, attack_1, attack_2, get_hit, die)
             animation_steps = [7, 6, 0, 4, 4, 4, 10]
 
-            if action not in self.animation_list:
-                self.animation_list[action] = [
-                    self.sprite_sheet.get_image(x, action, FRAME_WIDTH, FRAME_HEIGHT, SCALE)
-                    for x in range(animation_steps[action])
-                ]
+            if action not in self.animation_list and self.sprite_sheet is None:
+                # Headless players still step through frames so timed actions end at the same moment
+                self.animation_list[action] = [None] * animation_steps[action]
+            elif action not in self.animation_list:
+                # Frames are shared with every other player drawn from the same sheet
+                self.animation_list[action] = self.sprite_sheet.get_animation(
+                    action, animation_steps[action], FRAME_WIDTH, FRAME_HEIGHT, SCALE
+                )
         except Exception as e:
             print(f"Error loading animations: {e}")
 
@@ -83,7 +90,7 @@ class Player:
         """
         Update the current frame of the animation based on the cooldown time.
         """
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.get_ticks()
     
         ANIMATION_COOLDOWN = 100
 
@@ -111,7 +118,7 @@ class Player:
         if new_action != self.action:
             self.action = new_action
             self.frame_index = 0
-            self.update_time = pygame.time.get_ticks()
+            self.update_time = sim_clock.get_ticks()
             self.load_animation(new_action)
             self.action_temporary = temporary
             # print(f"Action updated to: {self.action}, temporary: {self.action_temporary}")
@@ -137,18 +144,61 @@ class Player:
         self._x, self._y = new_position
         self.rect.topleft = new_position
 
-    def add_to_inventory(self, item):
+    def get_state(self):
+        """
+        Get the persistent state of the player in a JSON-serializable form.
+
+        Returns:
+            dict: Position, health, progression, inventory and selected skill.
+        """
+        return {
+            "position": [self._x, self._y],
+            "health": self.health,
+            "max_health": self.max_health,
+            "level": self.level,
+            "experience": self.experience,
+            "experience_to_next_level": self.experience_to_next_level,
+            "enemy_kill_count": self.enemy_kill_count,
+            "inventory": self.inventory.to_dict(),
+            "selected_skill_index": self.selected_skill_index,
+        }
+
+    def set_state(self, state):
+        """
+        Restore state saved by `get_state`.
+
+        Args:
+            state (dict): The saved state.
+        """
+        self.position = tuple(state["position"])
+        self.health = state["health"]
+        self.max_health = state["max_health"]
+        self.level = state["level"]
+        self.experience = state["experience"]
+        self.experience_to_next_level = state["experience_to_next_level"]
+        self.enemy_kill_count = state["enemy_kill_count"]
+        self.inventory.load(state["inventory"])
+        self.select_skill(state["selected_skill_index"])
+
+    def add_to_inventory(self, item, quantity=1):
         """
-        Add an item to the player's inventory.
+        Add items to the player's inventory.
 
         Args:
             item: The item to be added to the inventory.
+            quantity (int): How many to add.
+
+        Returns:
+            int: How many were added; 0 if the inventory or the item's stack is full.
         """
-        self.inventory.push(item)
+        added = self.inventory.add(item, quantity)
+        if added:
+            self.event_log.emit(ITEM_GAINED, item=item, quantity=added)
+        return added
 
     def remove_from_inventory(self):
         """
-        Remove the top item from the player's inventory.
+        Remove one of the most recently added item from the player's inventory.
 
         Returns:
             The removed item.
@@ -157,13 +207,15 @@ class Player:
 
     def remove_item_from_inventory(self, item):
         """
-        Remove a specific item from the player's inventory.
+        Remove one of a specific item from the player's inventory.
 
         Args:
             item: The item to be removed from the inventory.
+
+        Returns:
+            bool: True if the item was held and removed, False otherwise.
         """
-        if item in self.inventory.items:
-            self.inventory.items.remove(item)
+        return self.inventory.remove(item)
 
     def take_damage(self, damage):
         """
@@ -176,14 +228,14 @@ class Player:
         self.update_action(5, temporary=True)
         if self.health == 0 and not self.is_dead:
             self.update_action(6)  # Die action does not revert to idle
-            self.death_time = pygame.time.get_ticks()
+            self.death_time = sim_clock.get_ticks()
             self.is_dead = True
 
     def update(self):
         """
         Update player state, including animations and checking for respawn.
         """
-        if self.is_dead and pygame.time.get_ticks() - self.death_time >= self.respawn_delay:
+        if self.is_dead and sim_clock.get_ticks() - self.death_time >= self.respawn_delay:
             self.respawn()
         else:
             self.update_animation()  # Update animation if not dead or waiting to respawn
@@ -196,7 +248,8 @@ class Player:
         self.health = MAX_PLAYER_HEALTH
         self.update_action(0)
         self.is_dead = False
-        print("Player has respawned at the initial position with full health.")
+        PLAYER_RESPAWNS.inc()
+        self.event_log.emit(RESPAWN)
 
     def heal(self, amount):
         """
@@ -226,23 +279,53 @@ class Player:
         if 0 <= index < len(self.skills):
             self.selected_skill_index = index
 
-    def use_selected_skill(self, enemy):
+    @property
+    def selected_skill(self):
         """
-        Use the selected skill on an enemy.
+        Get the currently selected skill.
 
-        Args:
-            enemy (Enemy): The enemy to use the skill on.
+        Returns:
+            Skill: The selected skill, or None if the player has no skills.
         """
         if self.skills:
-            skill = self.skills[self.selected_skill_index]
-            if skill.use(pygame.time.get_ticks()):
-                enemy.take_damage(skill.damage)
-                print(f"Used skill: {skill.name} on enemy at position ({enemy._x}, {enemy._y})")
-                # Set the appropriate action for the skill
-                if self.selected_skill_index == 0:
-                    self.update_action(3, temporary=True)  # attack_1 is a temporary action
-                elif self.selected_skill_index == 1:
-                    self.update_action(4, temporary=True)  # attack_2 is a temporary action
+            return self.skills[self.selected_skill_index]
+        return None
+
+    def use_selected_skill(self, targets):
+        """
+        Use the selected skill on every enemy it hits.
+
+        Damage is applied to all targets in one pass, and the kills and experience
+        they award are added with a single `increase_kill_count` call.
+
+        Args:
+            targets (list): The enemies hit by the skill, as resolved by `Game.find_skill_targets`.
+        """
+        skill = self.selected_skill
+        if skill and targets:
+            if skill.use(sim_clock.get_ticks()):
+                kills = 0
+                experience = 0
+                for enemy in targets:
+                    if enemy.take_damage(skill.damage):
+                        kills += 1
+                        experience += enemy.get_experience_reward()
+                self.event_log.emit(DAMAGE, skill=skill.name, targets=len(targets), damage=skill.damage)
+                if kills:
+                    self.event_log.emit(KILL, kills=kills, experience=experience)
+                    self.increase_kill_count(experience, kills)
+                self.play_skill_animation()
+
+    def play_skill_animation(self):
+        """
+        Play the attack animation of the selected skill.
+
+        Networked clients call this on its own to show a skill before the server has resolved it.
+        """
+        if self.selected_skill_index == 0:
+            self.update_action(3, temporary=True)  # attack_1 is a temporary action
+        elif self.selected_skill_index == 1:
+            self.update_action(4, temporary=True)  # attack_2 is a temporary action
 
     def _is_enemy_within_range(self, enemy):
         """
@@ -257,9 +340,15 @@ class Player:
         distance_to_enemy = math.hypot(self._x - enemy._x, self._y - enemy._y)
         return distance_to_enemy < self.attack_range
 
-    def increase_kill_count(self, experience_points):
-        """Increase the kill count and add experience when an enemy is killed."""
-        self.enemy_kill_count += 1
+    def increase_kill_count(self, experience_points, kills=1):
+        """
+        Increase the kill count and add experience when enemies are killed.
+
+        Args:
+            experience_points (int): The combined experience reward of the killed enemies.
+            kills (int): The number of enemies killed.
+        """
+        self.enemy_kill_count += kills
         self.add_experience(experience_points)
 
     def add_experience(self, amount):
@@ -278,8 +367,7 @@ class Player:
         Calculate the total attack damage considering the selected skill's damage.
         """
         if self.skills:
-            selected_skill = self.skills[self.selected_skill_index]
-            return self.attack_damage + selected_skill.damage
+            return self.attack_damage + self.selected_skill.damage
         return self.attack_damage
 
     def level_up(self):
@@ -291,4 +379,4 @@ class Player:
 
         self.max_health += 20    # Example: Increase max health
         self.health = self.max_health  # Heal player to full health upon leveling up
-        print(f"Leveled up! New level: {self.level}, New max health: {self.max_health}, New attack damage: {self.attack_damage}")
\ No newline at end of file
+        self.event_log.emit(LEVEL_UP, level=self.level, max_health=self.max_health, attack_damage=self.attack_damage)
\ No newline at end of file
@@ -1,11 +1,20 @@
 # src/entities/skill.py
+import math
+
+# Skill shapes
+SHAPE_SINGLE = "single"  # The nearest enemy within the player's attack range
+SHAPE_CIRCLE = "circle"  # Every enemy within `radius` of the player
+SHAPE_CONE = "cone"      # Every enemy within `radius` and `angle` degrees of the aim direction
+SHAPE_LINE = "line"      # Every enemy within `width / 2` of a `length` long line towards the aim point
+
+CONE_MELEE_RADIUS = 50  # Enemies standing this close are hit by a cone whatever the aim direction
 
 class Skill:
     """
     Represents a skill that a player can use in the game.
     """
-    
-    def __init__(self, name, icon, cooldown, damage):
+
+    def __init__(self, name, icon, cooldown, damage, shape=SHAPE_SINGLE, radius=0, length=0, width=0, angle=90):
         """
         Initialize the Skill instance.
 
@@ -14,12 +23,34 @@ class Skill:
             icon: The icon representing the skill.
             cooldown (float): The cooldown time between uses of the skill in seconds.
             damage (int): The amount of damage the skill deals.
+            shape (str): The area the skill hits, one of the SHAPE_* constants.
+            radius (float): The reach of circle and cone skills.
+            length (float): The reach of line skills.
+            width (float): The thickness of line skills.
+            angle (float): The full opening angle of cone skills in degrees.
         """
         self.name = name
         self.icon = icon
         self.cooldown = cooldown
         self.damage = damage
         self.last_used = 0
+        self.shape = shape
+        self.radius = radius
+        self.length = length
+        self.width = width
+        self.angle = angle
+
+    @property
+    def reach(self):
+        """
+        Get the distance from the caster beyond which the skill cannot hit anything.
+
+        Returns:
+            float: The radius of the area to query for targets.
+        """
+        if self.shape == SHAPE_LINE:
+            return math.hypot(self.length, self.width / 2)
+        return self.radius
 
     def use(self, current_time):
         """
@@ -35,3 +66,64 @@ class Skill:
             self.last_used = current_time
             return True
         return False
+
+    def select_targets(self, origin_x, origin_y, aim_x, aim_y, candidates):
+        """
+        Filter the candidates inside the skill's reach down to the ones its shape covers.
+
+        Args:
+            origin_x (float): The x-coordinate of the caster.
+            origin_y (float): The y-coordinate of the caster.
+            aim_x (float): The x-coordinate the skill is aimed at.
+            aim_y (float): The y-coordinate the skill is aimed at.
+            candidates (list): Enemies already known to be within `reach`.
+
+        Returns:
+            list: The enemies hit by the skill.
+        """
+        if self.shape == SHAPE_CIRCLE:
+            radius_squared = self.radius * self.radius
+            return [
+                enemy for enemy in candidates
+                if (enemy.x - origin_x) ** 2 + (enemy.y - origin_y) ** 2 <= radius_squared
+            ]
+
+        aim_distance = math.hypot(aim_x - origin_x, aim_y - origin_y)
+        if aim_distance == 0:
+            dir_x, dir_y = 1.0, 0.0
+        else:
+            dir_x, dir_y = (aim_x - origin_x) / aim_distance, (aim_y - origin_y) / aim_distance
+
+        targets = []
+        if self.shape == SHAPE_CONE:
+            min_cos = math.cos(math.radians(self.angle / 2))
+            for enemy in candidates:
+                dx, dy = enemy.x - origin_x, enemy.y - origin_y
+                distance = math.hypot(dx, dy)
+                if distance <= self.radius and (distance <= CONE_MELEE_RADIUS or (dx * dir_x + dy * dir_y) / distance >= min_cos):
+                    targets.append(enemy)
+        elif self.shape == SHAPE_LINE:
+            half_width = self.width / 2
+            for enemy in candidates:
+                dx, dy = enemy.x - origin_x, enemy.y - origin_y
+                along = dx * dir_x + dy * dir_y
+                if 0 <= along <= self.length and abs(dx * dir_y - dy * dir_x) <= half_width:
+                    targets.append(enemy)
+        return targets
+
+def default_skills(icons=(None, None)):
+    """
+    Create the skills every player starts with.
+
+    Each call returns new Skill objects, so every player has their own cooldowns.
+
+    Args:
+        icons (tuple): The icons of the two skills; None on a headless server.
+
+    Returns:
+        list: The skills in hotkey order.
+    """
+    return [
+        Skill('attack_1', icons[0], cooldown=1000, damage=10),
+        Skill('attack_2', icons[1], cooldown=2000, damage=50, shape=SHAPE_CONE, radius=250, angle=90),
+    ]
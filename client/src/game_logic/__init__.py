@@ -1,6 +1,11 @@
 # src/game_logic/__init__.py
+from .combat import nearest_enemy, find_skill_targets
 from .interaction_manager import InteractionManager
-from .player_manager import PlayerManager
+from .network_session import NetworkSession
+from .prediction import PlayerPrediction
+from .player_manager import PlayerManager, LOCAL_PLAYER_ID
 from .quest_handler import QuestHandler
 from .spawn_manager import SpawnManager
-from .transition_manager import TransitionManager
\ No newline at end of file
+from .transition_manager import TransitionManager
+from .world_items import WorldItem, WorldItemStore, LootEntry, LOOT_TABLE
+from .zones import Zone, Transition, ZONES, START_ZONE, zone_for_map
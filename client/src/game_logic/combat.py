@@ -0,0 +1,49 @@
+# src/game_logic/combat.py
+import math
+from src.entities import SHAPE_SINGLE
+
+def nearest_enemy(enemy_grid, x, y, attack_range):
+    """
+    Find the nearest living enemy within range of a point.
+
+    Args:
+        enemy_grid (SpatialGrid): The grid indexing the enemies.
+        x (float): The x-coordinate of the point.
+        y (float): The y-coordinate of the point.
+        attack_range (float): The maximum distance.
+
+    Returns:
+        Enemy: The nearest enemy within range if found, else None.
+    """
+    nearest = None
+    nearest_distance = attack_range
+    for enemy in enemy_grid.query_radius(x, y, attack_range):
+        if enemy.alive:
+            distance = math.hypot(x - enemy.x, y - enemy.y)
+            if distance < nearest_distance:
+                nearest, nearest_distance = enemy, distance
+    return nearest
+
+def find_skill_targets(enemy_grid, player, skill, aim_x, aim_y):
+    """
+    Resolve every enemy a player's skill would hit with one query of the enemy grid.
+
+    Args:
+        enemy_grid (SpatialGrid): The grid indexing the enemies.
+        player (Player): The player using the skill.
+        skill (Skill): The skill being used.
+        aim_x (float): The x-coordinate the skill is aimed at.
+        aim_y (float): The y-coordinate the skill is aimed at.
+
+    Returns:
+        list: The enemies hit by the skill.
+    """
+    if skill is None:
+        return []
+    player_x, player_y = player._x, player._y
+    if skill.shape == SHAPE_SINGLE:
+        enemy = nearest_enemy(enemy_grid, player_x, player_y, player.attack_range)
+        return [enemy] if enemy else []
+
+    candidates = [enemy for enemy in enemy_grid.query_radius(player_x, player_y, skill.reach) if enemy.alive]
+    return skill.select_targets(player_x, player_y, aim_x, aim_y, candidates)
@@ -1,10 +1,14 @@
 # src/game_logic/game.py
 import pygame
-from src.entities import Player, Enemy, NPC, Skill
-from src.systems import InputHandler
-from src.game_logic import PlayerManager, QuestHandler, SpawnManager, TransitionManager, InteractionManager
-from src.rendering import GameRenderer, PlayerRenderer, SkillInventoryRenderer, TILE_WELL, TILE_TREE
-from src.utils import ItemHandler, collides_with_barrier, SpriteSheet
+import time
+from src.entities import Player, NPC, default_skills
+from src.systems import InputHandler, InputCommand, MOVE_TARGET, SELECT_SKILL, compute_state_hash
+from src.game_logic import PlayerManager, LOCAL_PLAYER_ID, QuestHandler, SpawnManager, TransitionManager, InteractionManager, WorldItemStore, NetworkSession, nearest_enemy, find_skill_targets, ZONES, START_ZONE, zone_for_map
+from src.rendering import GameRenderer, PlayerRenderer, SkillInventoryRenderer, EventLogRenderer, TILE_WELL, TILE_TREE
+from src.utils import ItemHandler, EventLog, collides_with_barrier, SpriteSheet, SpatialGrid, sim_clock, metrics, assets
+
+UPDATE_SECONDS = metrics.histogram("game_update_seconds", "Time spent in Game.update per frame")
+ENEMY_UPDATE_SECONDS = metrics.histogram("enemy_update_seconds", "Time spent running enemy AI per tick")
 
 class Game:
     """Main game class responsible for initializing and managing the game state, including player, NPCs, enemies, and game events."""
@@ -18,79 +22,106 @@ class Game:
         NPC.TILE_NPC_2: (5680, 3850),
     }
 
-    def __init__(self, screen_size, screen):
+    def __init__(self, screen_size, screen, client=None):
         """
         Initialize the Game instance.
 
         Args:
             screen_size (tuple): The size of the game screen (width, height).
             screen (pygame.Surface): The surface to render the game on.
+            client (NetworkClient): A client connected to a game server, or None to simulate the world locally.
         """
         self.screen_size = screen_size
         self.screen = screen
         self.running = True
         self.CHUNK_SIZE = 200
         self.font = pygame.font.Font(None, 24)
-        self.target_pos = None
-        self.transition_area = pygame.Rect(9800, 200, 200, 200)
+        # Online the server picks the zone, e.g. a player saved on another map is sent to that map's server
+        self.zone = (zone_for_map(client.map_file) if client else None) or ZONES[START_ZONE]
+        self.transition_areas = [(pygame.Rect(transition.area), transition) for transition in self.zone.transitions]
         self.transitioning = False
+        self.tick = 0
+        self.player_chunk = None
+        self.recorder = None  # InputRecorder, set when the session is being recorded
 
-        self.sprite_sheet = SpriteSheet("assets/player/player_spritesheet.png")
-        self.player = Player(self.sprite_sheet)
+        self.event_log = EventLog()
+        self.sprite_sheet = SpriteSheet.get("assets/player/player_spritesheet.png")
+        self.player = Player(self.sprite_sheet, event_log=self.event_log)
 
         self.player_manager = PlayerManager(self)
         self.player_manager.add_player(self.player)
         self.input_handler = InputHandler(self)
         self.renderer = GameRenderer(self)
         self.item_handler = ItemHandler(self.player)
-        self.quest_handler = QuestHandler(self.player, self.screen_size, self.screen, self.item_handler)
+        self.world_items = WorldItemStore(self.CHUNK_SIZE)
+        self.quest_handler = QuestHandler(self.player, self.screen_size, self.screen, self.world_items, self.CHUNK_SIZE)
         self.spawn_manager = SpawnManager(self)
         self.transition_manager = TransitionManager(self)
         self.interaction_manager = InteractionManager(self)
         self.player_renderer = PlayerRenderer(self)
         self.npc = NPC(self.quest_handler)
         self.enemies = []
+        self.enemy_grid = SpatialGrid(self.CHUNK_SIZE)
         self.enemy = None
 
-        self.transition_manager.load_map('maps/map.json')
-        self.spawn_manager.spawn_enemies()
+        self.transition_manager.load_map(self.zone.map_file)
+        # On a server the world is simulated remotely; enemies and items arrive in snapshots
+        self.session = NetworkSession(self, client) if client else None
+        if self.session is None:
+            self.zone.spawn(self.spawn_manager)
 
         self.skill_inventory_renderer = SkillInventoryRenderer(self.player, self.screen, self.font)
+        self.event_log_renderer = EventLogRenderer(self.event_log, self.screen, self.font)
+
+        attack_1_icon = assets.image('assets/player/skill1.png')
+        attack_2_icon = assets.image('assets/player/skill2.png')
 
-        attack_1_icon = pygame.image.load('assets/player/skill1.png')
-        attack_2_icon = pygame.image.load('assets/player/skill2.png')
+        for skill in default_skills((attack_1_icon, attack_2_icon)):
+            self.player.add_skill(skill)
 
-        attack_1 = Skill('attack_1', attack_1_icon, cooldown=1000, damage=10)
-        attack_2 = Skill('attack_2', attack_2_icon, cooldown=2000, damage=50)
+    @property
+    def target_pos(self):
+        """The map position the local player is walking to, or None."""
+        return self.player_manager.get_target(LOCAL_PLAYER_ID)
 
-        self.player.add_skill(attack_1)
-        self.player.add_skill(attack_2)
+    @target_pos.setter
+    def target_pos(self, target_pos):
+        self.player_manager.set_target(LOCAL_PLAYER_ID, target_pos)
 
     def handle_events(self):
         """Handle game events such as player inputs, NPC interactions, and transitions."""
         self.input_handler.handle_events()
+        if self.session is None:
+            self.handle_world_events()
+
+    def handle_world_events(self):
+        """Handle the events caused by the player's position rather than by input."""
         self.check_transition_area_collision()
-        self.handle_npc_interaction(NPC.TILE_NPC_1)
-        self.handle_npc_interaction(NPC.TILE_NPC_2)
+        self.check_player_chunk()
         self.interaction_manager.check_interaction()
+        self.world_items.pickup_near(self.player._x, self.player._y, self.item_handler)
 
     def check_transition_area_collision(self):
         """Check if the player collides with the transition area to trigger a map transition."""
-        if not self.transitioning and self.player.rect.colliderect(self.transition_area):
-            self.transition_manager.transition_to_second_map()
-
-    def handle_npc_interaction(self, tile_id):
-        """
-        Handle interactions with NPCs.
+        if self.transitioning:
+            return
+        for area, transition in self.transition_areas:
+            if self.player.rect.colliderect(area):
+                self.transition_manager.transition(transition)
+                return
 
-        Args:
-            tile_id (int): The tile ID of the NPC.
-        """
-        if self.map_tiles[int(self.player._y) // self.CHUNK_SIZE][int(self.player._x) // self.CHUNK_SIZE] == tile_id:
-            if tile_id == NPC.TILE_NPC_1:
-                self.npc.handle_interaction(self.player, tile_id)
-            elif tile_id == NPC.TILE_NPC_2:
+    def check_player_chunk(self):
+        """Raise NPC and region events when the player walks into a different map chunk."""
+        chunk = self.get_player_chunk()
+        if chunk == self.player_chunk:
+            return
+        self.player_chunk = chunk
+        chunk_x, chunk_y = chunk
+        if 0 <= chunk_y < len(self.map_tiles) and 0 <= chunk_x < len(self.map_tiles[0]):
+            tile_id = self.map_tiles[chunk_y][chunk_x]
+            if tile_id in NPC.POSITIONS:
                 self.npc.handle_interaction(self.player, tile_id)
+        self.quest_handler.enter_region(chunk)
 
     def enemy_within_range(self, player_x, player_y, attack_range):
         """
@@ -104,10 +135,21 @@ class Game:
         Returns:
             Enemy: The nearest enemy within range if found, else None.
         """
-        for enemy in self.enemies:
-            if enemy.alive and self.player._is_enemy_within_range(enemy):
-                return enemy
-        return None
+        return nearest_enemy(self.enemy_grid, player_x, player_y, attack_range)
+
+    def find_skill_targets(self, skill, aim_x, aim_y):
+        """
+        Resolve every enemy a skill would hit with one query of the enemy grid.
+
+        Args:
+            skill (Skill): The skill being used.
+            aim_x (float): The x-coordinate the skill is aimed at.
+            aim_y (float): The y-coordinate the skill is aimed at.
+
+        Returns:
+            list: The enemies hit by the skill.
+        """
+        return find_skill_targets(self.enemy_grid, self.player, skill, aim_x, aim_y)
 
     def spawn_enemy(self, x, y, level=1):
         """
@@ -118,8 +160,7 @@ class Game:
             y (float): The y-coordinate to spawn the enemy.
             level (int): The level of the enemy to spawn.
         """
-        new_enemy = Enemy(x, y, self, level=level)
-        self.enemies.append(new_enemy)
+        self.spawn_manager.spawn_enemy(x, y, level)
 
     def handle_mouse_click(self, mouse_pos):
         """
@@ -131,9 +172,10 @@ class Game:
         skill_rects = self.skill_inventory_renderer.get_skill_rects()
         for i, rect in enumerate(skill_rects):
             if rect.collidepoint(mouse_pos):
-                self.player.select_skill(i)
+                self.input_handler.dispatch(InputCommand(SELECT_SKILL, index=i))
                 return
-        self.target_pos = self.screen_to_map(mouse_pos)
+        target_x, target_y = self.screen_to_map(mouse_pos)
+        self.input_handler.dispatch(InputCommand(MOVE_TARGET, target_x, target_y))
 
     def screen_to_map(self, screen_pos):
         """
@@ -152,13 +194,28 @@ class Game:
 
     def update(self):
         """Update the game state, including player and enemy updates."""
+        started = time.perf_counter()
+        if self.session:
+            self.session.update()
+            UPDATE_SECONDS.observe(time.perf_counter() - started)
+            return
         self.player_manager.update()
+        enemies_started = time.perf_counter()
         for enemy in self.enemies:
             if enemy.alive:
                 enemy.update(self.player)
                 enemy.attack_player(self.player)
             else:
                 enemy.update(self.player)
+            self.enemy_grid.move(enemy, enemy.x, enemy.y)
+        ENEMY_UPDATE_SECONDS.observe(time.perf_counter() - enemies_started)
+        self.world_items.remove_expired()
+
+        if self.recorder:
+            self.recorder.record_state(self.tick, compute_state_hash(self))
+        sim_clock.advance()
+        self.tick += 1
+        UPDATE_SECONDS.observe(time.perf_counter() - started)
 
     def render(self):
         """Render the game state on the screen."""
@@ -166,6 +223,7 @@ class Game:
         self.player_renderer.render_player_coords()
         self.player_renderer.render_player_health()
         self.skill_inventory_renderer.render()
+        self.event_log_renderer.render()
         self.renderer.render_kill_count()
 
     def get_player_chunk(self):
@@ -21,10 +21,10 @@ class InteractionManager:
         """
         Handles interaction with a well, healing the player and possibly converting an empty vial to a vial of water.
         """
-        if self.game.quest_handler.filled_vial_of_water:
+        if self.game.quest_handler.has_flag("well_heals"):
             self.game.player.heal(0.1)
             
-        if "Empty vial" in self.game.player.inventory.items and self.game.quest_handler.empty_vial_returned:
+        if "Empty vial" in self.game.player.inventory and self.game.quest_handler.has_flag("well_fills_vials"):
             self.game.player.remove_item_from_inventory("Empty vial")
             self.game.player.add_to_inventory("Vial of Water")
 
@@ -32,7 +32,7 @@ class InteractionManager:
         """
         Handles interaction with a tree, adding a stick to the player's inventory if not already present.
         """
-        if "Stick" not in self.game.player.inventory.items:
+        if "Stick" not in self.game.player.inventory:
             self.game.player.add_to_inventory("Stick")
 
     def is_within_distance(self, target_x: float, target_y: float, distance: float) -> bool:
@@ -0,0 +1,218 @@
+# src/game_logic/network_session.py
+import time
+from collections import deque
+from src.entities import Player, Enemy
+from src.game_logic.player_manager import LOCAL_PLAYER_ID
+from src.game_logic.prediction import PlayerPrediction
+from src.game_logic.zones import ZONES
+from src.network import InterpolationBuffer, SNAPSHOT, NOTICE, HANDOFF, YOU, PLAYERS, ENEMIES, ITEMS, describe_record
+from src.systems import MOVE_TARGET, SELECT_SKILL, USE_SKILL
+from src.utils import sim_clock
+
+MAX_PREDICTION_STEPS = 5  # Ticks predicted in one frame after a stall before the schedule is reset
+SERVER_ACTIONS = (5, 6)   # get_hit and die come from the server; walking and attacks are predicted
+
+class NetworkSession:
+    """
+    Plays the local game against a `GameServer`.
+
+    The local player is predicted and reconciled with `PlayerPrediction`. Remote
+    players and enemies are drawn from an `InterpolationBuffer`. Items, stats,
+    inventory and quest messages are taken from the server as they arrive.
+    """
+
+    def __init__(self, game, client):
+        """
+        Initialize the NetworkSession.
+
+        Args:
+            game (Game): The game to drive.
+            client (NetworkClient): A connected client.
+        """
+        self.game = game
+        self.client = client
+        self.tick_rate = client.tick_rate
+        self.prediction = PlayerPrediction(game.player, game.collides_with_barrier)
+        self.interpolation = InterpolationBuffer(client.tick_rate)
+        self.enemies = {}      # Server id -> Enemy drawn for it
+        self.items = {}        # Server id -> (record, WorldItem)
+        self.you = None        # The last record of the local player
+        self.started = time.perf_counter()  # Local time of prediction tick 0
+        self.held = deque()    # Messages received while a dialogue blocked the game loop, not applied yet
+        # Quest items are placed by the server, not by the local quest handler
+        game.world_items.sync_spawns(game.quest_handler.quest_items, ())
+        game.quest_handler.idle = self.keep_alive
+
+    def dispatch(self, command):
+        """
+        Send a command to the server and predict its effect.
+
+        Args:
+            command (InputCommand): The command. Debug commands are not sent.
+        """
+        if command.kind not in (MOVE_TARGET, SELECT_SKILL, USE_SKILL):
+            return
+        if command.kind == USE_SKILL:
+            # The server checks the hit against the enemies where they are drawn, not where they are now
+            command = command._replace(view_tick=self.interpolation.render_tick(time.perf_counter()))
+        seq = self.client.send_command(command)
+        self.prediction.apply(seq, command)
+        player = self.game.player
+        if command.kind == SELECT_SKILL:
+            player.select_skill(command.index)
+        elif command.kind == USE_SKILL:
+            skill = player.selected_skill
+            # Damage is resolved by the server; only the animation is shown straight away
+            if skill and self.game.find_skill_targets(skill, command.x, command.y) and skill.use(sim_clock.get_ticks()):
+                player.play_skill_animation()
+
+    def update(self):
+        """Apply the messages received, predict the ticks due and move remote entities."""
+        now = time.perf_counter()
+        self.held.extend(self.client.poll())
+        # A dialogue opened by a notice keeps polling into `held`, so the loop also takes what arrives meanwhile
+        while self.held:
+            message_type, message = self.held.popleft()
+            if message_type == SNAPSHOT:
+                self.apply_snapshot(message, now)
+            elif message_type == NOTICE:
+                self.apply_notice(message)
+            elif message_type == HANDOFF:
+                self.change_zone(message, now)
+        if not self.client.connected:
+            print("Disconnected from the server.")
+            self.game.running = False
+            return
+
+        due = int((now - self.started) * self.tick_rate) - self.prediction.tick
+        if due > MAX_PREDICTION_STEPS:
+            self.started = now - self.prediction.tick / self.tick_rate
+            due = MAX_PREDICTION_STEPS
+        for _ in range(due):
+            self.prediction.step()
+        self.game.player.update()
+        self.game.player_manager.track_player(LOCAL_PLAYER_ID)
+        self.update_remote_entities(now)
+
+    def keep_alive(self):
+        """
+        Read and acknowledge the server's messages while the game loop is blocked, so the
+        snapshot baseline stays current and the server does not drop the client as too slow.
+        The messages are applied by the next `update`.
+        """
+        self.held.extend(self.client.poll())
+
+    def apply_snapshot(self, snapshot, now):
+        """
+        Reconcile the local player with a snapshot and buffer the remote entities.
+
+        Args:
+            snapshot (Snapshot): The decoded snapshot.
+            now (float): The local time it was received.
+        """
+        self.interpolation.add(snapshot.tick, snapshot.state, now)
+        you = describe_record(YOU, snapshot.state["you"])
+        ack_age = snapshot.tick - snapshot.ack_tick if snapshot.ack_tick is not None else None
+        self.prediction.reconcile(you["x"], you["y"], snapshot.ack, ack_age)
+
+        player = self.game.player
+        player.health = you["health"]
+        player.max_health = you["max_health"]
+        player.level = you["level"]
+        player.experience = you["experience"]
+        player.enemy_kill_count = you["kills"]
+        if you["action"] in SERVER_ACTIONS and (self.you is None or self.you["action"] != you["action"]):
+            player.update_action(you["action"], temporary=you["action"] == 5)
+        if self.you is None or self.you["inventory"] != you["inventory"]:
+            # Loaded directly rather than through `add_to_inventory`, so no item events are raised
+            player.inventory.load(you["inventory"])
+        self.you = you
+        self.sync_items(snapshot.state["items"])
+
+    def change_zone(self, handoff, now):
+        """
+        Switch to the zone the server handed the player off to. The map is loaded and
+        everything learned from the old zone is forgotten; the new server's first
+        snapshot places the player.
+
+        Args:
+            handoff (dict): The HANDOFF message.
+            now (float): The current local time.
+        """
+        game = self.game
+        game.zone = ZONES[handoff["zone"]]
+        game.transition_manager.load_map(game.zone.map_file)
+        game.target_pos = None
+        self.prediction = PlayerPrediction(game.player, game.collides_with_barrier)
+        self.interpolation = InterpolationBuffer(self.tick_rate)
+        self.started = now
+        self.you = None
+        self.sync_items({})
+        self.enemies.clear()
+        game.enemies = []
+        game.enemy_grid.rebuild(game.enemies)
+        game.player_manager.clear_remote_players()
+
+    def sync_items(self, records):
+        """Place, move and remove the items on the map to match a snapshot."""
+        world_items = self.game.world_items
+        for item_id in [item_id for item_id in self.items if item_id not in records]:
+            world_items.remove(self.items.pop(item_id)[1])
+        for item_id, record in records.items():
+            placed = self.items.get(item_id)
+            if placed is not None and placed[0] == record:
+                continue
+            if placed is not None:
+                world_items.remove(placed[1])
+            item = describe_record(ITEMS, record)
+            self.items[item_id] = (record, world_items.spawn(item["item"], item["x"], item["y"], item["quantity"]))
+
+    def apply_notice(self, notice):
+        """Show a dialogue or hint raised by a quest on the server."""
+        quest_handler = self.game.quest_handler
+        if "dialogue" in notice:
+            quest_handler.show_dialogue(notice["dialogue"])
+        elif "hint" in notice:
+            quest_handler.show_hint(notice["hint"])
+
+    def update_remote_entities(self, now):
+        """Move remote players and enemies to their interpolated positions."""
+        sampled = self.interpolation.sample(now)
+        game = self.game
+
+        player_manager = game.player_manager
+        players = sampled["players"]
+        for player_id in [player_id for player_id in player_manager.remote_players() if player_id not in players]:
+            player_manager.remove_player(player_id)
+        for player_id, (x, y, record) in players.items():
+            remote = player_manager.players.get(player_id)
+            if remote is None:
+                remote = player_manager.add_player(Player(game.sprite_sheet), player_id)
+            state = describe_record(PLAYERS, record)
+            player_manager.place_player(player_id, x, y)
+            remote.health = state["health"]
+            action = state["action"]
+            if action != remote.action:
+                remote.update_action(action)  # Remote animations follow the server, including the return to idle
+            remote.update_animation()
+
+        enemies = sampled["enemies"]
+        changed = False
+        for enemy_id in [enemy_id for enemy_id in self.enemies if enemy_id not in enemies]:
+            del self.enemies[enemy_id]
+            changed = True
+        for enemy_id, (x, y, record) in enemies.items():
+            state = describe_record(ENEMIES, record)
+            enemy = self.enemies.get(enemy_id)
+            if enemy is None:
+                enemy = self.enemies[enemy_id] = Enemy(x, y, game, level=state["level"])
+                changed = True
+            enemy.x, enemy.y = x, y
+            enemy.health = state["health"]
+            enemy.alive = bool(state["alive"])
+        if changed:
+            game.enemies = list(self.enemies.values())
+            game.enemy_grid.rebuild(game.enemies)
+        else:
+            for enemy in game.enemies:
+                game.enemy_grid.move(enemy, enemy.x, enemy.y)
@@ -1,5 +1,6 @@
 # src/game_logic/player_manager.py
 import pygame
+from src.utils import SpatialGrid
 
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
@@ -8,36 +9,104 @@ BLACK = (0, 0, 0)
 MAP_WIDTH = 10000
 MAP_HEIGHT = 10000
 PLAYER_SPEED = 5
+LOCAL_PLAYER_ID = 0  # Server player ids start at 1
+
+def step_towards_target(player, target_pos, collides_with_barrier):
+    """
+    Move a player one step towards a target position.
+
+    Shared by the client and the server so that both simulate movement the same way.
+
+    Args:
+        player (Player): The player to move.
+        target_pos (tuple): The map position (x, y) the player walks to.
+        collides_with_barrier (callable): Takes a Vector2 and returns True if it is blocked.
+
+    Returns:
+        tuple: The target still to reach, or None once the player has arrived.
+    """
+    move_vector = pygame.math.Vector2(target_pos[0] - player.position[0], target_pos[1] - player.position[1])
+    move_distance = move_vector.length()
+
+    if move_distance > 0:
+        move_vector.normalize_ip()
+        move_vector *= min(move_distance, PLAYER_SPEED)
+        new_pos = pygame.math.Vector2(player.position[0], player.position[1]) + move_vector
+
+        if not collides_with_barrier(new_pos) and 0 <= new_pos.x <= MAP_WIDTH and 0 <= new_pos.y <= MAP_HEIGHT:
+            player.position = (new_pos.x, new_pos.y)
+            player.update_action(1)  # Walking animation
+        else:
+            player.update_action(0)  # Idle animation
+        return target_pos
+
+    player.position = target_pos
+    player.update_action(0)  # Idle animation
+    return None
 
 class PlayerManager:
     def __init__(self, game):
         self.game = game
-        self.players = []
+        self.players = {}  # Player id -> Player; the local player is LOCAL_PLAYER_ID, others use their server ids
+        self.targets = {}  # Player id -> map position the player is walking to
+        self.grid = SpatialGrid(game.CHUNK_SIZE)  # Player positions, to cull the players off screen
 
-    def add_player(self, player):
-        self.players.append(player)
+    def add_player(self, player, player_id=LOCAL_PLAYER_ID):
+        self.players[player_id] = player
+        self.grid.insert(player, player._x, player._y)
+        return player
 
-    def update(self):
-        if self.game.target_pos:
-            self.move_player_to_target()
-        self.game.player.update_animation()
-        self.game.player.update()
-
-    def move_player_to_target(self):
-        move_vector = pygame.math.Vector2(self.game.target_pos[0] - self.game.player.position[0], self.game.target_pos[1] - self.game.player.position[1])
-        move_distance = move_vector.length()
-
-        if move_distance > 0:
-            move_vector.normalize_ip()
-            move_vector *= min(move_distance, PLAYER_SPEED)
-            new_pos = pygame.math.Vector2(self.game.player.position[0], self.game.player.position[1]) + move_vector
-
-            if not self.game.collides_with_barrier(new_pos) and 0 <= new_pos.x <= MAP_WIDTH and 0 <= new_pos.y <= MAP_HEIGHT:
-                self.game.player.position = (new_pos.x, new_pos.y)
-                self.game.player.update_action(1)  # Walking animation
-            else:
-                self.game.player.update_action(0)  # Idle animation
+    def remove_player(self, player_id):
+        player = self.players.pop(player_id, None)
+        self.targets.pop(player_id, None)
+        if player is not None:
+            self.grid.remove(player)
+        return player
+
+    def remote_players(self):
+        return {player_id: player for player_id, player in self.players.items() if player_id != LOCAL_PLAYER_ID}
+
+    def clear_remote_players(self):
+        for player_id in list(self.remote_players()):
+            self.remove_player(player_id)
+
+    def get_target(self, player_id=LOCAL_PLAYER_ID):
+        return self.targets.get(player_id)
+
+    def set_target(self, player_id, target_pos):
+        if target_pos is None:
+            self.targets.pop(player_id, None)
         else:
-            self.game.player.position = self.game.target_pos
-            self.game.target_pos = None
-            self.game.player.update_action(0)  # Idle animation
+            self.targets[player_id] = target_pos
+
+    def place_player(self, player_id, x, y):
+        # Positions set from outside, such as interpolated remote players, keep the culling grid current
+        player = self.players[player_id]
+        player.position = (x, y)
+        self.grid.move(player, x, y)
+
+    def track_player(self, player_id):
+        # For players moved without `update`, such as the predicted local player online
+        player = self.players[player_id]
+        self.grid.move(player, player._x, player._y)
+
+    def get_player_chunk(self):
+        chunk_size = self.game.CHUNK_SIZE
+        return int(self.game.player._x) // chunk_size, int(self.game.player._y) // chunk_size
+
+    def update(self):
+        collides_with_barrier = self.game.collides_with_barrier
+        for player_id, player in self.players.items():
+            target_pos = self.targets.get(player_id)
+            if target_pos:
+                self.set_target(player_id, step_towards_target(player, target_pos, collides_with_barrier))
+            player.update_animation()
+            player.update()
+            self.grid.move(player, player._x, player._y)
+
+    def visible_players(self, left, top, width, height):
+        # Positions are sprite centres, so widen the rectangle by half a sprite to keep players on the edge
+        margin = max((player._size for player in self.players.values()), default=0)
+        visible = self.grid.query_rect(left - margin, top - margin, width + margin * 2, height + margin * 2)
+        visible.sort(key=lambda player: player._y)  # Players further down the screen are drawn over the ones above
+        return visible
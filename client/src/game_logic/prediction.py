@@ -0,0 +1,140 @@
+# src/game_logic/prediction.py
+import math
+from collections import deque
+from src.game_logic.player_manager import step_towards_target
+from src.systems import MOVE_TARGET
+
+PREDICTION_HISTORY = 600  # Predicted ticks kept for replay, 10 seconds at 60 ticks per second
+SNAP_DISTANCE = 200       # Map units; larger corrections, such as a respawn, are applied at once
+CORRECTION_BLEND = 0.3    # Fraction of a smaller correction applied per snapshot, so it is not seen as a jump
+
+class PlayerPrediction:
+    """
+    Client-side prediction of the local player's movement.
+
+    Commands are applied locally as soon as they are sent and the player is stepped
+    with the same `step_towards_target` the server uses, so the player moves without
+    waiting a round trip. Each tick is kept in a history. When a snapshot arrives the
+    player is put back at the server position as of the last command the server applied,
+    and the ticks predicted since then are replayed with the commands it has not applied yet.
+    """
+
+    def __init__(self, player, collides_with_barrier):
+        """
+        Initialize the PlayerPrediction.
+
+        Args:
+            player (Player): The local player.
+            collides_with_barrier (callable): Takes a Vector2 and returns True if it is blocked.
+        """
+        self.player = player
+        self.collides_with_barrier = collides_with_barrier
+        self.target_pos = None
+        self.tick = 0
+        self.applied = []  # (seq, command) applied on the tick not stepped yet
+        self.history = deque(maxlen=PREDICTION_HISTORY)  # (tick, applied commands, target after the tick)
+        self.issued = {}   # seq -> tick the command was applied on
+        self.last_error = 0.0  # Distance between the prediction and the reconciled position, in map units
+
+    def apply(self, seq, command):
+        """
+        Apply a command that was just sent to the server.
+
+        Args:
+            seq (int): The command's sequence number.
+            command (InputCommand): The command.
+        """
+        if command.kind == MOVE_TARGET:
+            self.target_pos = (command.x, command.y)
+        self.applied.append((seq, command))
+        self.issued[seq] = self.tick
+
+    def step(self):
+        """Predict one server tick."""
+        if self.target_pos and self.player.health > 0:
+            self.target_pos = step_towards_target(self.player, self.target_pos, self.collides_with_barrier)
+        self.history.append((self.tick, self.applied, self.target_pos))
+        self.applied = []
+        self.tick += 1
+
+    def anchor_index(self, ack, ack_age):
+        """
+        Find the history entry matching the server state.
+
+        Returns:
+            int: The index of the entry, -1 if the server state precedes the history, or
+            None if the history does not cover it.
+        """
+        if ack < 0:
+            return -1
+        issued_tick = self.issued.get(ack)
+        if issued_tick is None or not self.history:
+            return None
+        # The server applied the command, then simulated `ack_age` ticks
+        index = issued_tick + ack_age - 1 - self.history[0][0]
+        if index < 0 or index >= len(self.history):
+            return None
+        return index
+
+    def reconcile(self, x, y, ack, ack_age):
+        """
+        Correct the prediction with the player's state in a snapshot.
+
+        Args:
+            x (float): The player's x-coordinate on the server.
+            y (float): The player's y-coordinate on the server.
+            ack (int): The sequence number of the last command the server applied, or -1.
+            ack_age (int): The ticks the server simulated after applying it.
+        """
+        player = self.player
+        old_x, old_y = player.position
+        index = self.anchor_index(ack, ack_age)
+        # Later snapshots may acknowledge the same command again, so only older ones are forgotten
+        for seq in [seq for seq in self.issued if seq < ack]:
+            del self.issued[seq]
+        if index is None:
+            # The server is ahead of the prediction, or a stall outlasted the history
+            self.history.clear()
+            player.position = (x, y)
+            self.last_error = math.hypot(x - old_x, y - old_y)
+            return
+
+        entries = list(self.history)
+        target = entries[index][2] if index >= 0 else None
+        # Commands predicted before the anchor but not applied by the server yet are still in flight
+        for _, applied, _ in entries[:index + 1]:
+            for seq, command in applied:
+                if seq > ack and command.kind == MOVE_TARGET:
+                    target = (command.x, command.y)
+
+        animation = (player.action, player.frame_index, player.update_time, player.action_temporary, player.image)
+        player.position = (x, y)
+        replayed = []
+        for tick, applied, _ in entries[index + 1:]:
+            for seq, command in applied:
+                if seq > ack and command.kind == MOVE_TARGET:
+                    target = (command.x, command.y)
+            if target and player.health > 0:
+                target = step_towards_target(player, target, self.collides_with_barrier)
+            replayed.append((tick, applied, target))
+        for _, command in self.applied:
+            if command.kind == MOVE_TARGET:
+                target = (command.x, command.y)
+        self.target_pos = target
+        player.action, player.frame_index, player.update_time, player.action_temporary, player.image = animation
+
+        # Keep the history from the anchor, or from the oldest command still in flight
+        keep_from = max(index, 0)
+        in_flight = [tick for seq, tick in self.issued.items() if seq > ack]
+        if in_flight:
+            keep_from = min(keep_from, max(min(in_flight) - entries[0][0], 0))
+        elif index < 0:
+            replayed = []  # Nothing sent yet, so there is nothing to replay next time either
+        self.history.clear()
+        self.history.extend(entries[keep_from:index + 1])
+        self.history.extend(replayed)
+
+        new_x, new_y = player.position
+        self.last_error = math.hypot(new_x - old_x, new_y - old_y)
+        if self.last_error < SNAP_DISTANCE:
+            player.position = (old_x + (new_x - old_x) * CORRECTION_BLEND, old_y + (new_y - old_y) * CORRECTION_BLEND)
@@ -0,0 +1,293 @@
+# src/game_logic/quest_engine.py
+import json
+from collections import deque, namedtuple
+from src.utils import metrics
+
+# Trigger types
+TRIGGER_TALK = "talk"                      # The player walked up to an NPC
+TRIGGER_ITEM_GAINED = "item_gained"        # An item was added to the player's inventory
+TRIGGER_REGION_ENTERED = "region_entered"  # The player moved into a map chunk inside a region
+
+COMPLETED = -1  # Progress value of a finished quest
+
+QUEST_EVENTS = metrics.counter("quest_events_total", "Events fed to the quest engines", labels=("trigger",))
+QUEST_STAGES_COMPLETED = metrics.counter("quest_stages_completed_total", "Quest stages completed")
+QUESTS_COMPLETED = metrics.counter("quests_completed_total", "Quests completed")
+
+QuestStage = namedtuple("QuestStage", [
+    "id", "trigger_type", "trigger_keys", "requires", "consume",
+    "reward_items", "reward_flags", "dialogue", "hint_npc", "hint", "world_items",
+])
+Quest = namedtuple("Quest", ["id", "giver", "prerequisites", "stages"])
+WorldItemSpawn = namedtuple("WorldItemSpawn", ["item", "x", "y", "image"])
+
+def load_quest_file(path):
+    """
+    Load quest definitions and dialogues from a JSON file.
+
+    Args:
+        path (str): The quest file to load.
+
+    Returns:
+        dict: The parsed file, with "quests" and "dialogues" entries.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+def compile_quests(definitions, chunk_size):
+    """
+    Compile quest definitions into immutable Quest records.
+
+    Region triggers are expanded into the set of map chunks they cover so that
+    entering a chunk can be matched with a single dictionary lookup.
+
+    Args:
+        definitions (list): The "quests" entries of a quest file.
+        chunk_size (int): The size of a map chunk, used to index region triggers.
+
+    Returns:
+        dict: Quest id -> Quest, in definition order.
+    """
+    quests = {}
+    for definition in definitions:
+        stages = []
+        for stage in definition["stages"]:
+            trigger = stage["trigger"]
+            trigger_type = trigger["type"]
+            if trigger_type == TRIGGER_TALK:
+                trigger_keys = frozenset([trigger["npc"]])
+            elif trigger_type == TRIGGER_ITEM_GAINED:
+                trigger_keys = frozenset([trigger["item"]])
+            elif trigger_type == TRIGGER_REGION_ENTERED:
+                x, y, width, height = trigger["region"]
+                trigger_keys = frozenset(
+                    (chunk_x, chunk_y)
+                    for chunk_x in range(int(x // chunk_size), int((x + width - 1) // chunk_size) + 1)
+                    for chunk_y in range(int(y // chunk_size), int((y + height - 1) // chunk_size) + 1)
+                )
+            else:
+                raise ValueError(f"Quest '{definition['id']}' stage '{stage['id']}' has unknown trigger '{trigger_type}'.")
+
+            rewards = stage.get("rewards", {})
+            hint = stage.get("hint")
+            stages.append(QuestStage(
+                id=stage["id"],
+                trigger_type=trigger_type,
+                trigger_keys=trigger_keys,
+                requires=tuple(stage.get("requires", ())),
+                consume=tuple(stage.get("consume", ())),
+                reward_items=tuple(rewards.get("items", ())),
+                reward_flags=tuple(rewards.get("flags", ())),
+                dialogue=stage.get("dialogue"),
+                hint_npc=hint["npc"] if hint else None,
+                hint=hint["text"] if hint else None,
+                world_items=tuple(
+                    WorldItemSpawn(item["item"], item["x"], item["y"], item.get("image"))
+                    for item in stage.get("world_items", ())
+                ),
+            ))
+        quests[definition["id"]] = Quest(
+            id=definition["id"],
+            giver=definition.get("giver"),
+            prerequisites=tuple(definition.get("prerequisites", ())),
+            stages=tuple(stages),
+        )
+    return quests
+
+class QuestEngine:
+    """
+    Event-driven state machine running every quest of one player.
+
+    Only the current stage of each available quest is registered as a listener,
+    keyed by (trigger type, key). An event costs one dictionary lookup when no
+    quest cares about it, and nothing runs between events.
+    """
+
+    def __init__(self, quests, player, presenter):
+        """
+        Initialize the QuestEngine with every quest not yet started.
+
+        Args:
+            quests (dict): Compiled quests from `compile_quests`.
+            player (Player): The player whose inventory the quests check and reward.
+            presenter: Receives `show_dialogue(key)`, `show_hint(text)` and `quests_changed()` calls.
+        """
+        self.quests = quests
+        self.player = player
+        self.presenter = presenter
+        self.progress = {quest_id: 0 for quest_id in quests}
+        self.flags = set()
+        self.listeners = {}
+        self.pending_events = deque()
+        self.processing = False
+
+        # Quest id -> quests that list it as a prerequisite
+        self.dependents = {quest_id: [] for quest_id in quests}
+        for quest in quests.values():
+            for prerequisite in quest.prerequisites:
+                self.dependents[prerequisite].append(quest.id)
+
+        self._rebuild_listeners()
+
+    def notify(self, trigger_type, key):
+        """
+        Feed an event to the quests listening for it.
+
+        Events raised while another event is being handled, such as rewards being
+        added to the inventory, are queued and handled in order afterwards.
+
+        Args:
+            trigger_type (str): One of the TRIGGER_* constants.
+            key: The NPC tile id, item name or (chunk_x, chunk_y) of the event.
+        """
+        QUEST_EVENTS.labels(trigger_type).inc()
+        self.pending_events.append((trigger_type, key))
+        self._process_pending()
+
+    def is_completed(self, quest_id):
+        """Whether a quest has been finished."""
+        return self.progress.get(quest_id) == COMPLETED
+
+    def is_available(self, quest_id):
+        """Whether a quest's prerequisites are complete and the quest itself is not."""
+        quest = self.quests[quest_id]
+        return not self.is_completed(quest_id) and all(self.is_completed(p) for p in quest.prerequisites)
+
+    def current_stage(self, quest_id):
+        """
+        Get the stage a quest is waiting on.
+
+        Returns:
+            QuestStage: The current stage, or None if the quest is completed.
+        """
+        index = self.progress[quest_id]
+        if index == COMPLETED:
+            return None
+        return self.quests[quest_id].stages[index]
+
+    def has_flag(self, flag):
+        """Whether a quest reward has granted a flag."""
+        return flag in self.flags
+
+    def quest_givers(self):
+        """
+        Get the NPCs that have an available quest.
+
+        Returns:
+            list: NPC tile ids, in quest definition order.
+        """
+        return [quest.giver for quest in self.quests.values() if quest.giver is not None and self.is_available(quest.id)]
+
+    def active_world_items(self):
+        """
+        Get the world items spawned by the current stage of every available quest.
+
+        Returns:
+            list: WorldItemSpawn records.
+        """
+        items = []
+        for quest in self.quests.values():
+            if self.is_available(quest.id):
+                items.extend(self.current_stage(quest.id).world_items)
+        return items
+
+    def get_state(self):
+        """
+        Get the quest progress in a JSON-serializable form.
+
+        Returns:
+            dict: The stage index of every quest and the granted flags.
+        """
+        return {"progress": dict(self.progress), "flags": sorted(self.flags)}
+
+    def set_state(self, state):
+        """
+        Restore progress saved by `get_state`.
+
+        Args:
+            state (dict): The saved progress.
+        """
+        for quest_id, index in state.get("progress", {}).items():
+            if quest_id in self.progress:
+                self.progress[quest_id] = index
+        self.flags = set(state.get("flags", ()))
+        self._rebuild_listeners()
+        self.presenter.quests_changed()
+        self._process_pending()
+
+    def _process_pending(self):
+        if self.processing:
+            return
+        self.processing = True
+        try:
+            while self.pending_events:
+                self._handle(*self.pending_events.popleft())
+        finally:
+            self.processing = False
+
+    def _handle(self, trigger_type, key):
+        for quest_id in list(self.listeners.get((trigger_type, key), ())):
+            stage = self.current_stage(quest_id)
+            if stage is None:
+                continue
+            if stage.trigger_type == trigger_type and key in stage.trigger_keys:
+                if all(item in self.player.inventory for item in stage.requires):
+                    self._complete_stage(self.quests[quest_id], stage)
+                elif stage.hint:
+                    self.presenter.show_hint(stage.hint)
+            elif trigger_type == TRIGGER_TALK and key == stage.hint_npc:
+                self.presenter.show_hint(stage.hint)
+
+    def _complete_stage(self, quest, stage):
+        QUEST_STAGES_COMPLETED.inc()
+        self._unregister(quest.id, stage)
+        if stage.dialogue:
+            self.presenter.show_dialogue(stage.dialogue)
+        for item in stage.consume:
+            self.player.remove_item_from_inventory(item)
+        self.flags.update(stage.reward_flags)
+
+        next_index = self.progress[quest.id] + 1
+        if next_index >= len(quest.stages):
+            self.progress[quest.id] = COMPLETED
+            QUESTS_COMPLETED.inc()
+            for dependent in self.dependents[quest.id]:
+                if self.is_available(dependent):
+                    self._register(dependent)
+        else:
+            self.progress[quest.id] = next_index
+            self._register(quest.id)
+
+        for item in stage.reward_items:
+            self.player.add_to_inventory(item)
+        self.presenter.quests_changed()
+
+    def _rebuild_listeners(self):
+        self.listeners = {}
+        for quest_id in self.quests:
+            if self.is_available(quest_id):
+                self._register(quest_id)
+
+    def _register(self, quest_id):
+        stage = self.current_stage(quest_id)
+        for key in stage.trigger_keys:
+            self.listeners.setdefault((stage.trigger_type, key), {})[quest_id] = None
+        if stage.hint_npc is not None:
+            self.listeners.setdefault((TRIGGER_TALK, stage.hint_npc), {})[quest_id] = None
+
+        # A stage waiting for an item the player already carries completes straight away
+        if stage.trigger_type == TRIGGER_ITEM_GAINED:
+            for item in stage.trigger_keys:
+                if item in self.player.inventory:
+                    self.pending_events.append((TRIGGER_ITEM_GAINED, item))
+
+    def _unregister(self, quest_id, stage):
+        keys = [(stage.trigger_type, key) for key in stage.trigger_keys]
+        if stage.hint_npc is not None:
+            keys.append((TRIGGER_TALK, stage.hint_npc))
+        for listener_key in keys:
+            listeners = self.listeners.get(listener_key)
+            if listeners is not None:
+                listeners.pop(quest_id, None)
+                if not listeners:
+                    del self.listeners[listener_key]
@@ -1,157 +1,74 @@
 # src/game_logic/quest_handler.py
 import pygame
+from src.game_logic.quest_engine import QuestEngine, compile_quests, load_quest_file, TRIGGER_TALK, TRIGGER_ITEM_GAINED, TRIGGER_REGION_ENTERED
+from src.utils import ITEM_GAINED, sim_clock, frame_pacer
+
+QUEST_FILE = "quests/quests.json"
+HINT_DURATION = 3000  # Milliseconds a hint stays on screen
+KEEP_ALIVE_INTERVAL = 50  # Milliseconds between calls to `idle` while a dialogue waits for a click
 
 class QuestHandler:
-    def __init__(self, player, screen_size, screen, item_handler):
+    def __init__(self, player, screen_size, screen, world_items, chunk_size=200, quest_file=QUEST_FILE):
         self.screen_size = screen_size
         self.screen = screen
         self.player = player
-        self.item_handler = item_handler
+        self.world_items = world_items
         self.font = pygame.font.Font(None, 24)
         self.message_window = pygame.Surface((screen_size[0] // 2, screen_size[1] // 8))
         self.message_rect = self.message_window.get_rect(bottomleft=(screen_size[0] // 2 // 2, screen_size[1]))
-        self.load_images()
-
-        # Quest flags
-        self.quest_active = False
-        self.healing_quest_active = False
-        self.axe_head_returned = False
-        self.stick_returned = False
-        self.empty_vial_returned = False
-        self.filled_vial_of_water = False
-
-        # Quest item spawn positions
-        self.axe_head_spawn_pos = (4000, 4000)
-        self.vial_spawn_pos = (5500, 6000)
-
-    def load_images(self):
-        self.axe_head_image = pygame.image.load("assets/quest/axehead.png").convert_alpha()
-        self.vial_image = pygame.image.load("assets/quest/vial.png").convert_alpha()
-
-        self.quest_messages = {
-            "start": [
-                "Hey hero! Got a task for you. \n My axe broke mid-swing in the forest.",
-                "I need an axe head and a stick to fix it. \n Yeah, weird, I know. Wanna help?", 
-                "Press mouse button to accept this quest. \n Rewards await!"
-            ],
-            "complete_quest": [
-                "Huzzah, adventurer! \n You've found the missing axe head! Amazing job!",
-                "Take this Gold Coin as a first reward!",
-                "With the axe repaired, we can get back to chopping those trees down! \n But hold on tight, we still need that stick for the axe's full power!",
-                "Onward we go, in search of that elusive stick! \n Adventure calls!",
-            ],
-            "complete_second_part_quest": [
-                "Bravo, intrepid adventurer! \n You've returned triumphant, stick in hand!",
-                "Your valor knows no bounds! \n Behold, your rewards: a brand spanking new cutting axe!",
-                "Now you can chop trees with the finesse of a lumberjack and the style of a knight!",
-                "Go forth, mighty one, and let the forests tremble at your approach!",
-                "Cutting Axe added to your inventory."
-            ],
-            "handle_axe_pickup": [
-                "You've discovered the missing Axe head! \n Now you can return to woodcutter."
-            ],
-            "healing_quest_start": [
-                "Hey there, hero! Let me teach you how to heal yourself.",
-                "Bring me Empty vial"
-            ],
-            "handle_vial_pickup": [
-                "You've discovered Empty vial! \n Now you can return to healer."
-            ],
-            "bring_empty_vial_quest": [
-                "Great, hero. Now fill vial with water."
-            ],
-            "vial_of_water_returned": [
-                "Thank you, hero. Now you'r able to drink from the well and heal yourself."
-            ],
-        }
-
-    def start_quest(self):
-        self.display_messages("start")        
-        self.quest_active = True
-
-    def return_axe_head(self):
-        if "Axe Head" in self.player.inventory.items:
-            self.axe_head_returned = True
-            self.complete_quest()
-        else:
-            self.display_hint("Look southwest for the axe head.")
-
-    def complete_quest(self):
-        if self.axe_head_returned:
-            self.display_messages("complete_quest")
-            self.player.add_to_inventory("Gold Coin")
-            self.player.remove_item_from_inventory("Axe Head")
-
-    def return_stick(self):
-        if "Stick" in self.player.inventory.items:
-            self.stick_returned = True
-            self.complete_second_part_quest()
-        else:
-            self.display_hint("Look for any tree in the world and grab a stick.")
-
-    def handle_axe_pickup(self):
-        if self.axe_head_spawn_pos and self.player.rect.colliderect(pygame.Rect(self.axe_head_spawn_pos[0], self.axe_head_spawn_pos[1], 200, 200)):
-            self.item_handler.pickup_axe()
-            self.axe_head_spawn_pos = None
-            self.display_messages("handle_axe_pickup")
-
-        if self.axe_head_spawn_pos:
-            screen_pos = (self.axe_head_spawn_pos[0] - self.player._x + self.screen_size[0] // 2,
-                          self.axe_head_spawn_pos[1] - self.player._y + self.screen_size[1] // 2)
-            self.screen.blit(self.axe_head_image, screen_pos)
-            # pygame.display.flip()
-
-    def complete_second_part_quest(self):
-        if self.stick_returned:
-            self.display_messages("complete_second_part_quest")
-            self.player.add_to_inventory("Cutting Axe")
-            self.quest_active = False
-            self.player.remove_item_from_inventory("Stick")
-
-    def first_quest_completed(self):
-        return self.axe_head_returned and self.stick_returned
-
-    def healing_quest_start(self):
-        if self.stick_returned:
-            self.display_messages("healing_quest_start")        
-            self.healing_quest_active = True
-
-    def handle_vial_pickup(self):
-        if self.vial_spawn_pos and self.player.rect.colliderect(pygame.Rect(self.vial_spawn_pos[0], self.vial_spawn_pos[1], 200, 200)):
-            self.item_handler.pickup_vial()
-            self.vial_spawn_pos = None
-            self.display_messages("handle_vial_pickup")
-
-        if self.vial_spawn_pos:
-            screen_pos = (self.vial_spawn_pos[0] - self.player._x + self.screen_size[0] // 2,
-                          self.vial_spawn_pos[1] - self.player._y + self.screen_size[1] // 2)
-            self.screen.blit(self.vial_image, screen_pos)
-            # pygame.display.flip()
-
-    def return_empty_vial(self):
-        if "Empty vial" in self.player.inventory.items:
-            self.empty_vial_returned = True
-            self.complete_empty_vial_quest()
-        else:
-            self.display_hint("Hint: Look around till you find empty vial.")
-
-    def complete_empty_vial_quest(self):
-        if self.empty_vial_returned:
-            self.display_messages("bring_empty_vial_quest")
-            self.vial_of_water_quest()
-
-    def vial_of_water_quest(self):
-        if "Vial of Water" in self.player.inventory.items:
-            self.display_messages("vial_of_water_returned")
-            self.healing_quest_active = False
-            self.filled_vial_of_water = True
-        else:
-            self.display_hint("Hint: Use the well to fill the vial with water.")
-
-    def second_quest_completed(self):
-        return self.empty_vial_returned and self.filled_vial_of_water
+        self.interactive = True  # Show dialogues and wait for clicks; turned off for headless replays
+        self.idle = None  # Called while a dialogue blocks the game loop, e.g. to keep reading from the server
+
+        self.hint_surface = None
+        self.hint_expires = 0
+        self.quest_items = {}  # WorldItemSpawn -> WorldItem placed in the store by the current quest stages
+        self.question_mark_npcs = []
+
+        quest_data = load_quest_file(quest_file)
+        self.quest_messages = quest_data["dialogues"]
+        self.engine = QuestEngine(compile_quests(quest_data["quests"], chunk_size), player, self)
+        self.player.event_log.subscribe(ITEM_GAINED, self.on_item_gained)
+        self.quests_changed()
+
+    def talk_to(self, npc_tile_id):
+        self.engine.notify(TRIGGER_TALK, npc_tile_id)
+
+    def enter_region(self, chunk):
+        self.engine.notify(TRIGGER_REGION_ENTERED, chunk)
+
+    def on_item_gained(self, event):
+        self.engine.notify(TRIGGER_ITEM_GAINED, event.data["item"])
+
+    def has_flag(self, flag):
+        return self.engine.has_flag(flag)
+
+    def quests_changed(self):
+        # Called by the engine after every stage change; everything drawn per frame is rebuilt here
+        self.question_mark_npcs = self.engine.quest_givers()
+        spawns = [spawn for spawn in self.engine.active_world_items() if spawn.item not in self.player.inventory]
+        self.world_items.sync_spawns(self.quest_items, spawns)
+
+    def show_dialogue(self, message_type):
+        self.display_messages(message_type)
+
+    def show_hint(self, message):
+        if not self.interactive:
+            return
+        self.hint_surface = self.font.render(message, True, (255, 255, 255))
+        self.hint_expires = sim_clock.get_ticks() + HINT_DURATION
+
+    def render_hint(self):
+        if self.hint_surface is None:
+            return
+        if sim_clock.get_ticks() >= self.hint_expires:
+            self.hint_surface = None
+            return
+        text_rect = self.hint_surface.get_rect(center=(self.screen_size[0] // 2, self.screen_size[1] // 2))
+        self.screen.blit(self.hint_surface, text_rect)
 
     def display_messages(self, message_type):
+        if not self.interactive:
+            return
         for message in self.quest_messages.get(message_type, []):
             self.display_message(message)
 
@@ -176,24 +93,24 @@ class QuestHandler:
 
             # Update the display once after all alpha changes
             pygame.display.flip()
+            if self.idle is not None:
+                self.idle()
             pygame.time.delay(5)
 
         # Wait for mouse button click to continue
         self.wait_for_click()
 
     def wait_for_click(self):
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
+        # Nothing on screen changes until the click, so sleep until input arrives, waking up for `idle` if set
+        while True:
+            if self.idle is None:
+                events = frame_pacer.wait()
+            else:
+                self.idle()
+                events = frame_pacer.wait(KEEP_ALIVE_INTERVAL)
+            for event in events:
                 if event.type == pygame.MOUSEBUTTONDOWN:
-                    waiting = False
-
-    def calculate_screen_pos(self, spawn_pos):
-        return (spawn_pos[0] - self.player._x + self.screen_size[0] // 2,
-                spawn_pos[1] - self.player._y + self.screen_size[1] // 2)
-
-    def display_hint(self, message):
-        text_surface = self.font.render(message, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=(self.screen_size[0] // 2, self.screen_size[1] // 2))
-        self.screen.blit(text_surface, text_rect)
-        pygame.display.flip()
\ No newline at end of file
+                    return
+                if event.type == pygame.QUIT:
+                    pygame.event.post(event)  # Left for the game loop, which closes the game
+                    return
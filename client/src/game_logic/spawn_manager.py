@@ -1,6 +1,9 @@
 # src/game_logic/spawn_manager.py
 
 from src.entities import Enemy
+from src.utils import SPAWN, metrics
+
+ENEMY_SPAWNS = metrics.counter("enemy_spawns_total", "Enemies placed on the map")
 
 class SpawnManager:
     def __init__(self, game):
@@ -14,6 +17,8 @@ class SpawnManager:
         ]
         levels = [1, 2, 3, 4, 5, 1, 2, 3, 4, 5, 1, 2, 3]  # Define levels for enemies
         self.game.enemies = [Enemy(x, y, self.game, level) for (x, y), level in zip(enemy_positions, levels)]
+        self.game.enemy_grid.rebuild(self.game.enemies)
+        ENEMY_SPAWNS.inc(len(self.game.enemies))
 
     def spawn_enemy(self, x, y, level=1):
         """
@@ -26,8 +31,10 @@ class SpawnManager:
         """
         new_enemy = Enemy(x, y, self.game, level=level)
         self.game.enemies.append(new_enemy)
+        self.game.enemy_grid.insert(new_enemy, x, y)
         self.game.enemy = new_enemy
-        print(self.game.enemy.x, self.game.enemy.y, self.game.enemy.alive)
+        ENEMY_SPAWNS.inc()
+        self.game.event_log.emit(SPAWN, x=x, y=y, level=level)
 
     def spawn_enemies_second_map(self):
         enemy_positions = [
@@ -35,3 +42,5 @@ class SpawnManager:
         ]
         levels = [6, 7, 8]  # Define levels for enemies in the second map
         self.game.enemies = [Enemy(x, y, self.game, level) for (x, y), level in zip(enemy_positions, levels)]
+        self.game.enemy_grid.rebuild(self.game.enemies)
+        ENEMY_SPAWNS.inc(len(self.game.enemies))
@@ -1,18 +1,25 @@
 # src/game_logic/transition_manager.py
 import json
+from src.game_logic.zones import ZONES
 
 class TransitionManager:
     def __init__(self, game):
         self.game = game
 
-    def transition_to_second_map(self):
+    def transition(self, transition):
+        # Offline the destination zone replaces the current one; a zone server hands the player off instead
         if not self.game.transitioning:
-            self.load_map('maps/map2.json')
-            self.game.spawn_manager.spawn_enemies_second_map()
-            self.game.player.position = (9800, 9800)
+            zone = ZONES[transition.destination]
+            self.load_map(zone.map_file)
+            self.game.zone = zone
+            zone.spawn(self.game.spawn_manager)
+            # Loot stays behind in the old zone; the current quest stages place their items again
+            self.game.world_items.clear()
+            self.game.quest_handler.quests_changed()
+            self.game.player.position = transition.position
             self.game.transitioning = True
-            item = "Health Potion"
-            self.game.player.add_to_inventory(item)
+            for item in transition.items:
+                self.game.player.add_to_inventory(item)
 
     def load_map(self, map_filename):
         try:
@@ -0,0 +1,193 @@
+# src/game_logic/world_items.py
+import itertools
+import random
+from collections import deque, namedtuple
+from src.utils import SpatialGrid, sim_clock
+
+PICKUP_RADIUS = 150       # Distance from the player's centre within which items are picked up
+LOOT_LIFETIME = 60000     # Milliseconds dropped loot stays on the ground
+LOOT_SCATTER = 40         # Maximum offset of a drop from the enemy's position
+SPAWN_IMAGE_SIZE = 200    # Quest files place items by the top-left corner of their image
+
+# Chance of each entry dropping, and the quantity range; the upper bound grows with the enemy's level
+LootEntry = namedtuple("LootEntry", ["item", "chance", "min_quantity", "max_quantity"])
+LOOT_TABLE = (
+    LootEntry("Gold Coin", 0.6, 1, 2),
+    LootEntry("Stick", 0.2, 1, 1),
+)
+
+class WorldItem:
+    """An item stack lying on the map. Identity-hashed so equal stacks can coexist in the store."""
+
+    def __init__(self, item_id, item, x, y, quantity=1, image=None, expires=None, owner=None):
+        """
+        Initialize the WorldItem.
+
+        Args:
+            item_id (int): The id of the item, unique within its store.
+            item (str): The inventory name of the item.
+            x (float): The x-coordinate of the item's centre.
+            y (float): The y-coordinate of the item's centre.
+            quantity (int): How many items the stack holds.
+            image (str): The image drawn on the map, or None to use the inventory icon.
+            expires (int): The sim clock time in milliseconds the item disappears at, or None to keep it.
+            owner: The only collector allowed to pick the item up, or None for anyone.
+        """
+        self.id = item_id
+        self.item = item
+        self.x = x
+        self.y = y
+        self.quantity = quantity
+        self.image = image
+        self.expires = expires
+        self.owner = owner
+
+class WorldItemStore:
+    """
+    Every item lying on the map, indexed by a SpatialGrid.
+
+    Drawing queries the grid for the visible rectangle and picking up is a single
+    radius query around the player per tick, so neither cost grows with the total
+    number of items on the map.
+    """
+
+    def __init__(self, cell_size, loot_table=LOOT_TABLE):
+        """
+        Initialize the WorldItemStore.
+
+        Args:
+            cell_size (int): The grid cell size, usually CHUNK_SIZE.
+            loot_table (tuple): The LootEntry records rolled when an enemy dies.
+        """
+        self.grid = SpatialGrid(cell_size)
+        self.loot_table = loot_table
+        self.expiring = deque()  # Loot in drop order; every drop has the same lifetime so this is also expiry order
+        self.ids = itertools.count(1)
+
+    def __len__(self):
+        return len(self.grid)
+
+    def __iter__(self):
+        return iter(self.grid.entries)
+
+    def spawn(self, item, x, y, quantity=1, image=None, lifetime=None, owner=None):
+        """
+        Place an item on the map.
+
+        Args:
+            item (str): The inventory name of the item.
+            x (float): The x-coordinate of the item's centre.
+            y (float): The y-coordinate of the item's centre.
+            quantity (int): How many items the stack holds.
+            image (str): The image drawn on the map, or None to use the inventory icon.
+            lifetime (int): Milliseconds until the item disappears, or None to keep it until picked up.
+            owner: The only collector allowed to pick the item up, or None for anyone.
+
+        Returns:
+            WorldItem: The spawned item.
+        """
+        expires = None if lifetime is None else sim_clock.get_ticks() + lifetime
+        world_item = WorldItem(next(self.ids), item, x, y, quantity, image, expires, owner)
+        self.grid.insert(world_item, x, y)
+        if expires is not None:
+            self.expiring.append(world_item)
+        return world_item
+
+    def remove(self, world_item):
+        """
+        Take an item off the map.
+
+        Args:
+            world_item (WorldItem): The item to remove.
+        """
+        self.grid.remove(world_item)
+
+    def clear(self):
+        """Take every item off the map, e.g. when the player leaves for another zone."""
+        self.grid.clear()
+        self.expiring.clear()
+
+    def sync_spawns(self, placed, spawns, owner=None):
+        """
+        Make the store hold one item for each spawn record, such as the world items of
+        the current quest stages. Items placed for spawns no longer listed are removed.
+
+        Args:
+            placed (dict): Spawn -> WorldItem from earlier calls; updated in place.
+            spawns (iterable): WorldItemSpawn records positioned by their image's top-left corner.
+            owner: The collector the items are reserved for, or None for anyone.
+        """
+        # A dict rather than a set keeps the spawn order, and so the store's order, the same on every run
+        active = dict.fromkeys(spawns)
+        for spawn in list(placed):
+            if spawn not in active:
+                self.remove(placed.pop(spawn))
+        for spawn in active:
+            world_item = placed.get(spawn)
+            if world_item is None or world_item not in self.grid:
+                placed[spawn] = self.spawn(
+                    spawn.item, spawn.x + SPAWN_IMAGE_SIZE // 2, spawn.y + SPAWN_IMAGE_SIZE // 2,
+                    image=spawn.image, owner=owner
+                )
+
+    def drop_loot(self, enemy):
+        """
+        Roll the loot table for a defeated enemy and scatter the drops around it.
+
+        Args:
+            enemy (Enemy): The enemy that died.
+
+        Returns:
+            list: The spawned WorldItems.
+        """
+        drops = []
+        for entry in self.loot_table:
+            if random.random() >= entry.chance:
+                continue
+            quantity = random.randint(entry.min_quantity, entry.max_quantity + (enemy.level - 1) // 2)
+            x = enemy.x + random.uniform(-LOOT_SCATTER, LOOT_SCATTER)
+            y = enemy.y + random.uniform(-LOOT_SCATTER, LOOT_SCATTER)
+            drops.append(self.spawn(entry.item, x, y, quantity, lifetime=LOOT_LIFETIME))
+        return drops
+
+    def visible(self, left, top, width, height):
+        """
+        Get the items whose centre lies inside a map rectangle.
+
+        Returns:
+            list: The WorldItems in the rectangle.
+        """
+        return self.grid.query_rect(left, top, width, height)
+
+    def pickup_near(self, x, y, item_handler, radius=PICKUP_RADIUS, owner=None):
+        """
+        Give the player every item within reach. Stacks that do not fully fit in
+        the inventory stay on the ground with the remainder.
+
+        Args:
+            x (float): The x-coordinate of the player.
+            y (float): The y-coordinate of the player.
+            item_handler (ItemHandler): Adds picked up items to the inventory.
+            radius (float): The pickup distance.
+            owner: The collector picking up, which may also take items reserved for it.
+        """
+        for world_item in self.grid.query_radius(x, y, radius):
+            if world_item not in self.grid:
+                continue  # Removed by a quest reacting to an earlier pickup
+            if world_item.owner is not None and world_item.owner is not owner:
+                continue
+            added = item_handler.pickup(world_item.item, world_item.quantity)
+            if added >= world_item.quantity:
+                self.remove(world_item)
+            else:
+                world_item.quantity -= added
+
+    def remove_expired(self):
+        """Remove loot whose lifetime has run out."""
+        now = sim_clock.get_ticks()
+        while self.expiring and self.expiring[0].expires <= now:
+            world_item = self.expiring.popleft()
+            # Picked up loot stays queued until its time comes, as taking it out of the middle of the deque
+            # would cost a scan per pickup; it is skipped here instead
+            if world_item in self.grid:
+                self.remove(world_item)
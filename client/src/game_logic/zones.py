@@ -0,0 +1,23 @@
+# src/game_logic/zones.py
+from collections import namedtuple
+from src.game_logic.spawn_manager import SpawnManager
+
+# A map edge the player can walk through. `area` is the (x, y, width, height) rectangle
+# that triggers it, `position` where the player appears in the destination zone and
+# `items` what the player is given on arrival.
+Transition = namedtuple("Transition", ["area", "destination", "position", "items"])
+
+# A map with its enemies and exits. `spawn` places the enemies through a SpawnManager.
+Zone = namedtuple("Zone", ["name", "map_file", "spawn", "transitions"])
+
+ZONES = {
+    "map": Zone("map", "maps/map.json", SpawnManager.spawn_enemies, (
+        Transition((9800, 200, 200, 200), "map2", (9800, 9800), ("Health Potion",)),
+    )),
+    "map2": Zone("map2", "maps/map2.json", SpawnManager.spawn_enemies_second_map, ()),
+}
+START_ZONE = "map"
+
+def zone_for_map(map_file):
+    """The zone whose map is `map_file`, or None for a map that is not one of `ZONES`."""
+    return next((zone for zone in ZONES.values() if zone.map_file == map_file), None)
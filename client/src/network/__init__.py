@@ -0,0 +1,11 @@
+# src/network/__init__.py
+from .protocol import (
+    HELLO, WELCOME, COMMAND, SNAPSHOT, NOTICE, ACK, HANDOFF, ProtocolError,
+    encode_frame, encode_json, decode_json, read_frame, split_frames, encode_ack, decode_ack, encode_command, decode_command,
+)
+from .snapshot import (
+    Snapshot, SnapshotEncoder, SnapshotDecoder, encode_snapshot, decode_snapshot, describe_record,
+    you_record, player_record, enemy_record, item_record, YOU, PLAYERS, ENEMIES, ITEMS,
+)
+from .client import NetworkClient
+from .interpolation import InterpolationBuffer
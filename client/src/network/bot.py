@@ -0,0 +1,160 @@
+# src/network/bot.py
+import math
+from src.entities import NPC, default_skills
+from src.network.protocol import SNAPSHOT, NOTICE, HANDOFF
+from src.network.snapshot import YOU, ENEMIES, ITEMS, describe_record
+from src.systems import InputCommand, MOVE_TARGET, SELECT_SKILL, USE_SKILL
+
+MAP_SIZE = 10000
+THINK_INTERVAL = 0.25  # Seconds between bot decisions
+ITEM_RANGE = 1500      # Items this close are picked up before anything else
+AGGRO_RANGE = 800      # Enemies this close are fought
+WANDER_RADIUS = 1200   # How far from its position a wandering bot walks
+QUEST_INTERVAL = 20.0  # Seconds between visits to the quest givers
+STUCK_TIME = 3.0       # Seconds without moving before a bot gives up on its goal
+SINGLE_TARGET_RANGE = 90  # Just inside `Player.attack_range`, the reach of the first skill
+
+class Bot:
+    """
+    Scripted player for load tests.
+
+    Drives a `NetworkClient` like a person would: walks with click-to-move,
+    picks up nearby items, fights enemies it sees and regularly visits the quest
+    givers, so the server runs its movement, combat, loot and quest code.
+    """
+
+    def __init__(self, client, rng):
+        """
+        Initialize the Bot.
+
+        Args:
+            client (NetworkClient): The bot's connection, not connected yet.
+            rng (random.Random): The source of the bot's decisions.
+        """
+        self.client = client
+        self.random = rng
+        self.skills = default_skills()
+        self.state = None      # The newest snapshot state
+        self.tick = None       # The server tick of the newest snapshot, the time the bot sees enemies at
+        self.goal = None       # Map position the bot is walking to
+        self.skill_index = 0
+        self.next_think = 0.0
+        self.next_quest_visit = rng.uniform(0, QUEST_INTERVAL)
+        self.quest_givers = list(NPC.POSITIONS.values())
+        self.last_position = None
+        self.last_moved = 0.0
+        self.notices = 0
+        self.commands_sent = 0
+
+    def connect(self, now):
+        """
+        Log in to the server.
+
+        Args:
+            now (float): The current `time.perf_counter` time.
+        """
+        self.client.connect()
+        self.last_moved = now
+        self.next_quest_visit += now
+
+    def update(self, now):
+        """
+        Read what the server sent and act when it is time to.
+
+        Args:
+            now (float): The current `time.perf_counter` time.
+        """
+        for message_type, message in self.client.poll():
+            if message_type == SNAPSHOT:
+                self.state = message.state
+                self.tick = message.tick
+            elif message_type == NOTICE:
+                self.notices += 1
+            elif message_type == HANDOFF:
+                self.state = None  # Wait for the new zone's first snapshot
+                self.goal = None
+        if self.state is not None and now >= self.next_think:
+            self.next_think = now + THINK_INTERVAL
+            self.think(now)
+
+    def send(self, command):
+        self.client.send_command(command)
+        self.commands_sent += 1
+
+    def walk_to(self, x, y):
+        x = min(max(x, 0), MAP_SIZE)
+        y = min(max(y, 0), MAP_SIZE)
+        if self.goal != (x, y):
+            self.goal = (x, y)
+            self.send(InputCommand(MOVE_TARGET, x, y))
+
+    def think(self, now):
+        """Pick the bot's next action from the newest snapshot."""
+        you = describe_record(YOU, self.state["you"])
+        x, y = you["x"], you["y"]
+        if self.last_position is None or math.hypot(x - self.last_position[0], y - self.last_position[1]) > 1:
+            self.last_position = (x, y)
+            self.last_moved = now
+        elif self.goal and now - self.last_moved > STUCK_TIME and math.hypot(self.goal[0] - x, self.goal[1] - y) > SINGLE_TARGET_RANGE:
+            self.goal = None  # Walked into a barrier; wander somewhere else
+            self.last_moved = now
+            self.wander(x, y)
+            return
+
+        item = self.nearest(ITEMS, x, y, ITEM_RANGE, lambda item: True)
+        if item is not None:
+            self.walk_to(item[0], item[1])
+            return
+
+        enemy = self.nearest(ENEMIES, x, y, AGGRO_RANGE, lambda enemy: enemy["alive"])
+        if enemy is not None:
+            self.fight(x, y, enemy)
+            return
+
+        if now >= self.next_quest_visit:
+            self.next_quest_visit = now + QUEST_INTERVAL
+            self.walk_to(*self.random.choice(self.quest_givers))
+            return
+
+        if self.goal is None or math.hypot(self.goal[0] - x, self.goal[1] - y) < 10:
+            self.wander(x, y)
+
+    def wander(self, x, y):
+        angle = self.random.uniform(0, 2 * math.pi)
+        distance = self.random.uniform(WANDER_RADIUS / 4, WANDER_RADIUS)
+        self.walk_to(x + math.cos(angle) * distance, y + math.sin(angle) * distance)
+
+    def fight(self, x, y, enemy):
+        """Close in on an enemy and use whichever skill reaches it."""
+        enemy_x, enemy_y, _ = enemy
+        distance = math.hypot(enemy_x - x, enemy_y - y)
+        if distance <= SINGLE_TARGET_RANGE:
+            skill_index = 0
+        elif distance <= self.skills[1].reach:
+            skill_index = 1
+        else:
+            self.walk_to(enemy_x, enemy_y)
+            return
+        if skill_index != self.skill_index:
+            self.skill_index = skill_index
+            self.send(InputCommand(SELECT_SKILL, index=skill_index))
+        self.send(InputCommand(USE_SKILL, enemy_x, enemy_y, view_tick=self.tick))
+
+    def nearest(self, schema, x, y, radius, accept):
+        """
+        Find the nearest entity of a kind in the newest snapshot.
+
+        Returns:
+            tuple: Its (x, y, described record), or None if none is within `radius`.
+        """
+        nearest = None
+        nearest_distance = radius
+        for record in self.state[schema.name].values():
+            entity = describe_record(schema, record)
+            if not accept(entity):
+                continue
+            entity_x, entity_y = entity["x"], entity["y"]
+            distance = math.hypot(entity_x - x, entity_y - y)
+            if distance < nearest_distance:
+                nearest, nearest_distance = (entity_x, entity_y, entity), distance
+        return nearest
@@ -0,0 +1,262 @@
+# src/network/client.py
+import random
+import socket
+import time
+from collections import deque
+from src.network.protocol import (
+    HELLO, WELCOME, SNAPSHOT, NOTICE, HANDOFF, ProtocolError, encode_json, decode_json, encode_ack, encode_command, split_frames,
+)
+from src.network.snapshot import SnapshotDecoder
+from src.utils import metrics
+
+RECV_SIZE = 65536
+RTT_SMOOTHING = 0.1  # Weight of a new round-trip sample in the smoothed round-trip time
+RTT_SAMPLES = 256    # Raw round-trip samples kept for tools that collect them
+
+BYTES_SENT = metrics.counter("network_sent_bytes_total", "Bytes written to the network")
+BYTES_RECEIVED = metrics.counter("network_received_bytes_total", "Bytes read from the network")
+ROUND_TRIP_SECONDS = metrics.histogram(
+    "network_round_trip_seconds", "Time from sending a command to the first snapshot acknowledging it",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0),
+)
+
+class NetworkClient:
+    """
+    Connection from a game client to a `GameServer`.
+
+    Uses a non-blocking socket polled once per frame, so it runs inside the pygame
+    loop without threads. Outgoing commands and incoming messages can be held back
+    by a simulated one-way delay to try the game under latency and jitter.
+    """
+
+    def __init__(self, host="127.0.0.1", port=7777, name="player", latency=0, jitter=0, seed=None):
+        """
+        Initialize the NetworkClient.
+
+        Args:
+            host (str): The server address.
+            port (int): The server TCP port.
+            name (str): The name to log in with.
+            latency (float): Simulated round-trip time in milliseconds, split evenly between both directions.
+            jitter (float): Simulated extra delay of up to this many milliseconds, added per message and direction.
+            seed (int): Seed of the jitter, for reproducible tests.
+        """
+        self.host = host
+        self.port = port
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.sock = None
+        self.connected = False
+        self.player_id = None
+        self.tick_rate = None
+        self.map_file = None
+        self.received = bytearray()
+        self.unsent = bytearray()
+        self.outgoing = deque()  # (release time, frame) held back by the simulated latency
+        self.incoming = deque()  # (release time, message type, payload)
+        self.last_release = {"out": 0.0, "in": 0.0}
+        self.decoder = SnapshotDecoder()
+        self.next_seq = 0
+        self.sent_at = {}  # command seq -> send time, until a snapshot acknowledges it
+        self.rtt = None    # Smoothed command round-trip time in milliseconds
+        self.rtt_samples = deque(maxlen=RTT_SAMPLES)
+        self.bytes_received = 0
+
+    def connect(self, timeout=5.0, token=None):
+        """
+        Connect and log in, blocking until the server welcomes the client.
+
+        Args:
+            timeout (float): Seconds to wait for the connection and the welcome.
+            token (str): The handoff token when arriving from another zone.
+
+        Returns:
+            dict: The WELCOME message.
+
+        Raises:
+            ConnectionError: If the server closes the connection during login.
+            ProtocolError: If the server answers with something other than WELCOME or a HANDOFF to another zone.
+        """
+        self.sock = socket.create_connection((self.host, self.port), timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        hello = {"name": self.name}
+        if token is not None:
+            hello["token"] = token
+        self.sock.sendall(encode_json(HELLO, hello))
+        frames = []
+        while not frames:
+            data = self.sock.recv(RECV_SIZE)
+            if not data:
+                raise ConnectionError("Server closed the connection during login.")
+            self.received += data
+            frames = split_frames(self.received)
+        message_type, payload = frames[0]
+        if message_type == HANDOFF:
+            # The player was saved in another zone; its server takes the login
+            handoff = decode_json(payload)
+            self.close()
+            self.host, self.port = handoff["host"], handoff["port"]
+            self.received.clear()
+            return self.connect(timeout, handoff["token"])
+        if message_type != WELCOME:
+            raise ProtocolError(f"Expected WELCOME, got message type {message_type}.")
+        welcome = decode_json(payload)
+        self.player_id = welcome["player_id"]
+        self.tick_rate = welcome["tick_rate"]
+        self.map_file = welcome["map"]
+        self.sock.setblocking(False)
+        self.connected = True
+        now = time.perf_counter()
+        for message_type, payload in frames[1:]:
+            self.incoming.append((now, message_type, payload))
+        return welcome
+
+    def close(self):
+        """Close the connection."""
+        self.connected = False
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def hand_off(self, handoff):
+        """
+        Log in to the zone server a HANDOFF message points to. Everything still
+        queued for the old server is dropped and the snapshot baseline starts over.
+
+        Args:
+            handoff (dict): The HANDOFF message.
+        """
+        self.close()
+        self.host, self.port = handoff["host"], handoff["port"]
+        self.received.clear()
+        self.unsent.clear()
+        self.outgoing.clear()
+        self.incoming.clear()
+        self.decoder = SnapshotDecoder()
+        self.sent_at.clear()
+        try:
+            self.connect(token=handoff["token"])
+        except (OSError, ProtocolError) as e:
+            print(f"Handoff to zone {handoff['zone']} failed: {e}")
+
+    def delay(self, direction, now):
+        """
+        Get the time a message sent or received now is released, keeping the order of the stream.
+
+        Args:
+            direction (str): "out" or "in".
+            now (float): The current `time.perf_counter` time.
+
+        Returns:
+            float: The release time.
+        """
+        if not self.latency and not self.jitter:
+            return now
+        delay = (self.latency / 2 + self.random.uniform(0, self.jitter)) / 1000
+        release = max(self.last_release[direction], now + delay)
+        self.last_release[direction] = release
+        return release
+
+    def send(self, frame, now=None):
+        """
+        Queue a framed message for the server.
+
+        Args:
+            frame (bytes): The framed message.
+            now (float): The current `time.perf_counter` time.
+        """
+        now = time.perf_counter() if now is None else now
+        self.outgoing.append((self.delay("out", now), frame))
+        self.flush(now)
+
+    def send_command(self, command):
+        """
+        Send an input command to the server.
+
+        Args:
+            command (InputCommand): The command.
+
+        Returns:
+            int: The sequence number the server acknowledges the command by.
+        """
+        seq = self.next_seq
+        self.next_seq += 1
+        now = time.perf_counter()
+        self.sent_at[seq] = now
+        self.send(encode_command(seq, command), now)
+        return seq
+
+    def flush(self, now):
+        """Write the released outgoing messages to the socket, as far as it accepts them."""
+        while self.outgoing and self.outgoing[0][0] <= now:
+            self.unsent += self.outgoing.popleft()[1]
+        if self.unsent and self.connected:
+            try:
+                sent = self.sock.send(self.unsent)
+            except BlockingIOError:
+                return
+            except OSError:
+                self.close()
+                return
+            del self.unsent[:sent]
+            BYTES_SENT.inc(sent)
+
+    def poll(self):
+        """
+        Exchange pending data with the server. Snapshots are decoded and acknowledged.
+
+        Returns:
+            list: (SNAPSHOT, Snapshot), (NOTICE, dict) and (HANDOFF, dict) messages, in the order received.
+            A HANDOFF is last; the client has already logged in to the new zone.
+        """
+        now = time.perf_counter()
+        while self.connected:
+            try:
+                data = self.sock.recv(RECV_SIZE)
+            except BlockingIOError:
+                break
+            except OSError:
+                self.close()
+                break
+            if not data:
+                self.close()
+                break
+            self.bytes_received += len(data)
+            BYTES_RECEIVED.inc(len(data))
+            self.received += data
+        for message_type, payload in split_frames(self.received):
+            self.incoming.append((self.delay("in", now), message_type, payload))
+
+        messages = []
+        while self.incoming and self.incoming[0][0] <= now:
+            _, message_type, payload = self.incoming.popleft()
+            if message_type == SNAPSHOT:
+                snapshot = self.decoder.decode(payload)
+                if snapshot is None:
+                    continue
+                self.send(encode_ack(snapshot.tick), now)
+                self.measure_rtt(snapshot.ack, now)
+                messages.append((SNAPSHOT, snapshot))
+            elif message_type == NOTICE:
+                messages.append((NOTICE, decode_json(payload)))
+            elif message_type == HANDOFF:
+                handoff = decode_json(payload)
+                self.hand_off(handoff)
+                messages.append((HANDOFF, handoff))
+                return messages
+        self.flush(now)
+        return messages
+
+    def measure_rtt(self, ack, now):
+        """Update the round-trip time from the first snapshot acknowledging a command."""
+        sent = self.sent_at.pop(ack, None)
+        for seq in [seq for seq in self.sent_at if seq < ack]:
+            del self.sent_at[seq]
+        if sent is None:
+            return
+        sample = (now - sent) * 1000
+        self.rtt_samples.append(sample)
+        ROUND_TRIP_SECONDS.observe(sample / 1000)
+        self.rtt = sample if self.rtt is None else self.rtt + (sample - self.rtt) * RTT_SMOOTHING
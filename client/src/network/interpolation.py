@@ -0,0 +1,113 @@
+# src/network/interpolation.py
+import bisect
+from collections import deque
+from src.network.snapshot import PLAYERS, ENEMIES, POSITION_SCALE
+
+INTERPOLATION_HISTORY = 32  # Snapshots kept to interpolate between
+MIN_DELAY = 4               # Ticks remote entities are drawn behind the newest snapshot, at least
+CLOCK_SMOOTHING = 0.05      # Weight of a new snapshot in the server clock estimate
+JITTER_SMOOTHING = 0.1      # Weight of a new arrival deviation in the jitter estimate
+DELAY_SMOOTHING = 0.05      # How fast the delay follows changes in jitter
+TELEPORT_DISTANCE = 300     # Map units; entities moving further between two snapshots are not slid across
+
+class InterpolationBuffer:
+    """
+    Recent snapshots of remote players and enemies, drawn a little in the past.
+
+    Rendering at a delay of about one snapshot interval plus twice the arrival
+    jitter means there is almost always a snapshot on either side of the render
+    time, so remote entities move smoothly between server positions instead of
+    jumping every time a snapshot arrives.
+    """
+
+    def __init__(self, tick_rate, schemas=(PLAYERS, ENEMIES)):
+        """
+        Initialize the InterpolationBuffer.
+
+        Args:
+            tick_rate (int): Server ticks per second.
+            schemas (tuple): The entity schemas to interpolate; their first two fields are x and y.
+        """
+        self.tick_rate = tick_rate
+        self.names = [schema.name for schema in schemas]
+        self.ticks = deque(maxlen=INTERPOLATION_HISTORY)
+        self.states = deque(maxlen=INTERPOLATION_HISTORY)
+        self.clock_offset = None  # Server tick minus local time in ticks
+        self.jitter = 0.0
+        self.delay = MIN_DELAY
+
+    def add(self, tick, state, now):
+        """
+        Add a decoded snapshot.
+
+        Args:
+            tick (int): The server tick of the snapshot.
+            state (dict): The decoded state.
+            now (float): The local time the snapshot arrived, in seconds.
+        """
+        if self.ticks and tick <= self.ticks[-1]:
+            return
+        offset = tick - now * self.tick_rate
+        if self.clock_offset is None:
+            self.clock_offset = offset
+        else:
+            deviation = offset - self.clock_offset
+            self.jitter += (abs(deviation) - self.jitter) * JITTER_SMOOTHING
+            self.clock_offset += deviation * CLOCK_SMOOTHING
+        spacing = tick - self.ticks[-1] if self.ticks else 0
+        self.delay += (max(MIN_DELAY, spacing + 2 * self.jitter) - self.delay) * DELAY_SMOOTHING
+        self.ticks.append(tick)
+        self.states.append({name: state[name] for name in self.names})
+
+    def render_tick(self, now):
+        """
+        Get the server tick remote entities are drawn at.
+
+        Args:
+            now (float): The local time in seconds.
+
+        Returns:
+            float: The estimated server tick minus the interpolation delay, or None before the first snapshot.
+        """
+        if self.clock_offset is None:
+            return None
+        return now * self.tick_rate + self.clock_offset - self.delay
+
+    def sample(self, now):
+        """
+        Get the interpolated remote entities.
+
+        Args:
+            now (float): The local time in seconds.
+
+        Returns:
+            dict: Schema name -> {id: (x, y, record)}, with x and y in map units and the
+            other fields taken from the older of the two snapshots.
+        """
+        render_tick = self.render_tick(now)
+        if render_tick is None:
+            return {name: {} for name in self.names}
+        index = bisect.bisect_right(self.ticks, render_tick)
+        if index == 0:
+            index = 1  # Older than anything kept: hold the oldest snapshot
+        before, before_tick = self.states[index - 1], self.ticks[index - 1]
+        if index < len(self.ticks):
+            after, after_tick = self.states[index], self.ticks[index]
+            fraction = (render_tick - before_tick) / (after_tick - before_tick)
+        else:
+            after, fraction = before, 0.0  # Newer than anything received: hold the newest
+
+        teleport = TELEPORT_DISTANCE * POSITION_SCALE
+        sampled = {}
+        for name in self.names:
+            entities = {}
+            later = after[name]
+            for entity_id, record in before[name].items():
+                x, y = record[0], record[1]
+                next_record = later.get(entity_id)
+                if next_record is not None and abs(next_record[0] - x) + abs(next_record[1] - y) <= teleport:
+                    x += (next_record[0] - x) * fraction
+                    y += (next_record[1] - y) * fraction
+                entities[entity_id] = (x / POSITION_SCALE, y / POSITION_SCALE, record)
+            sampled[name] = entities
+        return sampled
@@ -0,0 +1,174 @@
+# src/network/protocol.py
+import json
+import math
+import struct
+from src.systems.commands import InputCommand
+
+# Every message is a frame header followed by `length` payload bytes
+FRAME = struct.Struct("<IB")  # payload length, message type
+MAX_PAYLOAD = 1 << 20
+
+# Message types
+HELLO = 1     # client -> server: {"name"}, and {"token"} when arriving from another zone
+WELCOME = 2   # server -> client: {"player_id", "tick", "tick_rate", "map"}
+COMMAND = 3   # client -> server: {"seq", "kind", "x", "y", "index"}
+SNAPSHOT = 4  # server -> client: binary delta of the world state seen by the player, see snapshot.py
+NOTICE = 5    # server -> client: {"dialogue"} or {"hint"} raised by a quest
+ACK = 6       # client -> server: the tick of the newest snapshot received
+HANDOFF = 7   # server -> client: {"zone", "host", "port", "token"}, the zone server to log in to next
+
+ACK_PAYLOAD = struct.Struct("<I")
+
+class ProtocolError(Exception):
+    """Raised when a peer sends a frame that cannot be decoded."""
+
+def encode_frame(message_type, payload):
+    """
+    Frame a payload for sending.
+
+    Args:
+        message_type (int): One of the message type constants.
+        payload (bytes): The encoded message.
+
+    Returns:
+        bytes: The frame header followed by the payload.
+    """
+    return FRAME.pack(len(payload), message_type) + payload
+
+def encode_json(message_type, data):
+    """
+    Frame a JSON message.
+
+    Args:
+        message_type (int): One of the message type constants.
+        data (dict): The message.
+
+    Returns:
+        bytes: The framed message.
+    """
+    return encode_frame(message_type, json.dumps(data, separators=(",", ":")).encode())
+
+def decode_json(payload):
+    """
+    Decode a JSON message payload.
+
+    Returns:
+        dict: The message.
+    """
+    try:
+        data = json.loads(payload)
+    except ValueError as e:
+        raise ProtocolError(f"Invalid JSON payload: {e}") from None
+    if not isinstance(data, dict):
+        raise ProtocolError("JSON payload is not an object.")
+    return data
+
+async def read_frame(reader):
+    """
+    Read one frame from a stream.
+
+    Args:
+        reader (asyncio.StreamReader): The stream to read from.
+
+    Returns:
+        tuple: The message type and payload bytes.
+
+    Raises:
+        asyncio.IncompleteReadError: If the peer closed the connection.
+        ProtocolError: If the frame is larger than MAX_PAYLOAD.
+    """
+    header = await reader.readexactly(FRAME.size)
+    length, message_type = FRAME.unpack(header)
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"Frame of {length} bytes exceeds the {MAX_PAYLOAD} byte limit.")
+    return message_type, await reader.readexactly(length)
+
+def split_frames(buffer):
+    """
+    Take every complete frame off the front of a receive buffer, for clients
+    reading a non-blocking socket instead of an asyncio stream.
+
+    Args:
+        buffer (bytearray): Received bytes; complete frames are removed from it.
+
+    Returns:
+        list: (message type, payload bytes) for each complete frame.
+
+    Raises:
+        ProtocolError: If a frame is larger than MAX_PAYLOAD.
+    """
+    frames = []
+    offset = 0
+    while len(buffer) - offset >= FRAME.size:
+        length, message_type = FRAME.unpack_from(buffer, offset)
+        if length > MAX_PAYLOAD:
+            raise ProtocolError(f"Frame of {length} bytes exceeds the {MAX_PAYLOAD} byte limit.")
+        end = offset + FRAME.size + length
+        if len(buffer) < end:
+            break
+        frames.append((message_type, bytes(buffer[offset + FRAME.size:end])))
+        offset = end
+    del buffer[:offset]
+    return frames
+
+def encode_ack(tick):
+    """
+    Frame a snapshot acknowledgement.
+
+    Args:
+        tick (int): The tick of the newest snapshot received.
+
+    Returns:
+        bytes: The framed acknowledgement.
+    """
+    return encode_frame(ACK, ACK_PAYLOAD.pack(tick))
+
+def decode_ack(payload):
+    """
+    Decode a snapshot acknowledgement.
+
+    Returns:
+        int: The acknowledged tick.
+    """
+    if len(payload) != ACK_PAYLOAD.size:
+        raise ProtocolError("Malformed snapshot acknowledgement.")
+    return ACK_PAYLOAD.unpack(payload)[0]
+
+def encode_command(seq, command):
+    """
+    Frame an input command.
+
+    Args:
+        seq (int): The client's sequence number for the command.
+        command (InputCommand): The command to send.
+
+    Returns:
+        bytes: The framed command.
+    """
+    data = {"seq": seq, "kind": command.kind, "x": command.x, "y": command.y, "index": command.index}
+    if command.view_tick is not None:
+        data["view_tick"] = command.view_tick
+    return encode_json(COMMAND, data)
+
+def decode_command(payload):
+    """
+    Decode an input command.
+
+    Returns:
+        tuple: The sequence number and the InputCommand.
+
+    Raises:
+        ProtocolError: If a field is missing or has the wrong type.
+    """
+    data = decode_json(payload)
+    try:
+        seq = int(data["seq"])
+        view_tick = float(data["view_tick"]) if data.get("view_tick") is not None else None
+        command = InputCommand(int(data["kind"]), float(data["x"]), float(data["y"]), int(data["index"]), view_tick)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ProtocolError(f"Malformed command: {e}") from None
+    if not (math.isfinite(command.x) and math.isfinite(command.y)):
+        raise ProtocolError("Command position is not finite.")
+    if view_tick is not None and not math.isfinite(view_tick):
+        raise ProtocolError("Command view tick is not finite.")
+    return seq, command
@@ -0,0 +1,292 @@
+# src/network/snapshot.py
+import struct
+import zlib
+from collections import namedtuple
+
+# Field kinds. Values are quantized to integers when a record is built, so that
+# movement smaller than one quantum does not make an entity show up in a delta.
+POSITION = "position"    # Map coordinate in quarter units, uint16 (0 - 16383.75)
+TENTHS = "tenths"        # Health in tenths, uint16
+U8 = "u8"
+U16 = "u16"
+U32 = "u32"
+STRING = "string"        # uint8 length + UTF-8
+INVENTORY = "inventory"  # uint8 count + (string, uint16 quantity) pairs
+
+POSITION_SCALE = 4
+TENTHS_SCALE = 10
+NO_TICK = 0xFFFFFFFF
+NO_BASELINE = NO_TICK
+COMPRESSED = 1               # Header flag: the body is zlib compressed
+COMPRESS_THRESHOLD = 256     # Bodies shorter than this are never worth compressing
+SNAPSHOT_HISTORY = 32        # Sent snapshots kept as possible baselines per client
+
+HEADER = struct.Struct("<IIiIB")  # tick, baseline tick, last applied command seq, tick it was applied on, flags
+COUNTS = struct.Struct("<HH")    # changed records, removed ids
+FIELD_STRUCTS = {POSITION: struct.Struct("<H"), TENTHS: struct.Struct("<H"), U8: struct.Struct("<B"),
+                 U16: struct.Struct("<H"), U32: struct.Struct("<I")}
+U16_STRUCT = FIELD_STRUCTS[U16]
+
+Schema = namedtuple("Schema", ["name", "fields", "id_struct", "mask_struct"])
+# A decoded snapshot. `ack_tick` is the server tick the `ack` command was applied on, or None
+Snapshot = namedtuple("Snapshot", ["tick", "ack", "ack_tick", "state"])
+
+YOU = Schema("you", (
+    ("x", POSITION), ("y", POSITION), ("health", TENTHS), ("max_health", TENTHS), ("level", U16),
+    ("experience", U32), ("kills", U32), ("action", U8), ("skill", U8), ("inventory", INVENTORY),
+), None, struct.Struct("<H"))
+PLAYERS = Schema("players", (("x", POSITION), ("y", POSITION), ("health", TENTHS), ("action", U8)),
+                 struct.Struct("<H"), struct.Struct("<B"))
+ENEMIES = Schema("enemies", (("x", POSITION), ("y", POSITION), ("health", TENTHS), ("level", U8), ("alive", U8)),
+                 struct.Struct("<H"), struct.Struct("<B"))
+ITEMS = Schema("items", (("item", STRING), ("x", POSITION), ("y", POSITION), ("quantity", U16)),
+               struct.Struct("<I"), struct.Struct("<B"))
+ENTITY_SCHEMAS = (PLAYERS, ENEMIES, ITEMS)
+
+def quantize_position(value):
+    return min(max(int(round(value * POSITION_SCALE)), 0), 0xFFFF)
+
+def quantize_tenths(value):
+    return min(max(int(round(value * TENTHS_SCALE)), 0), 0xFFFF)
+
+def you_record(player, skill_index):
+    """Quantize the state a client needs about its own player."""
+    return (
+        quantize_position(player._x), quantize_position(player._y), quantize_tenths(player.health),
+        quantize_tenths(player.max_health), player.level, int(player.experience), player.enemy_kill_count,
+        player.action, skill_index, tuple(player.inventory.slots.items()),
+    )
+
+def player_record(player):
+    """Quantize the state other clients see of a player."""
+    return quantize_position(player._x), quantize_position(player._y), quantize_tenths(player.health), player.action
+
+def enemy_record(enemy):
+    """Quantize the state clients see of an enemy."""
+    return quantize_position(enemy.x), quantize_position(enemy.y), quantize_tenths(enemy.health), enemy.level, int(enemy.alive)
+
+def item_record(world_item):
+    """Quantize the state clients see of an item on the map."""
+    return world_item.item, quantize_position(world_item.x), quantize_position(world_item.y), world_item.quantity
+
+def _pack_field(buffer, kind, value):
+    if kind == STRING:
+        data = value.encode()[:255]
+        buffer.append(len(data))
+        buffer += data
+    elif kind == INVENTORY:
+        buffer.append(len(value))
+        for name, quantity in value:
+            _pack_field(buffer, STRING, name)
+            buffer += U16_STRUCT.pack(quantity)
+    else:
+        buffer += FIELD_STRUCTS[kind].pack(value)
+
+def _unpack_field(data, offset, kind):
+    if kind == STRING:
+        length = data[offset]
+        return data[offset + 1:offset + 1 + length].decode(), offset + 1 + length
+    if kind == INVENTORY:
+        count = data[offset]
+        offset += 1
+        slots = []
+        for _ in range(count):
+            name, offset = _unpack_field(data, offset, STRING)
+            slots.append((name, U16_STRUCT.unpack_from(data, offset)[0]))
+            offset += U16_STRUCT.size
+        return tuple(slots), offset
+    field_struct = FIELD_STRUCTS[kind]
+    return field_struct.unpack_from(data, offset)[0], offset + field_struct.size
+
+def _pack_record(buffer, schema, previous, record):
+    # A bit per field that differs from the baseline; new records send every field
+    mask = 0
+    for bit, value in enumerate(record):
+        if previous is None or previous[bit] != value:
+            mask |= 1 << bit
+    buffer += schema.mask_struct.pack(mask)
+    for bit, (_, kind) in enumerate(schema.fields):
+        if mask & (1 << bit):
+            _pack_field(buffer, kind, record[bit])
+    return mask
+
+def _unpack_record(data, offset, schema, previous):
+    mask = schema.mask_struct.unpack_from(data, offset)[0]
+    offset += schema.mask_struct.size
+    values = list(previous) if previous is not None else [None] * len(schema.fields)
+    for bit, (_, kind) in enumerate(schema.fields):
+        if mask & (1 << bit):
+            values[bit], offset = _unpack_field(data, offset, kind)
+    return tuple(values), offset
+
+def encode_snapshot(tick, ack, ack_tick, state, baseline=None, baseline_tick=NO_BASELINE, compress=True):
+    """
+    Encode a snapshot as a delta against a baseline the client already has.
+
+    Args:
+        tick (int): The tick the snapshot was taken on.
+        ack (int): The sequence number of the last command applied for the client.
+        ack_tick (int): The tick that command was applied on, or None if no command was applied yet.
+        state (dict): "you" -> record, and "players", "enemies", "items" -> {id: record}.
+        baseline (dict): The state the client acknowledged, or None to send everything.
+        baseline_tick (int): The tick of the baseline.
+        compress (bool): Whether large bodies may be zlib compressed.
+
+    Returns:
+        bytes: The encoded snapshot payload.
+    """
+    body = bytearray()
+    _pack_record(body, YOU, baseline["you"] if baseline else None, state["you"])
+    for schema in ENTITY_SCHEMAS:
+        records = state[schema.name]
+        previous = baseline[schema.name] if baseline else {}
+        changed = [(entity_id, record) for entity_id, record in records.items() if previous.get(entity_id) != record]
+        removed = [entity_id for entity_id in previous if entity_id not in records]
+        body += COUNTS.pack(len(changed), len(removed))
+        for entity_id in removed:
+            body += schema.id_struct.pack(entity_id)
+        for entity_id, record in changed:
+            body += schema.id_struct.pack(entity_id)
+            _pack_record(body, schema, previous.get(entity_id), record)
+
+    flags = 0
+    if compress and len(body) >= COMPRESS_THRESHOLD:
+        compressed = zlib.compress(bytes(body), 1)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= COMPRESSED
+    if baseline is None:
+        baseline_tick = NO_BASELINE
+    return HEADER.pack(tick, baseline_tick, ack, NO_TICK if ack_tick is None else ack_tick, flags) + bytes(body)
+
+def decode_snapshot(payload, baseline=None):
+    """
+    Decode a snapshot payload into the full state.
+
+    Args:
+        payload (bytes): The payload from `encode_snapshot`.
+        baseline (dict): The state of the snapshot's baseline tick, or None if it has none.
+
+    Returns:
+        Snapshot: The tick, the ack sequence number and tick, and the full state.
+    """
+    tick, _, ack, ack_tick, flags = HEADER.unpack_from(payload, 0)
+    body = payload[HEADER.size:]
+    if flags & COMPRESSED:
+        body = zlib.decompress(body)
+
+    state = {}
+    state["you"], offset = _unpack_record(body, 0, YOU, baseline["you"] if baseline else None)
+    for schema in ENTITY_SCHEMAS:
+        records = dict(baseline[schema.name]) if baseline else {}
+        changed, removed = COUNTS.unpack_from(body, offset)
+        offset += COUNTS.size
+        for _ in range(removed):
+            records.pop(schema.id_struct.unpack_from(body, offset)[0], None)
+            offset += schema.id_struct.size
+        for _ in range(changed):
+            entity_id = schema.id_struct.unpack_from(body, offset)[0]
+            offset += schema.id_struct.size
+            records[entity_id], offset = _unpack_record(body, offset, schema, records.get(entity_id))
+        state[schema.name] = records
+    return Snapshot(tick, ack, None if ack_tick == NO_TICK else ack_tick, state)
+
+def baseline_tick_of(payload):
+    """Get the baseline tick a snapshot payload was encoded against, or None."""
+    baseline_tick = HEADER.unpack_from(payload, 0)[1]
+    return None if baseline_tick == NO_BASELINE else baseline_tick
+
+def describe_record(schema, record):
+    """
+    Turn a quantized record back into named map units.
+
+    Returns:
+        dict: Field name -> value.
+    """
+    described = {}
+    for (name, kind), value in zip(schema.fields, record):
+        if kind == POSITION:
+            value = value / POSITION_SCALE
+        elif kind == TENTHS:
+            value = value / TENTHS_SCALE
+        elif kind == INVENTORY:
+            value = dict(value)
+        described[name] = value
+    return described
+
+class SnapshotEncoder:
+    """Per-client encoder remembering sent snapshots until the client acknowledges one."""
+
+    def __init__(self, compress=True):
+        """
+        Initialize the SnapshotEncoder.
+
+        Args:
+            compress (bool): Whether large snapshots may be zlib compressed.
+        """
+        self.compress = compress
+        self.sent = {}  # tick -> state sent on that tick
+        self.acked_tick = None
+
+    def encode(self, tick, ack, ack_tick, state):
+        """
+        Encode a snapshot against the newest acknowledged one and remember it.
+
+        Returns:
+            bytes: The snapshot payload.
+        """
+        baseline = self.sent.get(self.acked_tick)
+        payload = encode_snapshot(tick, ack, ack_tick, state, baseline, self.acked_tick if baseline else NO_BASELINE, self.compress)
+        self.sent[tick] = state
+        if len(self.sent) > SNAPSHOT_HISTORY:
+            # A client this far behind gets a full snapshot until it acknowledges again
+            oldest = min(self.sent)
+            del self.sent[oldest]
+        return payload
+
+    def acknowledge(self, tick):
+        """
+        Record that the client has received the snapshot of a tick.
+
+        Args:
+            tick (int): The acknowledged tick.
+        """
+        if tick in self.sent and (self.acked_tick is None or tick > self.acked_tick):
+            self.acked_tick = tick
+            for old_tick in [t for t in self.sent if t < tick]:
+                del self.sent[old_tick]
+
+class SnapshotDecoder:
+    """Client-side decoder keeping the states later deltas may be based on."""
+
+    def __init__(self):
+        """Initialize the SnapshotDecoder."""
+        self.states = {}  # tick -> full state
+        self.latest_tick = None
+
+    def decode(self, payload):
+        """
+        Decode a snapshot payload.
+
+        Returns:
+            Snapshot: The decoded snapshot, or None if the baseline is no longer
+            known (the server then falls back to a full snapshot).
+        """
+        baseline_tick = baseline_tick_of(payload)
+        baseline = None
+        if baseline_tick is not None:
+            baseline = self.states.get(baseline_tick)
+            if baseline is None:
+                return None
+        snapshot = decode_snapshot(payload, baseline)
+        tick = snapshot.tick
+        self.states[tick] = snapshot.state
+        if self.latest_tick is None or tick > self.latest_tick:
+            self.latest_tick = tick
+        # The server never goes back to a baseline older than the one it just used
+        if baseline_tick is not None:
+            for old_tick in [t for t in self.states if t < baseline_tick]:
+                del self.states[old_tick]
+        while len(self.states) > SNAPSHOT_HISTORY:
+            del self.states[min(self.states)]
+        return snapshot
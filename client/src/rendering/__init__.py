@@ -1,5 +1,7 @@
 # src/rendering/__init__.py
 from .game_renderer import GameRenderer
 from .map_renderer import TILE_WELL, TILE_TREE
+from .render_scaler import RenderScaler, RenderQuality, QUALITY_PRESETS, DEFAULT_QUALITY
 from .player_renderer import PlayerRenderer
 from .skill_inventory_renderer import SkillInventoryRenderer
+from .event_log_renderer import EventLogRenderer
@@ -0,0 +1,31 @@
+# src/rendering/event_log_renderer.py
+from src.utils import format_event, DAMAGE, KILL, LEVEL_UP, RESPAWN, SPAWN, ITEM_GAINED
+
+WHITE = (255, 255, 255)
+VISIBLE_LINES = 6
+LINE_HEIGHT = 22
+DISPLAY_KINDS = {DAMAGE, KILL, LEVEL_UP, RESPAWN, SPAWN, ITEM_GAINED}
+
+class EventLogRenderer:
+    def __init__(self, event_log, screen, font):
+        self.event_log = event_log
+        self.screen = screen
+        self.font = font
+        self.text_cache = {}  # event sequence -> rendered text surface
+
+    def render(self):
+        events = self.event_log.recent(VISIBLE_LINES, DISPLAY_KINDS)
+        x = 10
+        y = self.screen.get_height() - 100 - len(events) * LINE_HEIGHT
+
+        visible = {}
+        for event in events:
+            text_surface = self.text_cache.get(event.sequence)
+            if text_surface is None:
+                text_surface = self.font.render(format_event(event), True, WHITE)
+            visible[event.sequence] = text_surface
+            self.screen.blit(text_surface, (x, y))
+            y += LINE_HEIGHT
+
+        # Only keep the surfaces still on screen so the cache stays as small as the log window
+        self.text_cache = visible
@@ -1,10 +1,15 @@
 # src/rendering/game_renderer.py
+import time
 import pygame
-from src.rendering.map_renderer import render_map
+from src.rendering.map_renderer import render_map, load_images, load_animated_tiles
+from src.rendering.render_scaler import RenderScaler
+from src.utils import assets, metrics
 from datetime import datetime, timedelta
-from src.entities import NPC
 
 WHITE = (255, 255, 255)
+LOOT_ICON_SIZE = 60
+
+RENDER_SECONDS = metrics.histogram("client_render_seconds", "Time spent in GameRenderer.render per frame")
 
 class GameRenderer:
     def __init__(self, game, viewport_factor=4):
@@ -12,26 +17,45 @@ class GameRenderer:
         self.time_factor = 6
         self.viewport_factor = viewport_factor
         self.last_update = datetime.now()
-        self.enemy_image = pygame.image.load("assets/enemy/dog.png").convert_alpha()
-        self.question_mark_image = pygame.image.load("assets/question_mark.png").convert_alpha()
+        self.tile_images = load_images()
+        self.animated_tiles = load_animated_tiles()
+        self.enemy_image = assets.image("assets/enemy/dog.png")
+        self.question_mark_image = assets.image("assets/question_mark.png")
         self.item_icons = {
-            "Stick": pygame.image.load("assets/items/stick.png").convert_alpha(),
-            "Empty vial": pygame.image.load("assets/items/empty_vial.png").convert_alpha(),
-            "Vial of Water": pygame.image.load("assets/items/vial_of_water.png").convert_alpha(),
-            "Axe Head": pygame.image.load("assets/items/axe_head.png").convert_alpha(),
-            "Cutting Axe": pygame.image.load("assets/items/cutting_axe.png").convert_alpha(),
-            "Gold Coin": pygame.image.load("assets/items/gold_coin.png").convert_alpha(),
+            "Stick": assets.image("assets/items/stick.png"),
+            "Empty vial": assets.image("assets/items/empty_vial.png"),
+            "Vial of Water": assets.image("assets/items/vial_of_water.png"),
+            "Axe Head": assets.image("assets/items/axe_head.png"),
+            "Cutting Axe": assets.image("assets/items/cutting_axe.png"),
+            "Gold Coin": assets.image("assets/items/gold_coin.png"),
         }
         self.inventory_slot_size = 50
         self.inventory_margin = 10
         self.inventory_font = pygame.font.Font(None, 20)
+        self.scaled_item_icons = {}
+        self.world_item_images = {}  # Image path, or item name for loot drawn with its icon -> surface
+        self.inventory_slots = None  # Rebuilt when the inventory changes
+        self.game.player.inventory.subscribe(self.on_inventory_changed)
         self.enemy_font = pygame.font.Font(None, 24)
+        self.scaler = RenderScaler(game.screen)
+
+    def set_quality(self, quality, dynamic=False):
+        # Applies a preset from QUALITY_PRESETS; dynamic mode may lower the scale below the preset's
+        self.viewport_factor = quality.viewport_factor
+        self.scaler = RenderScaler(self.game.screen, quality, dynamic)
 
     def render(self):
-        self.game.screen.fill(WHITE)
-        render_map(self.game, viewport_factor=self.viewport_factor)
+        started = time.perf_counter()
+        # The world goes to the scaler's surface, at the internal resolution, and the HUD on top at native resolution
+        self.scaler.surface.fill(WHITE)
+        render_map(self.game, self.viewport_factor, self.tile_images, self.animated_tiles, self.scaler)
+        self.render_world_items()
         self.render_players()
         self.render_enemies()
+        self.render_npc_question_mark()
+        self.scaler.present()
+
+        self.render_enemy_labels()
         self.render_time()
         self.game.player_renderer.render_player_coords()
         self.game.player_renderer.render_player_health()
@@ -39,28 +63,23 @@ class GameRenderer:
         self.render_enemy_health()
         self.handle_mouse_right_click()
         self.handle_quests()
-        self.render_npc_question_mark()
-        self.game.interaction_manager.check_interaction()
         self.render_kill_count()
+        elapsed = time.perf_counter() - started
+        RENDER_SECONDS.observe(elapsed)
+        self.scaler.adjust(elapsed)
 
     def render_npc_question_mark(self):
         player = self.game.player
         screen_size = self.game.screen_size
+        scale = self.scaler.scale
+        image = self.scaler.image(self.question_mark_image)
 
-        # For the first NPC
-        npc1_x, npc1_y = self.game.NPC_POSITIONS[NPC.TILE_NPC_1]
-        if not self.game.quest_handler.axe_head_returned or not self.game.quest_handler.stick_returned:
-            screen_x = npc1_x - player._x + screen_size[0] // 2
-            screen_y = npc1_y - player._y + screen_size[1] // 2 - self.question_mark_image.get_height()
-            self.game.screen.blit(self.question_mark_image, (screen_x, screen_y))
-
-        # For the second NPC
-        if self.game.quest_handler.first_quest_completed() and not self.game.quest_handler.second_quest_completed():
-            npc2_x, npc2_y = self.game.NPC_POSITIONS[NPC.TILE_NPC_2]
-            if not self.game.quest_handler.empty_vial_returned or not self.game.quest_handler.filled_vial_of_water:
-                screen_x = npc2_x - player._x + screen_size[0] // 2
-                screen_y = npc2_y - player._y + screen_size[1] // 2 - self.question_mark_image.get_height()
-                self.game.screen.blit(self.question_mark_image, (screen_x, screen_y))
+        # NPCs with an available quest, refreshed by the quest handler only when quest progress changes
+        for npc_tile_id in self.game.quest_handler.question_mark_npcs:
+            npc_x, npc_y = self.game.NPC_POSITIONS[npc_tile_id]
+            screen_x = npc_x - player._x + screen_size[0] // 2
+            screen_y = npc_y - player._y + screen_size[1] // 2 - self.question_mark_image.get_height()
+            self.scaler.surface.blit(image, (screen_x * scale, screen_y * scale))
 
     def handle_mouse_right_click(self):
         if pygame.mouse.get_pressed()[2]:
@@ -98,7 +117,7 @@ class GameRenderer:
         text_rect = text_surface.get_rect(topleft=(500, 500))
         self.game.screen.blit(text_surface, text_rect)
 
-    def render_enemies(self):
+    def visible_enemies(self):
         player = self.game.player
         screen_size = self.game.screen_size
         viewport_width = screen_size[0] * self.viewport_factor
@@ -115,40 +134,71 @@ class GameRenderer:
                         enemy.x - player._x + screen_size[0] // 2 - 100,
                         enemy.y - player._y + screen_size[1] // 2 - 100
                     )
+                    yield enemy, enemy_screen_pos
 
-                    # Calculate the rectangle position and size
-                    rect_x = enemy_screen_pos[0] - 5  # Adjust as needed
-                    rect_y = enemy_screen_pos[1] - 5  # Adjust as needed
-                    rect_width = self.enemy_image.get_width() + 10  # Adjust as needed
-                    rect_height = self.enemy_image.get_height() + 10  # Adjust as needed
-
-                    # Draw the red rectangle
-                    pygame.draw.rect(self.game.screen, (255, 0, 0), (rect_x, rect_y, rect_width, rect_height), 2)
-                    
-                    # Draw the enemy image
-                    self.game.screen.blit(self.enemy_image, enemy_screen_pos)
-
-                    # Render enemy level
-                    level_text = f"Level {enemy.level}"
-                    level_surface = self.enemy_font.render(level_text, True, (0, 0, 0))
-                    level_rect = level_surface.get_rect()
-                    level_rect.topleft = (enemy_screen_pos[0], enemy_screen_pos[1] - 30)  # Adjust position as needed
-                    self.game.screen.blit(level_surface, level_rect)
+    def render_enemies(self):
+        # Enemy images are part of the world; their frames and levels are drawn by render_enemy_labels
+        scale = self.scaler.scale
+        image = self.scaler.image(self.enemy_image)
+        self.scaler.surface.blits([
+            (image, (enemy_screen_pos[0] * scale, enemy_screen_pos[1] * scale))
+            for enemy, enemy_screen_pos in self.visible_enemies()
+        ], doreturn=False)
+
+    def render_enemy_labels(self):
+        for enemy, enemy_screen_pos in self.visible_enemies():
+            # Calculate the rectangle position and size
+            rect_x = enemy_screen_pos[0] - 5  # Adjust as needed
+            rect_y = enemy_screen_pos[1] - 5  # Adjust as needed
+            rect_width = self.enemy_image.get_width() + 10  # Adjust as needed
+            rect_height = self.enemy_image.get_height() + 10  # Adjust as needed
+
+            # Draw the red rectangle
+            pygame.draw.rect(self.game.screen, (255, 0, 0), (rect_x, rect_y, rect_width, rect_height), 2)
+
+            # Render enemy level
+            level_text = f"Level {enemy.level}"
+            level_surface = self.enemy_font.render(level_text, True, (0, 0, 0))
+            level_rect = level_surface.get_rect()
+            level_rect.topleft = (enemy_screen_pos[0], enemy_screen_pos[1] - 30)  # Adjust position as needed
+            self.game.screen.blit(level_surface, level_rect)
 
     def render_players(self):
-        player_manager = self.game.player_manager
-        for player in player_manager.players:
-            player_size = player._size
-            player_render_x = self.game.screen_size[0] // 2 - player_size // 2
-            player_render_y = self.game.screen_size[1] // 2 - player_size // 2
-            self.game.screen.blit(player.image, (player_render_x, player_render_y))
+        # The camera follows the local player; only players on screen are drawn, in a single blits call
+        screen_size = self.game.screen_size
+        camera_x = self.game.player._x - screen_size[0] // 2
+        camera_y = self.game.player._y - screen_size[1] // 2
+        visible = self.game.player_manager.visible_players(camera_x, camera_y, screen_size[0], screen_size[1])
+        scale, image = self.scaler.scale, self.scaler.image
+        self.scaler.surface.blits([
+            (image(player.image), ((player._x - camera_x - player._size // 2) * scale, (player._y - camera_y - player._size // 2) * scale))
+            for player in visible
+        ], doreturn=False)
+
+    def on_inventory_changed(self, item, quantity):
+        self.inventory_slots = None
+
+    def build_inventory_slots(self):
+        # Icons are scaled and labels rendered once per inventory change instead of every frame
+        slots = []
+        for item_name, quantity in self.game.player.inventory.slots.items():
+            icon = self.scaled_item_icons.get(item_name)
+            if icon is None and item_name in self.item_icons:
+                icon = pygame.transform.scale(self.item_icons[item_name], (self.inventory_slot_size, self.inventory_slot_size))
+                self.scaled_item_icons[item_name] = icon
+            name_surface = self.inventory_font.render(item_name, True, (255, 255, 255))
+            count_surface = self.inventory_font.render(str(quantity), True, (255, 255, 255)) if quantity > 1 else None
+            slots.append((icon, name_surface, count_surface))
+        return slots
 
     def render_inventory(self):
-        player_inventory = self.game.player.inventory
+        if self.inventory_slots is None:
+            self.inventory_slots = self.build_inventory_slots()
+
         inventory_rect = pygame.Rect(
             self.inventory_margin, 
             self.game.screen_size[1] - self.inventory_margin - self.inventory_slot_size,
-            (self.inventory_slot_size + self.inventory_margin) * len(player_inventory.items) + self.inventory_margin,
+            (self.inventory_slot_size + self.inventory_margin) * len(self.inventory_slots) + self.inventory_margin,
             self.inventory_slot_size + self.inventory_margin * 2
         )
         pygame.draw.rect(self.game.screen, (0, 0, 0), inventory_rect, 2)
@@ -156,20 +206,20 @@ class GameRenderer:
         slot_x = self.inventory_margin * 2
         slot_y = self.game.screen_size[1] - self.inventory_margin - self.inventory_slot_size + self.inventory_margin
 
-        for item_name in player_inventory.items:
-            item_icon = self.item_icons.get(item_name)
-            if item_icon:
-                # Resize the image to fit the inventory slot size
-                resized_icon = pygame.transform.scale(item_icon, (self.inventory_slot_size, self.inventory_slot_size))
-                item_rect = pygame.Rect(slot_x, slot_y, self.inventory_slot_size, self.inventory_slot_size)
-                self.game.screen.blit(resized_icon, item_rect)
+        for icon, name_surface, count_surface in self.inventory_slots:
+            if icon:
+                self.game.screen.blit(icon, (slot_x, slot_y))
 
             # Render item name
-            item_name_text = self.inventory_font.render(item_name, True, (255, 255, 255))
-            item_name_rect = item_name_text.get_rect(
+            item_name_rect = name_surface.get_rect(
                 center=(slot_x + self.inventory_slot_size // 2, slot_y + self.inventory_slot_size + self.inventory_margin)
             )
-            self.game.screen.blit(item_name_text, item_name_rect)
+            self.game.screen.blit(name_surface, item_name_rect)
+
+            # Render the stack size in the bottom-right corner of the slot
+            if count_surface:
+                count_rect = count_surface.get_rect(bottomright=(slot_x + self.inventory_slot_size, slot_y + self.inventory_slot_size))
+                self.game.screen.blit(count_surface, count_rect)
 
             slot_x += self.inventory_slot_size + self.inventory_margin
 
@@ -205,9 +255,34 @@ class GameRenderer:
     def update_last_update_time(self):
         self.last_update = datetime.now()
 
-    def handle_quests(self):
-        if self.game.quest_handler.quest_active:
-            self.game.quest_handler.handle_axe_pickup()
+    def get_world_item_image(self, world_item):
+        image = self.world_item_images.get(world_item.image or world_item.item)
+        if image is None:
+            if world_item.image:
+                image = assets.image(world_item.image)
+            elif world_item.item in self.item_icons:
+                image = pygame.transform.scale(self.item_icons[world_item.item], (LOOT_ICON_SIZE, LOOT_ICON_SIZE))
+            else:
+                return None
+            self.world_item_images[world_item.image or world_item.item] = image
+        return image
 
-        if self.game.quest_handler.healing_quest_active and not self.game.quest_handler.quest_active:
-            self.game.quest_handler.handle_vial_pickup()
+    def render_world_items(self):
+        player = self.game.player
+        screen_size = self.game.screen_size
+        offset_x = player._x - screen_size[0] // 2
+        offset_y = player._y - screen_size[1] // 2
+
+        # Items are stored by their centre, so widen the query by the largest image to keep edge items drawn
+        margin = self.game.CHUNK_SIZE
+        visible = self.game.world_items.visible(offset_x - margin, offset_y - margin,
+                                                screen_size[0] + margin * 2, screen_size[1] + margin * 2)
+        scale = self.scaler.scale
+        for world_item in visible:
+            image = self.get_world_item_image(world_item)
+            if image:
+                image = self.scaler.image(image)
+                self.scaler.surface.blit(image, image.get_rect(center=((world_item.x - offset_x) * scale, (world_item.y - offset_y) * scale)))
+
+    def handle_quests(self):
+        self.game.quest_handler.render_hint()
@@ -1,5 +1,6 @@
 # src/rendering/map_renderer.py
 import pygame
+from src.utils import assets, sim_clock
 
 # Define tile constants
 TILE_GRASS_BODY = 2
@@ -20,7 +21,6 @@ IMAGE_PATHS = {
     TILE_GRASS_BODY: 'assets/terrain/grass_body.png',
     TILE_TREE: 'assets/terrain/tree.png',
     TILE_STONE: 'assets/terrain/stone5.png',
-    TILE_WATERFALL: 'assets/terrain/waterfall_sprite_sheet.png',
     TILE_BOTTOM: 'assets/terrain/bottom.png',
     TILE_LEFT: 'assets/terrain/left.png',
     TILE_WELL: 'assets/terrain/well.png',
@@ -31,20 +31,58 @@ IMAGE_PATHS = {
     TILE_BOTTOM_LEFT: 'assets/terrain/bottom_left.png'
 }
 
+# Define animated tiles: sheet path, frame width, frame height, frame count and milliseconds per frame.
+# Frames are read left to right, then top to bottom; the waterfall sheet holds a single 600x600 frame for now.
+ANIMATED_TILES = {
+    TILE_WATERFALL: ('assets/terrain/waterfall_sprite_sheet.png', 600, 600, 1, 150),
+}
+
 def load_images():
-    """Load images for map rendering."""
+    """Get the images for map rendering, once, from the asset store."""
     images = {}
     for tile_type, path in IMAGE_PATHS.items():
         try:
-            images[tile_type] = pygame.image.load(path).convert()
+            images[tile_type] = assets.image(path, alpha=False)
         except pygame.error as e:
             print(f"Error loading image for tile type {tile_type}: {e}")
             # Handle error gracefully, e.g., fallback to a default image
     return images
 
-def render_map(game, viewport_factor):
-    """Render the game map."""
-    screen = game.screen
+def load_animated_tiles():
+    """Cut the frames of every animated tile, once, as views into their sheets."""
+    animations = {}
+    for tile_type, (path, frame_width, frame_height, frame_count, frame_duration) in ANIMATED_TILES.items():
+        try:
+            sheet = assets.image(path, alpha=False)
+            columns = sheet.get_width() // frame_width
+            frames = [
+                sheet.subsurface(((index % columns) * frame_width, (index // columns) * frame_height, frame_width, frame_height))
+                for index in range(frame_count)
+            ]
+        except (pygame.error, ValueError, ZeroDivisionError) as e:
+            print(f"Error loading animation for tile type {tile_type}: {e}")
+            continue
+        animations[tile_type] = (frames, frame_duration)
+    return animations
+
+def current_tile_images(images, animations, ticks=None):
+    """Get the tile images with every animated tile at its current frame of the animation clock."""
+    if not animations:
+        return images
+    ticks = sim_clock.get_ticks() if ticks is None else ticks
+    current = dict(images)
+    for tile_type, (frames, frame_duration) in animations.items():
+        current[tile_type] = frames[ticks // frame_duration % len(frames)]
+    return current
+
+def render_map(game, viewport_factor, images, animations=None, scaler=None):
+    """
+    Render the game map with the tile images from `load_images` and the animations from `load_animated_tiles`.
+
+    Draws onto the internal surface of `scaler`, with images at its scale, when one is given.
+    """
+    screen = game.screen if scaler is None else scaler.surface
+    scale = 1 if scaler is None else scaler.scale
     player = game.player
     map_tiles = game.map_tiles
     screen_size = game.screen_size
@@ -63,13 +101,14 @@ def render_map(game, viewport_factor):
     
     center_x = screen_size[0] // 2
     center_y = screen_size[1] // 2
-    
-    images = load_images()
+    images = current_tile_images(images, animations)
+    if scale != 1:
+        images = {tile_type: scaler.image(image) for tile_type, image in images.items()}
     
     for y in range(render_start_y, render_end_y):
         for x in range(render_start_x, render_end_x):
             tile_type = map_tiles[y][x]
             if tile_type in images:
                 image = images[tile_type]
-                screen.blit(image, ((x - player_chunk_x) * chunk_size + center_x - player_offset_x,
-                                    (y - player_chunk_y) * chunk_size + center_y - player_offset_y))
+                screen.blit(image, (((x - player_chunk_x) * chunk_size + center_x - player_offset_x) * scale,
+                                    ((y - player_chunk_y) * chunk_size + center_y - player_offset_y) * scale))
@@ -0,0 +1,109 @@
+# src/rendering/render_scaler.py
+from collections import namedtuple
+import pygame
+from src.utils import metrics
+
+# A quality preset: the world's render scale and how far past the screen the map is drawn, in screens
+RenderQuality = namedtuple("RenderQuality", ["scale", "viewport_factor"])
+
+QUALITY_PRESETS = {
+    "low": RenderQuality(0.5, 3),
+    "medium": RenderQuality(0.75, 3),
+    "high": RenderQuality(1.0, 4),
+}
+DEFAULT_QUALITY = "high"
+
+SCALE_STEPS = (1.0, 0.75, 0.5)  # Scales that keep a 200 unit map tile a whole number of pixels
+RENDER_BUDGET = 0.010  # Seconds of a 60 fps frame the renderer may take in dynamic mode
+SLOW_FRAMES = 30       # Consecutive frames over budget before the scale is lowered
+FAST_FRAMES = 180      # Consecutive frames under half the budget before the scale is raised again
+
+RENDER_SCALE = metrics.gauge("client_render_scale", "Scale of the world render relative to the display")
+
+class RenderScaler:
+    """
+    Render target for the world at an internal resolution, upscaled to the display.
+
+    At scale 1 the world is drawn straight onto the display. Below 1 it is drawn
+    onto a smaller offscreen surface with images scaled once to match, and
+    `present` stretches it over the display, where the HUD is then drawn at
+    native resolution. In dynamic mode the scale steps down while rendering
+    runs over budget and back up, to at most the preset's scale, once it is
+    comfortably under.
+    """
+
+    def __init__(self, screen, quality=QUALITY_PRESETS[DEFAULT_QUALITY], dynamic=False):
+        """
+        Initialize the RenderScaler.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+            quality (RenderQuality): The preset giving the highest scale used.
+            dynamic (bool): Whether to lower the scale when rendering takes longer than `RENDER_BUDGET`.
+        """
+        self.screen = screen
+        self.steps = [quality.scale] + [scale for scale in SCALE_STEPS if scale < quality.scale]
+        self.dynamic = dynamic
+        self.slow_frames = 0
+        self.fast_frames = 0
+        self.set_scale(quality.scale)
+
+    def set_scale(self, scale):
+        """
+        Change the internal resolution, dropping images scaled for the previous one.
+
+        Args:
+            scale (float): The world's size on the internal surface relative to the display.
+        """
+        self.scale = scale
+        self.scaled_images = {}  # Source surface -> copy at the current scale
+        if scale == 1:
+            self.surface = self.screen
+        else:
+            width, height = self.screen.get_size()
+            self.surface = pygame.Surface((round(width * scale), round(height * scale))).convert()
+        RENDER_SCALE.set(scale)
+
+    def image(self, image):
+        """
+        Get an image at the current scale. Scaled copies are kept, so only pass images that are reused.
+
+        Args:
+            image (pygame.Surface): The image at display resolution.
+
+        Returns:
+            pygame.Surface: The image to draw on `surface`.
+        """
+        if self.scale == 1:
+            return image
+        scaled = self.scaled_images.get(image)
+        if scaled is None:
+            width, height = image.get_size()
+            size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            scaled = self.scaled_images[image] = pygame.transform.smoothscale(image, size)
+        return scaled
+
+    def present(self):
+        """Stretch the internal surface over the display. Nothing to do at scale 1."""
+        if self.surface is not self.screen:
+            pygame.transform.scale(self.surface, self.screen.get_size(), self.screen)
+
+    def adjust(self, render_seconds):
+        """
+        Move the scale one step down or up in dynamic mode after a frame.
+
+        Args:
+            render_seconds (float): How long the frame took to render.
+        """
+        if not self.dynamic:
+            return
+        self.slow_frames = self.slow_frames + 1 if render_seconds > RENDER_BUDGET else 0
+        self.fast_frames = self.fast_frames + 1 if render_seconds < RENDER_BUDGET / 2 else 0
+        index = self.steps.index(self.scale)
+        if self.slow_frames >= SLOW_FRAMES and index + 1 < len(self.steps):
+            self.set_scale(self.steps[index + 1])
+        elif self.fast_frames >= FAST_FRAMES and index > 0:
+            self.set_scale(self.steps[index - 1])
+        else:
+            return
+        self.slow_frames = self.fast_frames = 0
@@ -0,0 +1,11 @@
+# src/server/__init__.py
+from .interest import InterestArea, VIEW_RADIUS
+from .persistence import PlayerStore, DB_FILE
+from .lag_compensation import EnemyHistory, REWIND_TICKS
+from .metrics_endpoint import MetricsEndpoint, METRICS_PORT
+from .world import ZoneWorld, WorldPlayer
+from .server import GameServer, ClientConnection, TICK_RATE
+from .load_test import LoadTest, LoadStep
+from .cluster import ZoneCluster, ZoneLink
+from .regions import RegionLayout, RegionWorld, GHOST_MARGIN
+from .partition import PartitionedWorld, RegionPlayer
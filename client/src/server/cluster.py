@@ -0,0 +1,146 @@
+# src/server/cluster.py
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+from src.game_logic import ZONES
+from src.server.persistence import PlayerStore, DB_FILE
+from src.server.server import GameServer, TICK_RATE
+from src.server.world import ZoneWorld
+
+class ZoneLink:
+    """
+    Connection between the servers of a cluster, used to hand players off.
+
+    Every zone has an inbox queue. A departing player's state is put in the
+    destination's inbox under a token, which the client presents when it logs in there.
+    """
+
+    def __init__(self, zone_name, addresses, inboxes):
+        """
+        Initialize the ZoneLink.
+
+        Args:
+            zone_name (str): The zone of the server owning the link.
+            addresses (dict): Zone name -> (host, port) its clients connect to.
+            inboxes (dict): Zone name -> multiprocessing.Queue of arriving players.
+        """
+        self.zone_name = zone_name
+        self.addresses = addresses
+        self.inboxes = inboxes
+
+    def send(self, destination, token, state):
+        """
+        Send a player's state to another zone.
+
+        Args:
+            destination (str): The name of the zone.
+            token (str): The token the client logs in with.
+            state (dict): The player's state from `WorldPlayer.get_state`.
+        """
+        self.inboxes[destination].put((token, state))
+
+    def receive(self):
+        """
+        Take the players that have arrived in this zone's inbox.
+
+        Returns:
+            dict: Token -> player state.
+        """
+        arrivals = {}
+        inbox = self.inboxes[self.zone_name]
+        while True:
+            try:
+                token, state = inbox.get_nowait()
+            except queue.Empty:
+                return arrivals
+            arrivals[token] = state
+
+def run_zone_worker(zone_name, host, addresses, inboxes, tick_rate, db_file, metrics_port=None):
+    """
+    Process entry point serving one zone until the process is terminated.
+
+    Args:
+        zone_name (str): The entry of `ZONES` to serve.
+        host (str): The address to listen on.
+        addresses (dict): Zone name -> (host, port) of every zone in the cluster.
+        inboxes (dict): Zone name -> multiprocessing.Queue of arriving players.
+        tick_rate (int): Simulation ticks per second.
+        db_file (str): The SQLite file players are saved in, shared by the zones; None to not save.
+        metrics_port (int): TCP port serving the zone's metrics; None to not serve them.
+    """
+    world = ZoneWorld(zone=ZONES[zone_name])
+    link = ZoneLink(zone_name, addresses, inboxes)
+    store = PlayerStore(db_file) if db_file else None
+    if store is not None:
+        store.start()
+    server = GameServer(world, host, addresses[zone_name][1], tick_rate, zone_link=link, store=store, metrics_port=metrics_port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store is not None:
+            store.close()
+
+class ZoneCluster:
+    """
+    One server process per zone.
+
+    The simulation clock and the tick loop are per process, so each zone gets
+    a CPU core of its own. Zone `i` listens on `base_port + i`, in the order of `ZONES`,
+    and serves its metrics on `metrics_port + i`.
+    """
+
+    def __init__(self, host="127.0.0.1", base_port=7777, tick_rate=TICK_RATE, zones=None, db_file=DB_FILE, metrics_port=None):
+        """
+        Initialize the ZoneCluster.
+
+        Args:
+            host (str): The address every zone listens on.
+            base_port (int): The TCP port of the first zone.
+            tick_rate (int): Simulation ticks per second.
+            zones (list): Names of the zones to serve; every zone in `ZONES` if None.
+            db_file (str): The SQLite file players are saved in; None to not save.
+            metrics_port (int): TCP port of the first zone's metrics; None to not serve them.
+        """
+        self.host = host
+        self.metrics_port = metrics_port
+        self.db_file = db_file
+        self.tick_rate = tick_rate
+        self.zones = list(zones or ZONES)
+        self.addresses = {zone_name: (host, base_port + index) for index, zone_name in enumerate(self.zones)}
+        self.inboxes = {}
+        self.processes = []
+
+    def start(self):
+        """Start a process for every zone."""
+        context = multiprocessing.get_context("spawn")
+        # Kept on the cluster so the queues outlive `start` while the processes unpickle them
+        self.inboxes = {zone_name: context.Queue() for zone_name in self.zones}
+        for index, zone_name in enumerate(self.zones):
+            metrics_port = self.metrics_port + index if self.metrics_port is not None else None
+            process = context.Process(
+                target=run_zone_worker,
+                args=(zone_name, self.host, self.addresses, self.inboxes, self.tick_rate, self.db_file, metrics_port),
+                name=f"zone-{zone_name}", daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+
+    def join(self):
+        """Wait until every zone process exits."""
+        for process in self.processes:
+            process.join()
+
+    def stop(self):
+        """Stop every zone process, letting it save its players first."""
+        for process in self.processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGINT)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
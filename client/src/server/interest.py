@@ -0,0 +1,61 @@
+# src/server/interest.py
+VIEW_RADIUS = 6  # Cells in each direction a client receives entities from; covers a 2400x2400 view at CHUNK_SIZE 200
+
+class InterestArea:
+    """
+    The square block of grid cells a client is subscribed to.
+
+    Snapshots are built by querying only these cells of the player, enemy and
+    item grids, so the cost per client depends on how crowded its surroundings
+    are rather than on the number of entities in the zone. Entities crossing the
+    edge of the block show up as new or removed records in the delta snapshot.
+    """
+
+    def __init__(self, radius=VIEW_RADIUS):
+        """
+        Initialize the InterestArea.
+
+        Args:
+            radius (int): The number of cells in each direction around the player's cell.
+        """
+        self.radius = radius
+        self.cells = None  # (min_cell_x, min_cell_y, max_cell_x, max_cell_y)
+
+    def update(self, cell):
+        """
+        Centre the area on the cell the player is in.
+
+        Args:
+            cell (tuple): The player's cell (cell_x, cell_y).
+
+        Returns:
+            bool: True if the subscribed cells changed.
+        """
+        cell_x, cell_y = cell
+        radius = self.radius
+        cells = (cell_x - radius, cell_y - radius, cell_x + radius, cell_y + radius)
+        if cells == self.cells:
+            return False
+        self.cells = cells
+        return True
+
+    def contains(self, cell):
+        """Whether a cell is subscribed."""
+        if self.cells is None:
+            return False
+        min_cell_x, min_cell_y, max_cell_x, max_cell_y = self.cells
+        return min_cell_x <= cell[0] <= max_cell_x and min_cell_y <= cell[1] <= max_cell_y
+
+    def query(self, grid):
+        """
+        Get the objects of a grid inside the subscribed cells.
+
+        Args:
+            grid (SpatialGrid): A grid using the same cell size as the area.
+
+        Returns:
+            list: The objects in the subscribed cells.
+        """
+        if self.cells is None:
+            return []
+        return grid.query_cells(*self.cells)
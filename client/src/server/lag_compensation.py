@@ -0,0 +1,142 @@
+# src/server/lag_compensation.py
+from contextlib import contextmanager
+from src.utils import metrics
+
+REWIND_TICKS = 30      # Ticks of enemy positions kept, half a second at 60 ticks per second
+MAX_ENEMY_SPEED = 2    # Map units an enemy moves per tick, `Enemy.speed`
+
+REWIND_AGE = metrics.histogram(
+    "lag_compensation_rewind_ticks", "How far back skill hits were checked",
+    buckets=(0, 2, 4, 8, 12, 16, 24, REWIND_TICKS),
+)
+
+class EnemyHistory:
+    """
+    Ring buffer of every enemy's position at each of the last `capacity` ticks.
+
+    Lets the server check a skill against the enemies where the attacking client
+    drew them: remote entities are drawn a few ticks in the past, so by the time
+    the command arrives they have moved on. Memory is bounded by the capacity,
+    and finding the ticks around a view time is a binary search over the ring.
+    """
+
+    def __init__(self, capacity=REWIND_TICKS):
+        """
+        Initialize the EnemyHistory.
+
+        Args:
+            capacity (int): The number of ticks kept, and so the furthest a hit can be rewound.
+        """
+        self.capacity = capacity
+        self.ticks = [0] * capacity
+        self.frames = [None] * capacity  # Enemy -> (x, y, alive) at the tick in `ticks`
+        self.start = 0  # Slot of the oldest tick
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def record(self, tick, enemies):
+        """
+        Store the enemies' positions after a tick, overwriting the oldest tick once full.
+
+        Args:
+            tick (int): The tick just simulated; ticks are recorded in increasing order.
+            enemies (list): The zone's enemies.
+        """
+        if self.count < self.capacity:
+            slot = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+        self.ticks[slot] = tick
+        self.frames[slot] = {enemy: (enemy.x, enemy.y, enemy.alive) for enemy in enemies}
+
+    def oldest_tick(self):
+        """The oldest tick kept, or None when empty."""
+        return self.ticks[self.start] if self.count else None
+
+    def newest_tick(self):
+        """The newest tick kept, or None when empty."""
+        return self.ticks[(self.start + self.count - 1) % self.capacity] if self.count else None
+
+    def find(self, tick):
+        """
+        Find the newest recorded tick at or before a tick, by binary search over the ring.
+
+        Args:
+            tick (float): The tick to look up.
+
+        Returns:
+            int: The position of the recorded tick counted from the oldest, or -1 if every kept tick is later.
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.ticks[(self.start + middle) % self.capacity] <= tick:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1
+
+    def sample(self, view_tick):
+        """
+        Get the frames around a view time, as the client interpolated between them.
+
+        Args:
+            view_tick (float): The server tick the client drew the enemies at, clamped to the ticks kept.
+
+        Returns:
+            tuple: The frame at or before the view tick, the one after it and the fraction between them.
+        """
+        view_tick = min(max(view_tick, self.oldest_tick()), self.newest_tick())
+        index = self.find(view_tick)
+        before_slot = (self.start + index) % self.capacity
+        if index + 1 >= self.count:
+            return self.frames[before_slot], self.frames[before_slot], 0.0
+        after_slot = (before_slot + 1) % self.capacity
+        span = self.ticks[after_slot] - self.ticks[before_slot]
+        return self.frames[before_slot], self.frames[after_slot], (view_tick - self.ticks[before_slot]) / span
+
+    @contextmanager
+    def rewind(self, enemy_grid, view_tick, x, y, radius):
+        """
+        Move the enemies near a point back to where they were at a view time, and back again on exit.
+
+        Only enemies that could have been within `radius` of the point at the view time are
+        moved, so the cost does not grow with the zone. An enemy only counts as alive
+        if it is alive both now and then: the client did not see it if it had not
+        respawned yet, and it cannot be hit again once it is dead.
+
+        Args:
+            enemy_grid (SpatialGrid): The grid indexing the enemies; kept in step with the moves.
+            view_tick (float): The server tick the client drew the enemies at, or None to not rewind.
+            x (float): The x-coordinate of the point, usually the attacker.
+            y (float): The y-coordinate of the point.
+            radius (float): The distance from the point the caller will query.
+        """
+        newest = self.newest_tick()
+        if view_tick is None or newest is None or view_tick >= newest:
+            yield
+            return
+        age = newest - max(view_tick, self.oldest_tick())
+        REWIND_AGE.observe(age)
+        before, after, fraction = self.sample(view_tick)
+        moved = []
+        for enemy in enemy_grid.query_radius(x, y, radius + age * MAX_ENEMY_SPEED):
+            past = before.get(enemy)
+            if past is None:
+                continue  # Not in the zone back then, or a region's ghost
+            later = after.get(enemy, past)
+            moved.append((enemy, enemy.x, enemy.y, enemy.alive))
+            enemy.x = past[0] + (later[0] - past[0]) * fraction
+            enemy.y = past[1] + (later[1] - past[1]) * fraction
+            enemy.alive = enemy.alive and past[2]
+            enemy_grid.move(enemy, enemy.x, enemy.y)
+        try:
+            yield
+        finally:
+            for enemy, enemy_x, enemy_y, alive in moved:
+                enemy.x, enemy.y, enemy.alive = enemy_x, enemy_y, alive
+                enemy_grid.move(enemy, enemy_x, enemy_y)
@@ -0,0 +1,207 @@
+# src/server/load_test.py
+import asyncio
+import math
+import multiprocessing
+import queue
+import random
+import time
+from collections import namedtuple
+from src.network import NetworkClient
+from src.network.bot import Bot
+from src.server.server import GameServer, TICK_RATE
+from src.server.world import ZoneWorld, MAP_FILE
+
+BOT_FRAME = 1 / 30     # Seconds between bot updates in a worker
+REPORT_INTERVAL = 1.0  # Seconds between worker reports
+WARMUP = 2.0           # Seconds after adding bots before measuring, while they log in and spread out
+
+# One row of the report: the load and what the server and the bots measured under it
+LoadStep = namedtuple("LoadStep", [
+    "players", "ticks", "tick_p50", "tick_p95", "tick_p99", "tick_max", "budget_used",
+    "bytes_per_second", "bytes_per_client", "rtt_p50", "rtt_p95", "snapshots_dropped", "max_queued_bytes",
+])
+
+def percentile(values, fraction):
+    """
+    Get a percentile of some values by the nearest-rank method.
+
+    Args:
+        values (list): The values.
+        fraction (float): The percentile as a fraction, e.g. 0.99.
+
+    Returns:
+        float: The value, or 0 if there are none.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+def run_bot_worker(host, port, worker_index, seed, commands, reports):
+    """
+    Process entry point running a group of bots until told to stop.
+
+    Args:
+        host (str): The server address.
+        port (int): The server TCP port.
+        worker_index (int): The worker's number, used in bot names.
+        seed (int): Seed of the bots' decisions.
+        commands (multiprocessing.Queue): ("bots", count) to grow the group, ("stop",) to end.
+        reports (multiprocessing.Queue): Receives (worker_index, bots, failed logins, round-trip samples in ms).
+    """
+    rng = random.Random(seed)
+    bots = []
+    failures = 0
+    next_report = time.perf_counter() + REPORT_INTERVAL
+    while True:
+        try:
+            command = commands.get_nowait()
+        except queue.Empty:
+            command = None
+        if command is not None:
+            if command[0] == "stop":
+                break
+            while len(bots) < command[1]:
+                bot = Bot(NetworkClient(host, port, f"bot{worker_index}-{len(bots)}"), random.Random(rng.random()))
+                try:
+                    bot.connect(time.perf_counter())
+                except OSError as e:
+                    print(f"Bot failed to log in: {e}")
+                    failures += 1
+                    break
+                bots.append(bot)
+
+        now = time.perf_counter()
+        for bot in bots:
+            if bot.client.connected:
+                bot.update(now)
+        if now >= next_report:
+            samples = []
+            for bot in bots:
+                samples.extend(bot.client.rtt_samples)
+                bot.client.rtt_samples.clear()
+            reports.put((worker_index, sum(bot.client.connected for bot in bots), failures, samples))
+            next_report = now + REPORT_INTERVAL
+        time.sleep(max(0.0, BOT_FRAME - (time.perf_counter() - now)))
+
+    for bot in bots:
+        bot.client.close()
+
+class LoadTest:
+    """
+    Capacity test of one zone.
+
+    Runs a `GameServer` in this process and scripted bots in worker processes,
+    so the bots do not take CPU time from the server's tick loop. The number of
+    bots is raised step by step; after each step the server's tick times, its
+    outbound bandwidth and the bots' command round-trip times are reported.
+    """
+
+    def __init__(self, steps, step_duration=10.0, processes=2, map_file=MAP_FILE, tick_rate=TICK_RATE, seed=0, warmup=WARMUP):
+        """
+        Initialize the LoadTest.
+
+        Args:
+            steps (list): The number of bots connected in each step, in increasing order.
+            step_duration (float): Seconds measured per step.
+            processes (int): Worker processes the bots are spread over.
+            map_file (str): The tile map of the zone.
+            tick_rate (int): Simulation ticks per second.
+            seed (int): Seed of the bots' decisions.
+            warmup (float): Seconds after adding bots before measuring.
+        """
+        self.steps = steps
+        self.step_duration = step_duration
+        self.processes = processes
+        self.map_file = map_file
+        self.tick_rate = tick_rate
+        self.seed = seed
+        self.warmup = warmup
+        self.connected = {}  # worker index -> bots logged in
+        self.rtt_samples = []
+
+    def drain_reports(self, reports):
+        while True:
+            try:
+                worker_index, connected, failures, samples = reports.get_nowait()
+            except queue.Empty:
+                return
+            self.connected[worker_index] = connected
+            self.rtt_samples.extend(samples)
+
+    async def wait(self, reports, seconds):
+        """Sleep while collecting worker reports."""
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            self.drain_reports(reports)
+            await asyncio.sleep(min(0.2, max(0.0, deadline - time.perf_counter())))
+        self.drain_reports(reports)
+
+    async def run(self):
+        """
+        Run every step and print a report line for each.
+
+        Returns:
+            list: A LoadStep for each step.
+        """
+        server = GameServer(ZoneWorld(self.map_file), port=0, tick_rate=self.tick_rate)
+        await server.start()
+        ticking = asyncio.create_task(server.run())
+
+        context = multiprocessing.get_context("spawn")
+        reports = context.Queue()
+        commands = [context.Queue() for _ in range(self.processes)]
+        workers = [
+            context.Process(target=run_bot_worker, args=(server.host, server.port, index, self.seed + index, commands[index], reports), daemon=True)
+            for index in range(self.processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        budget = 1 / self.tick_rate
+        results = []
+        print(f"{'players':>7} {'ticks':>6} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'max ms':>7} {'budget':>7} "
+              f"{'out kB/s':>9} {'B/client/s':>10} {'rtt p50':>8} {'rtt p95':>8} {'dropped':>8} {'queued B':>9}")
+        try:
+            for players in self.steps:
+                for index, worker_commands in enumerate(commands):
+                    # Spread the bots evenly, the first workers taking the remainder
+                    worker_commands.put(("bots", players // self.processes + (index < players % self.processes)))
+                await self.wait(reports, self.warmup)
+
+                server.tick_durations.clear()
+                self.rtt_samples = []
+                bytes_before = sum(connection.bytes_sent for connection in server.connections.values())
+                dropped_before = sum(connection.snapshots_dropped for connection in server.connections.values())
+                started = time.perf_counter()
+                await self.wait(reports, self.step_duration)
+                elapsed = time.perf_counter() - started
+                bytes_sent = sum(connection.bytes_sent for connection in server.connections.values()) - bytes_before
+
+                durations = list(server.tick_durations)
+                connected = len(server.connections)
+                client_stats = server.client_stats().values()
+                step = LoadStep(
+                    connected, len(durations),
+                    percentile(durations, 0.5) * 1000, percentile(durations, 0.95) * 1000,
+                    percentile(durations, 0.99) * 1000, max(durations, default=0.0) * 1000,
+                    percentile(durations, 0.99) / budget,
+                    bytes_sent / elapsed, bytes_sent / elapsed / max(connected, 1),
+                    percentile(self.rtt_samples, 0.5), percentile(self.rtt_samples, 0.95),
+                    sum(stats["snapshots_dropped"] for stats in client_stats) - dropped_before,
+                    max((stats["queued_bytes"] for stats in client_stats), default=0),
+                )
+                results.append(step)
+                print(f"{step.players:>7} {step.ticks:>6} {step.tick_p50:>7.2f} {step.tick_p95:>7.2f} {step.tick_p99:>7.2f} "
+                      f"{step.tick_max:>7.2f} {step.budget_used:>6.0%} {step.bytes_per_second / 1000:>9.1f} "
+                      f"{step.bytes_per_client:>10.0f} {step.rtt_p50:>8.1f} {step.rtt_p95:>8.1f} "
+                      f"{step.snapshots_dropped:>8} {step.max_queued_bytes:>9}")
+        finally:
+            for worker_commands in commands:
+                worker_commands.put(("stop",))
+            for worker in workers:
+                worker.join(timeout=5)
+            server.running = False
+            await ticking
+            await server.stop()
+        return results
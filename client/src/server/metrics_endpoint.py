@@ -0,0 +1,64 @@
+# src/server/metrics_endpoint.py
+import asyncio
+from src.utils import metrics
+
+METRICS_PORT = 9100  # Default TCP port of the metrics endpoint
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+MAX_REQUEST_LINES = 100  # Header lines read from a request before it is refused
+
+class MetricsEndpoint:
+    """
+    Minimal HTTP server answering every GET with the metrics in the Prometheus text format.
+
+    Runs on the game server's event loop; the metrics are only formatted when
+    a scraper asks for them, so an idle endpoint costs nothing per tick.
+    """
+
+    def __init__(self, host="127.0.0.1", port=METRICS_PORT, registry=metrics):
+        """
+        Initialize the MetricsEndpoint.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The TCP port to listen on; 0 picks a free port.
+            registry (MetricsRegistry): The metrics to serve.
+        """
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.server = None
+
+    async def start(self):
+        """Start accepting scrapes. `port` is updated with the bound port."""
+        self.server = await asyncio.start_server(self.handle_request, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Close the listening socket."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_request(self, reader, writer):
+        """Answer one HTTP request and close the connection."""
+        try:
+            request_line = await reader.readline()
+            for _ in range(MAX_REQUEST_LINES):
+                if await reader.readline() in (b"\r\n", b"\n", b""):
+                    break
+            method = request_line.split(b" ", 1)[0]
+            if method in (b"GET", b"HEAD"):
+                body = self.registry.render().encode()
+                status = "200 OK"
+            else:
+                body = b"Only GET is supported.\n"
+                status = "405 Method Not Allowed"
+            head = (f"HTTP/1.1 {status}\r\nContent-Type: {CONTENT_TYPE}\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode()
+            writer.write(head if method == b"HEAD" else head + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
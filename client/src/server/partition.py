@@ -0,0 +1,273 @@
+# src/server/partition.py
+import math
+import multiprocessing
+from src.entities import default_skills
+from src.entities.player import INITIAL_PLAYER_POSITION
+from src.game_logic.player_manager import MAP_WIDTH, MAP_HEIGHT
+from src.server.interest import InterestArea, VIEW_RADIUS
+from src.server.regions import RegionLayout, empty_orders, run_region_worker
+from src.server.server import TICK_RATE
+from src.server.world import PLAYER_COMMANDS
+from src.systems import SELECT_SKILL
+from src.utils import SpatialGrid
+
+class RegionPlayer:
+    """The coordinator's view of a connected player simulated by one of the regions."""
+
+    def __init__(self, player_id, name, region, view_radius):
+        """
+        Initialize the RegionPlayer.
+
+        Args:
+            player_id (int): The id of the player, unique within the server.
+            name (str): The name the client logged in with.
+            region (int): The region simulating the player.
+            view_radius (int): The number of grid cells around the player that its client receives entities from.
+        """
+        self.id = player_id
+        self.name = name
+        self.region = region
+        self.interest = InterestArea(view_radius)
+        self.chunk = None
+        self.you = None     # The player's own record from the last tick
+        self.record = None  # The record other players see
+        self.notices = []
+        self.state = None   # The player's full state as last reported
+
+    def get_state(self):
+        """
+        Get the player's state for saving, as `WorldPlayer.get_state` does.
+
+        Returns:
+            dict: The state the region last reported, up to `STATE_INTERVAL` ticks old, or None before the first report.
+        """
+        return self.state
+
+class PartitionedWorld:
+    """
+    A zone split into regions simulated by separate processes, for maps too busy for one core.
+
+    Stands in for `ZoneWorld` in a `GameServer`. Every tick the regions step in
+    lockstep: the coordinator sends each region its orders (commands, arriving
+    entities and the ghosts and hits routed from its neighbours) and builds the
+    clients' snapshots from the regions' reports.
+    """
+
+    def __init__(self, zone, columns, rows, tick_rate=TICK_RATE, chunk_size=200, view_radius=VIEW_RADIUS):
+        """
+        Initialize the PartitionedWorld and start a process for every region.
+
+        Args:
+            zone (Zone): The zone to simulate.
+            columns (int): The number of regions across the map.
+            rows (int): The number of regions down the map.
+            tick_rate (int): Simulation ticks per second, as the server's.
+            chunk_size (int): The size of a map tile in map units.
+            view_radius (int): The number of grid cells around a player that its client receives entities from.
+        """
+        self.zone = zone
+        self.zone_name = zone.name
+        self.map_file = zone.map_file
+        self.CHUNK_SIZE = chunk_size
+        self.view_radius = view_radius
+        self.layout = RegionLayout(columns, rows, chunk_size=chunk_size)
+        self.skill_count = len(default_skills())
+        self.tick = 0
+        self.players = {}       # player id -> RegionPlayer
+        self.player_grid = SpatialGrid(chunk_size)
+        self.enemy_owners = {}  # enemy id -> region simulating it
+        self.enemy_records = {}
+        self.enemy_grid = SpatialGrid(chunk_size)  # Holds enemy ids
+        self.item_records = {}  # item id -> (record, owner id)
+        self.item_grid = SpatialGrid(chunk_size)   # Holds item ids
+        self.departures = []    # (RegionPlayer, Transition) as `ZoneWorld.departures`
+        self.departure_states = {}  # player id -> state as it arrives at the destination
+        self.orders = [empty_orders() for _ in range(len(self.layout))]
+
+        context = multiprocessing.get_context("spawn")
+        self.connections = []
+        self.processes = []
+        for index in range(len(self.layout)):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(
+                target=run_region_worker, args=(zone.name, columns, rows, index, tick_rate, worker_connection),
+                name=f"region-{index}", daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+    def close(self):
+        """Stop the region processes."""
+        for connection in self.connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+
+    def add_player(self, player_id, name, state=None):
+        """
+        Place a new player in the region under their position.
+
+        Args:
+            player_id (int): The id of the player.
+            name (str): The name the client logged in with.
+            state (dict): State from `WorldPlayer.get_state` when the player arrives from another zone.
+
+        Returns:
+            RegionPlayer: The player's coordinator state.
+        """
+        x, y = state["player"]["position"] if state else INITIAL_PLAYER_POSITION
+        region = self.layout.region_at(x, y)
+        region_player = RegionPlayer(player_id, name, region, self.view_radius)
+        self.players[player_id] = region_player
+        self.player_grid.insert(region_player, x, y)
+        self.orders[region]["players"].append((player_id, name, state, None))
+        return region_player
+
+    def remove_player(self, player_id):
+        """
+        Take a player out of the zone.
+
+        Returns:
+            RegionPlayer: The removed player, or None if the id is unknown.
+        """
+        region_player = self.players.pop(player_id, None)
+        if region_player is not None:
+            self.departure_states.pop(player_id, None)
+            self.player_grid.remove(region_player)
+            self.orders[region_player.region]["remove"].append(player_id)
+        return region_player
+
+    def depart(self, region_player, transition):
+        """
+        Take a player out of the zone through a transition.
+
+        Returns:
+            dict: The player's state, placed at the destination, as reported by their region.
+        """
+        state = self.departure_states.pop(region_player.id)
+        self.remove_player(region_player.id)
+        return state
+
+    def entity_counts(self):
+        """Count the zone's entities as of the last tick, as `ZoneWorld.entity_counts` does."""
+        return {
+            "players": len(self.players),
+            "enemies": sum(1 for record in self.enemy_records.values() if record[-1]),
+            "items": len(self.item_records),
+        }
+
+    def is_valid_command(self, region_player, command):
+        """Check a client command as `ZoneWorld.is_valid_command` does."""
+        if command.kind not in PLAYER_COMMANDS:
+            return False
+        if command.kind == SELECT_SKILL:
+            return 0 <= command.index < self.skill_count
+        return (math.isfinite(command.x) and math.isfinite(command.y)
+                and 0 <= command.x <= MAP_WIDTH and 0 <= command.y <= MAP_HEIGHT)
+
+    def apply_command(self, region_player, command):
+        """Queue a validated command for the region simulating the player."""
+        self.orders[region_player.region]["commands"].append((region_player.id, command))
+
+    def step(self):
+        """Advance every region by one tick and collect their reports."""
+        for connection, orders in zip(self.connections, self.orders):
+            connection.send(orders)
+        reports = [connection.recv() for connection in self.connections]
+        self.orders = [empty_orders() for _ in self.connections]
+        self.tick += 1
+
+        # Ownership first, so that hits and damage below are routed to where the target is now
+        self.enemy_records.clear()
+        self.enemy_grid.clear()
+        self.item_records.clear()
+        self.item_grid.clear()
+        for index, report in enumerate(reports):
+            self.read_entities(index, report)
+        for report in reports:
+            self.route(report)
+
+    def read_entities(self, index, report):
+        """Update the players, enemies and items from one region's report and forward its emigrants."""
+        for player_id, (x, y, you, record, notices) in report["players"].items():
+            region_player = self.players.get(player_id)
+            if region_player is None:
+                continue  # Disconnected during the tick
+            region_player.you, region_player.record = you, record
+            region_player.notices.extend(notices)
+            self.player_grid.move(region_player, x, y)
+            chunk = (int(x) // self.CHUNK_SIZE, int(y) // self.CHUNK_SIZE)
+            if chunk != region_player.chunk:
+                region_player.chunk = chunk
+                region_player.interest.update(chunk)
+        for player_id, state in report["states"].items():
+            if player_id in self.players:
+                self.players[player_id].state = state
+        for player_id, name, state, target_pos, destination in report["emigrants"]:
+            if player_id in self.players:
+                self.players[player_id].region = destination
+                self.players[player_id].state = state
+                self.orders[destination]["players"].append((player_id, name, state, target_pos))
+
+        for enemy_id, (x, y, record) in report["enemies"].items():
+            self.enemy_owners[enemy_id] = index
+            self.enemy_records[enemy_id] = record
+            self.enemy_grid.insert(enemy_id, x, y)
+        for enemy_id, level, state, destination in report["enemy_emigrants"]:
+            self.enemy_owners[enemy_id] = destination
+            self.orders[destination]["enemies"].append((enemy_id, level, state))
+
+        # Item ids are per region; interleave them into one id space
+        regions = len(self.layout)
+        for item_id, (x, y, record, owner) in report["items"].items():
+            item_id = item_id * regions + index
+            self.item_records[item_id] = (record, owner)
+            self.item_grid.insert(item_id, x, y)
+
+    def route(self, report):
+        """Forward one region's ghosts, hits, damage, rewards and departures."""
+        for neighbour, (players, enemies) in report["ghosts"].items():
+            self.orders[neighbour]["ghost_players"].extend(players)
+            self.orders[neighbour]["ghost_enemies"].extend(enemies)
+        for enemy_id, damage, attacker in report["hits"]:
+            self.orders[self.enemy_owners[enemy_id]]["hits"].append((enemy_id, damage, attacker))
+        for player_id, damage in report["damage"]:
+            if player_id in self.players:
+                self.orders[self.players[player_id].region]["damage"].append((player_id, damage))
+        for player_id, experience in report["rewards"]:
+            if player_id in self.players:
+                self.orders[self.players[player_id].region]["rewards"].append((player_id, experience))
+        for player_id, transition, state in report["departures"]:
+            if player_id in self.players:
+                self.departure_states[player_id] = state
+                self.departures.append((self.players[player_id], transition))
+
+    def snapshot(self, region_player):
+        """
+        Describe the part of the zone a player is subscribed to, as `ZoneWorld.snapshot` does.
+
+        Args:
+            region_player (RegionPlayer): The player the snapshot is for.
+
+        Returns:
+            dict: The player's own record and the other players, enemies and items in its interest area, by id.
+        """
+        interest = region_player.interest
+        items = self.item_records
+        return {
+            "you": region_player.you,
+            "players": {
+                other.id: other.record for other in interest.query(self.player_grid)
+                if other is not region_player and other.record is not None
+            },
+            "enemies": {enemy_id: self.enemy_records[enemy_id] for enemy_id in interest.query(self.enemy_grid)},
+            "items": {
+                item_id: items[item_id][0] for item_id in interest.query(self.item_grid)
+                if items[item_id][1] is None or items[item_id][1] == region_player.id
+            },
+        }
@@ -0,0 +1,156 @@
+# src/server/persistence.py
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DB_FILE = "saves/players.db"
+FLUSH_INTERVAL = 5.0  # Seconds between background writes of changed players
+LOAD_TIMEOUT = 2.0    # Seconds a login waits for the player's saved state
+
+class PlayerStore:
+    """
+    Write-behind store of player state in a SQLite file.
+
+    `save` only records the newest state of a player in memory; a background
+    thread writes every changed player in one transaction at a fixed interval,
+    or at once after `flush`. The tick loop never waits for the disk. Loads check
+    the states not written yet before reading the file, so a player who logs
+    out and straight back in gets their latest state.
+    """
+
+    def __init__(self, path=DB_FILE, flush_interval=FLUSH_INTERVAL):
+        """
+        Initialize the PlayerStore, creating the file and its table if needed.
+
+        Args:
+            path (str): The SQLite file.
+            flush_interval (float): Seconds between background writes.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.dirty = {}    # name -> state waiting to be written
+        self.writing = {}  # name -> state in the transaction being written
+        self.saved = {}    # name -> state last handed to the writer, to skip unchanged saves
+        self.wake = threading.Event()
+        self.running = False
+        self.thread = None
+        self.writes = 0    # Players written, for statistics
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self.connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS players (name TEXT PRIMARY KEY, state TEXT NOT NULL, updated REAL NOT NULL)"
+                )
+        finally:
+            connection.close()
+
+    def connect(self):
+        # Every thread opens its own connection; zone processes sharing the file wait for each other's writes
+        connection = sqlite3.connect(self.path, timeout=LOAD_TIMEOUT)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def start(self):
+        """Start the background writer."""
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name="player-store", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """Write everything still pending and stop the background writer."""
+        self.running = False
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def save(self, name, state):
+        """
+        Record a player's newest state, to be written by the background thread.
+
+        Args:
+            name (str): The player's login name.
+            state (dict): The state from `WorldPlayer.get_state`; None is ignored.
+        """
+        if state is None:
+            return
+        with self.lock:
+            if self.saved.get(name) == state:
+                return
+            self.saved[name] = state
+            self.dirty[name] = state
+
+    def flush(self):
+        """Have the background thread write the pending states now, as on logout or a zone handoff."""
+        self.wake.set()
+
+    def load(self, name):
+        """
+        Get a player's saved state. Reads the file, so call it off the tick loop.
+
+        Args:
+            name (str): The player's login name.
+
+        Returns:
+            dict: The state, or None for a new player.
+        """
+        with self.lock:
+            state = self.dirty.get(name) or self.writing.get(name)
+        if state is not None:
+            return state
+        connection = self.connect()
+        try:
+            row = connection.execute("SELECT state FROM players WHERE name = ?", (name,)).fetchone()
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        state = json.loads(row[0])
+        with self.lock:
+            self.saved.setdefault(name, state)
+        return state
+
+    def run(self):
+        """Background thread writing the pending states at every interval or flush."""
+        connection = self.connect()
+        try:
+            while self.running:
+                self.wake.wait(self.flush_interval)
+                self.wake.clear()
+                self.write(connection)
+            self.write(connection)
+        finally:
+            connection.close()
+
+    def write(self, connection):
+        """Write the pending states in one transaction."""
+        with self.lock:
+            self.writing, self.dirty = self.dirty, {}
+        if not self.writing:
+            return
+        now = time.time()
+        rows = [(name, json.dumps(state, separators=(",", ":")), now) for name, state in self.writing.items()]
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO players (name, state, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET state = excluded.state, updated = excluded.updated",
+                    rows,
+                )
+            self.writes += len(rows)
+        except sqlite3.Error as e:
+            print(f"Error: Could not save {len(rows)} players: {e}")
+            with self.lock:
+                # Keep the failed states for the next attempt unless newer ones arrived meanwhile
+                for name, state in self.writing.items():
+                    self.dirty.setdefault(name, state)
+        with self.lock:
+            self.writing = {}
@@ -0,0 +1,320 @@
+# src/server/regions.py
+from bisect import bisect_right
+from src.entities import Enemy
+from src.game_logic import ZONES
+from src.game_logic.player_manager import MAP_WIDTH, MAP_HEIGHT
+from src.network import you_record, player_record, enemy_record, item_record
+from src.server.world import ZoneWorld
+from src.utils import sim_clock
+
+# Map units mirrored on each side of a region border. Covers the enemy chase distance,
+# the reach of the widest skill and a tick of movement, so nothing near a border
+# interacts with an entity its region cannot see.
+GHOST_MARGIN = 300
+STATE_INTERVAL = 60  # Ticks between reports of every player's full state, for saving
+
+class RegionLayout:
+    """
+    Division of a map into a grid of rectangular regions, each simulated by its own process.
+
+    Region borders fall on tile edges. Region `row * columns + column` covers the
+    column-th strip of tiles from the left and the row-th strip from the top.
+    """
+
+    def __init__(self, columns, rows, width=MAP_WIDTH, height=MAP_HEIGHT, chunk_size=200, margin=GHOST_MARGIN):
+        """
+        Initialize the RegionLayout.
+
+        Args:
+            columns (int): The number of regions across the map.
+            rows (int): The number of regions down the map.
+            width (int): The width of the map in map units.
+            height (int): The height of the map in map units.
+            chunk_size (int): The size of a map tile in map units.
+            margin (float): How far from its border a region's entities are mirrored to its neighbours.
+        """
+        self.columns = columns
+        self.rows = rows
+        self.margin = margin
+        tiles_x, tiles_y = width // chunk_size, height // chunk_size
+        self.x_edges = [tiles_x * column // columns * chunk_size for column in range(1, columns)]
+        self.y_edges = [tiles_y * row // rows * chunk_size for row in range(1, rows)]
+        lefts, rights = [0] + self.x_edges, self.x_edges + [width]
+        tops, bottoms = [0] + self.y_edges, self.y_edges + [height]
+        self.bounds = [(lefts[column], tops[row], rights[column], bottoms[row]) for row in range(rows) for column in range(columns)]
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def region_at(self, x, y):
+        """
+        Get the region owning a map position. Positions off the map belong to the nearest edge region.
+
+        Returns:
+            int: The index of the region.
+        """
+        return bisect_right(self.y_edges, y) * self.columns + bisect_right(self.x_edges, x)
+
+    def neighbours_near(self, index, x, y):
+        """
+        Get the regions other than `index` that mirror an entity at a position.
+
+        Returns:
+            list: The indices of the regions within `margin` of the position.
+        """
+        margin = self.margin
+        return [
+            other for other, (left, top, right, bottom) in enumerate(self.bounds)
+            if other != index and left - margin <= x < right + margin and top - margin <= y < bottom + margin
+        ]
+
+class PlayerGhost:
+    """
+    Copy of a player owned by a neighbouring region.
+
+    Sits in the region's player grid so that enemies near the border chase and
+    attack the player. The damage they deal is collected for the owner to apply.
+    """
+
+    def __init__(self, player_id, x, y, is_dead):
+        self.id = player_id
+        self._x = x
+        self._y = y
+        self.is_dead = is_dead
+        self.damage = 0
+        self.player = self  # Grid entries are read through `.player`, like a WorldPlayer
+
+    def take_damage(self, damage):
+        self.damage += damage
+
+class EnemyGhost:
+    """
+    Copy of an enemy owned by a neighbouring region.
+
+    Sits in the region's enemy grid so that skills used near the border hit the
+    enemy. Hits are recorded for the owner, which decides whether they kill.
+    """
+
+    def __init__(self, enemy_id, x, y, alive, world):
+        self.id = enemy_id
+        self.x = x
+        self.y = y
+        self.alive = alive
+        self.world = world
+
+    def take_damage(self, damage):
+        """
+        Record a hit by the player whose command is being applied.
+
+        Returns:
+            bool: Always False; the owner credits kills once it has applied the hit.
+        """
+        if self.alive:
+            self.world.hits.append((self.id, damage, self.world.attacker))
+        return False
+
+def empty_orders():
+    """
+    Get the orders for a region tick with nothing in them.
+
+    Returns:
+        dict: Players and enemies arriving, players leaving, commands, ghosts,
+        and damage, hits and kill rewards forwarded from other regions.
+    """
+    return {
+        "players": [], "enemies": [], "remove": [], "commands": [],
+        "ghost_players": [], "ghost_enemies": [], "damage": [], "hits": [], "rewards": [],
+    }
+
+class RegionWorld(ZoneWorld):
+    """
+    The part of a zone inside one region of a `RegionLayout`.
+
+    Runs the ZoneWorld simulation, and so the unchanged enemy, combat and collision
+    code, on the players and enemies standing in the region. Entities near the
+    border are mirrored to the neighbours as ghosts each tick, and entities that
+    walk out of the region are handed to the region they walked into.
+    """
+
+    def __init__(self, zone, layout, index, chunk_size=200):
+        """
+        Initialize the RegionWorld with the zone's enemies that spawn inside the region.
+
+        Args:
+            zone (Zone): The zone the region is part of.
+            layout (RegionLayout): The division of the zone's map.
+            index (int): The region of the layout to simulate.
+            chunk_size (int): The size of a map tile in map units.
+        """
+        self.layout = layout
+        self.index = index
+        self.attacker = None  # The id of the player whose command is being applied
+        self.hits = []        # (enemy id, damage, attacker id) dealt to ghosts this tick
+        self.ghost_players = []
+        self.ghost_enemies = []
+        super().__init__(chunk_size=chunk_size, zone=zone)
+        # Every region spawns the whole zone, so enemy ids agree across regions
+        owned = [enemy for enemy in self.enemies if layout.region_at(enemy.x, enemy.y) == index]
+        self.enemy_ids = {enemy: self.enemy_ids[enemy] for enemy in owned}
+        self.enemies = owned
+        self.enemy_grid.rebuild(owned)
+        self.enemies_by_id = {enemy_id: enemy for enemy, enemy_id in self.enemy_ids.items()}
+
+    def add_enemy(self, enemy_id, level, state):
+        """Take over an enemy that walked in from another region."""
+        x, y = state["position"]
+        enemy = Enemy(x, y, self, level)
+        enemy.set_state(state)
+        self.enemies.append(enemy)
+        self.enemy_ids[enemy] = enemy_id
+        self.enemies_by_id[enemy_id] = enemy
+        self.enemy_grid.insert(enemy, x, y)
+
+    def remove_enemy(self, enemy):
+        self.enemies.remove(enemy)
+        del self.enemies_by_id[self.enemy_ids.pop(enemy)]
+        self.enemy_grid.remove(enemy)
+
+    def apply_command(self, world_player, command):
+        self.attacker = world_player.id
+        super().apply_command(world_player, command)
+        self.attacker = None
+
+    def set_ghosts(self, players, enemies):
+        """Replace the ghosts with the neighbours' latest border entities."""
+        for ghost in self.ghost_players:
+            self.player_grid.remove(ghost)
+        for ghost in self.ghost_enemies:
+            self.enemy_grid.remove(ghost)
+        self.ghost_players = [PlayerGhost(*fields) for fields in players]
+        self.ghost_enemies = [EnemyGhost(*fields, self) for fields in enemies]
+        for ghost in self.ghost_players:
+            self.player_grid.insert(ghost, ghost._x, ghost._y)
+        for ghost in self.ghost_enemies:
+            self.enemy_grid.insert(ghost, ghost.x, ghost.y)
+
+    def run_tick(self, orders):
+        """
+        Apply the orders from the coordinator, advance one tick and report the result.
+
+        Args:
+            orders (dict): See `empty_orders`.
+
+        Returns:
+            dict: See `report`.
+        """
+        for player_id, name, state, target_pos in orders["players"]:
+            self.add_player(player_id, name, state).target_pos = target_pos
+        for player_id in orders["remove"]:
+            self.remove_player(player_id)
+        for enemy_id, level, state in orders["enemies"]:
+            self.add_enemy(enemy_id, level, state)
+        self.set_ghosts(orders["ghost_players"], orders["ghost_enemies"])
+
+        for player_id, damage in orders["damage"]:
+            if player_id in self.players:
+                self.players[player_id].player.take_damage(damage)
+        rewards = []
+        for enemy_id, damage, attacker in orders["hits"]:
+            enemy = self.enemies_by_id.get(enemy_id)
+            if enemy is not None and enemy.take_damage(damage):
+                rewards.append((attacker, enemy.get_experience_reward()))
+        for player_id, experience in orders["rewards"]:
+            if player_id in self.players:
+                self.players[player_id].player.increase_kill_count(experience)
+        for player_id, command in orders["commands"]:
+            if player_id in self.players:
+                self.apply_command(self.players[player_id], command)
+
+        self.step()
+        return self.report(rewards)
+
+    def report(self, rewards):
+        """
+        Describe the region after a tick and hand over the entities that left it.
+
+        Args:
+            rewards (list): (attacker id, experience) for enemies killed by hits from other regions.
+
+        Returns:
+            dict: The region's players, enemies and items with their positions; the players
+            and enemies migrating to other regions; the ghosts for each neighbour; hits and
+            damage dealt to ghosts; kill rewards; departures through zone transitions; and
+            every `STATE_INTERVAL` ticks the full state of each player.
+        """
+        layout, index = self.layout, self.index
+        players, enemies, ghosts = {}, {}, {}
+        states = {world_player.id: world_player.get_state() for world_player in self.players.values()} if self.tick % STATE_INTERVAL == 0 else {}
+        emigrants, enemy_emigrants = [], []
+
+        for world_player in list(self.players.values()):
+            player = world_player.player
+            x, y = player._x, player._y
+            players[world_player.id] = (
+                x, y, you_record(player, player.selected_skill_index), player_record(player), world_player.notices,
+            )
+            world_player.notices = []
+            destination = layout.region_at(x, y)
+            if destination != index and world_player.departure is None:
+                emigrants.append((world_player.id, world_player.name, world_player.get_state(), world_player.target_pos, destination))
+                self.remove_player(world_player.id)
+                continue
+            for neighbour in layout.neighbours_near(index, x, y):
+                ghosts.setdefault(neighbour, ([], []))[0].append((world_player.id, x, y, player.is_dead))
+
+        for enemy in list(self.enemies):
+            enemy_id = self.enemy_ids[enemy]
+            enemies[enemy_id] = (enemy.x, enemy.y, enemy_record(enemy))
+            destination = layout.region_at(enemy.x, enemy.y)
+            if destination != index:
+                enemy_emigrants.append((enemy_id, enemy.level, enemy.get_state(), destination))
+                self.remove_enemy(enemy)
+                continue
+            for neighbour in layout.neighbours_near(index, enemy.x, enemy.y):
+                ghosts.setdefault(neighbour, ([], []))[1].append((enemy_id, enemy.x, enemy.y, enemy.alive))
+
+        departures = [
+            (world_player.id, transition, self.departure_state(world_player, transition))
+            for world_player, transition in self.departures
+        ]
+        self.departures.clear()
+        hits, self.hits = self.hits, []
+        return {
+            "players": players,
+            "enemies": enemies,
+            "items": {
+                world_item.id: (world_item.x, world_item.y, item_record(world_item), world_item.owner.id if world_item.owner else None)
+                for world_item in self.world_items
+            },
+            "emigrants": emigrants,
+            "enemy_emigrants": enemy_emigrants,
+            "ghosts": ghosts,
+            "hits": hits,
+            "damage": [(ghost.id, ghost.damage) for ghost in self.ghost_players if ghost.damage],
+            "rewards": rewards,
+            "departures": departures,
+            "states": states,
+        }
+
+def run_region_worker(zone_name, columns, rows, index, tick_rate, connection):
+    """
+    Process entry point simulating one region, a tick per message from the coordinator.
+
+    Args:
+        zone_name (str): The entry of `ZONES` the region is part of.
+        columns (int): The number of regions across the map.
+        rows (int): The number of regions down the map.
+        index (int): The region to simulate.
+        tick_rate (int): Simulation ticks per second.
+        connection (multiprocessing.connection.Connection): Receives orders, None to stop, and sends reports.
+    """
+    sim_clock.use_fixed_step(1000 / tick_rate)
+    world = RegionWorld(ZONES[zone_name], RegionLayout(columns, rows), index)
+    while True:
+        try:
+            orders = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if orders is None:
+            break
+        connection.send(world.run_tick(orders))
@@ -0,0 +1,480 @@
+# src/server/server.py
+import asyncio
+import itertools
+import secrets
+import sqlite3
+import time
+from collections import deque
+from src.network import (
+    HELLO, WELCOME, COMMAND, SNAPSHOT, NOTICE, ACK, HANDOFF, ProtocolError, SnapshotEncoder,
+    encode_frame, encode_json, decode_json, read_frame, decode_ack, decode_command,
+)
+from src.entities.player import INITIAL_PLAYER_POSITION
+from src.network.protocol import FRAME
+from src.server.metrics_endpoint import MetricsEndpoint
+from src.server.persistence import LOAD_TIMEOUT
+from src.utils import sim_clock, metrics
+
+TICK_RATE = 60             # Simulation ticks per second; movement and cooldowns are tuned for 60
+SNAPSHOT_INTERVAL = 3      # Ticks between snapshots sent to clients
+MAX_COMMANDS_PER_TICK = 4  # Commands applied per client per tick; the rest wait for later ticks
+MAX_PENDING_COMMANDS = 64  # Commands buffered per client before the oldest are dropped
+MAX_CATCH_UP_TICKS = 5     # Ticks run back to back after a stall before the schedule is reset
+TICK_HISTORY = 3600        # Tick durations kept for statistics, one minute at 60 ticks per second
+HANDOFF_TIMEOUT = 5.0      # Seconds a client arriving from another zone waits for its state
+SAVE_INTERVAL = 300        # Ticks between handing every connected player's state to the store
+SEND_BUFFER_LIMIT = 64 * 1024     # Unsent bytes above which a client is behind and gets no new snapshots
+MAX_SEND_BUFFER = 1024 * 1024     # Unsent bytes at which a client is disconnected at once
+SLOW_CLIENT_TIMEOUT = 5.0         # Seconds a client may stay behind before it is disconnected
+
+TICK_SECONDS = metrics.histogram("server_tick_seconds", "Time spent in one server tick")
+BYTES_SENT = metrics.counter("network_sent_bytes_total", "Bytes written to the network")
+BYTES_RECEIVED = metrics.counter("network_received_bytes_total", "Bytes read from the network")
+MESSAGES_RECEIVED = metrics.counter("network_received_messages_total", "Messages read from clients")
+COMMANDS_REJECTED = metrics.counter("server_commands_rejected_total", "Client commands that failed validation")
+SNAPSHOTS_DROPPED = metrics.counter("server_snapshots_dropped_total", "Snapshots skipped for clients that were behind")
+CLIENTS_DROPPED = metrics.counter("server_clients_dropped_total", "Clients disconnected for not keeping up")
+CONNECTED_CLIENTS = metrics.gauge("server_clients", "Clients logged in")
+WORLD_TICK = metrics.gauge("server_world_tick", "Ticks simulated by the zone")
+WORLD_ENTITIES = metrics.gauge("server_world_entities", "Entities in the zone", labels=("kind",))
+CLIENT_QUEUED_BYTES = metrics.gauge("server_client_queued_bytes", "Bytes waiting in a client's socket write buffer", labels=("client",))
+CLIENT_SNAPSHOTS_DROPPED = metrics.counter("server_client_snapshots_dropped_total", "Snapshots skipped for a client while it was behind",
+                                           labels=("client",))
+
+class ClientConnection:
+    """
+    A client connected to the server, the commands it has sent but not yet had
+    applied and the messages queued for it this tick.
+
+    Messages are queued with `send` and written together by `flush` once per tick.
+    Whether the client keeps up is judged by the bytes its socket has not sent yet.
+    """
+
+    def __init__(self, world_player, reader, writer):
+        """
+        Initialize the ClientConnection.
+
+        Args:
+            world_player (WorldPlayer): The player controlled by the client.
+            reader (asyncio.StreamReader): The stream commands are read from.
+            writer (asyncio.StreamWriter): The stream messages are written to.
+        """
+        self.world_player = world_player
+        self.reader = reader
+        self.writer = writer
+        self.pending = deque(maxlen=MAX_PENDING_COMMANDS)
+        self.last_seq = -1      # Highest command sequence number applied
+        self.last_seq_tick = None  # World tick that command was applied on
+        self.invalid_commands = 0
+        self.snapshots = SnapshotEncoder()
+        self.outbox = []        # Framed messages queued this tick
+        self.bytes_sent = 0
+        self.writes = 0
+        self.snapshots_dropped = 0
+        self.behind_ticks = 0   # Consecutive ticks the client has been behind
+
+    def send(self, frame):
+        """
+        Queue a framed message, to be written with the rest of the tick's messages.
+
+        Args:
+            frame (bytes): The framed message.
+        """
+        self.outbox.append(frame)
+
+    def flush(self):
+        """Write the queued messages to the socket in one write."""
+        if self.outbox and not self.writer.is_closing():
+            data = b"".join(self.outbox)
+            self.writer.write(data)
+            BYTES_SENT.inc(len(data))
+            self.bytes_sent += len(data)
+            self.writes += 1
+        self.outbox.clear()
+
+    def buffered(self):
+        """
+        Get the bytes written to the socket that it has not sent yet.
+
+        Returns:
+            int: The size of the socket's write buffer.
+        """
+        return self.writer.transport.get_write_buffer_size()
+
+    def is_behind(self):
+        """
+        Check whether the client is not reading as fast as it is sent to.
+
+        Returns:
+            bool: True if the socket's write buffer is over SEND_BUFFER_LIMIT.
+        """
+        return self.buffered() > SEND_BUFFER_LIMIT
+
+    def stats(self):
+        """
+        Get the connection's send statistics.
+
+        Returns:
+            dict: Bytes waiting in the socket's write buffer, bytes sent, writes, snapshots dropped
+            because the client was behind, consecutive ticks behind and commands waiting.
+        """
+        return {
+            "queued_bytes": self.buffered(),
+            "bytes_sent": self.bytes_sent,
+            "writes": self.writes,
+            "snapshots_dropped": self.snapshots_dropped,
+            "behind_ticks": self.behind_ticks,
+            "pending_commands": len(self.pending),
+        }
+
+class GameServer:
+    """
+    Authoritative game server.
+
+    Clients connect over TCP and send input commands. The server validates them,
+    applies them at the start of the next tick, runs the zone simulation at a fixed
+    rate and sends every client a snapshot of the world.
+    """
+
+    def __init__(self, world, host="127.0.0.1", port=7777, tick_rate=TICK_RATE, snapshot_interval=SNAPSHOT_INTERVAL, zone_link=None, store=None,
+                 metrics_port=None):
+        """
+        Initialize the GameServer.
+
+        Args:
+            world (ZoneWorld): The zone to simulate.
+            host (str): The address to listen on.
+            port (int): The TCP port to listen on; 0 picks a free port.
+            tick_rate (int): Simulation ticks per second.
+            snapshot_interval (int): Ticks between snapshots.
+            zone_link (ZoneLink): Connection to the servers of the other zones. Without one,
+                players stay in this zone when they walk into a transition.
+            store (PlayerStore): Where players are loaded from on login and saved to. Without one,
+                every login starts a new character.
+            metrics_port (int): TCP port serving the metrics in the Prometheus text format on `host`;
+                None to not serve them.
+        """
+        self.world = world
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.connections = {}  # player id -> ClientConnection
+        self.handlers = {}     # connection handler task -> its reader, including clients not logged in yet
+        self.player_ids = itertools.count(1)
+        self.server = None
+        self.running = False
+        self.last_tick_duration = 0.0
+        self.tick_durations = deque(maxlen=TICK_HISTORY)  # Seconds spent in each recent tick
+        self.zone_link = zone_link
+        self.store = store
+        self.arrivals = {}     # handoff token -> state of a player on the way from another zone
+        self.metrics_endpoint = MetricsEndpoint(host, metrics_port) if metrics_port is not None else None
+
+        # Read when the metrics are scraped rather than updated every tick
+        CONNECTED_CLIENTS.set_function(lambda: len(self.connections))
+        WORLD_TICK.set_function(lambda: self.world.tick)
+        for kind in ("players", "enemies", "items"):
+            WORLD_ENTITIES.labels(kind).set_function(lambda kind=kind: self.world.entity_counts()[kind])
+
+    async def start(self):
+        """Start accepting connections. `port` is updated with the bound port."""
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        if self.metrics_endpoint is not None:
+            await self.metrics_endpoint.start()
+
+    async def stop(self):
+        """Stop the tick loop, disconnect every client and close the listening socket."""
+        self.running = False
+        # Ending the input streams lets every handler clean up and return normally
+        for reader in self.handlers.values():
+            reader.feed_eof()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.metrics_endpoint is not None:
+            await self.metrics_endpoint.stop()
+
+    async def serve_forever(self):
+        """
+        Start the server and run the tick loop until `stop` is called.
+
+        The process-wide simulation clock steps with the ticks while serving and
+        follows wall time again afterwards.
+        """
+        sim_clock.use_fixed_step(1000 / self.tick_rate)
+        try:
+            await self.start()
+            print(f"Serving {self.world.map_file} on {self.host}:{self.port} at {self.tick_rate} ticks/s")
+            if self.metrics_endpoint is not None:
+                print(f"Metrics on http://{self.host}:{self.metrics_endpoint.port}/metrics")
+            await self.run()
+        finally:
+            sim_clock.use_realtime()
+
+    async def run(self, ticks=None):
+        """
+        Run the tick loop at `tick_rate`, on an absolute schedule so that slow ticks
+        are caught up instead of slowing the game down.
+
+        Args:
+            ticks (int): Stop after this many ticks; run until stopped if None.
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        self.running = True
+        count = 0
+        while self.running and (ticks is None or count < ticks):
+            self.tick()
+            count += 1
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < -interval * MAX_CATCH_UP_TICKS:
+                next_tick = loop.time()  # Too far behind: drop the missed ticks rather than run a burst
+                delay = 0
+            # Yield even when behind so connections keep being served
+            await asyncio.sleep(max(0, delay))
+
+    def tick(self):
+        """Apply pending commands, advance the simulation and send snapshots."""
+        started = time.perf_counter()
+        world = self.world
+        if self.zone_link is not None:
+            self.arrivals.update(self.zone_link.receive())
+        for connection in self.connections.values():
+            for _ in range(min(MAX_COMMANDS_PER_TICK, len(connection.pending))):
+                seq, command = connection.pending.popleft()
+                world.apply_command(connection.world_player, command)
+                connection.last_seq = seq
+                connection.last_seq_tick = world.tick
+
+        world.step()
+        for world_player, transition in world.departures:
+            self.hand_off(self.connections[world_player.id], transition)
+        world.departures.clear()
+        if self.store is not None and world.tick % SAVE_INTERVAL == 0:
+            for connection in self.connections.values():
+                self.store.save(connection.world_player.name, connection.world_player.get_state())
+
+        send_snapshot = world.tick % self.snapshot_interval == 0
+        for connection in list(self.connections.values()):
+            if connection.writer.is_closing():
+                continue  # Dropped; its handler has not removed it yet
+            world_player = connection.world_player
+            for kind, text in world_player.notices:
+                connection.send(encode_json(NOTICE, {kind: text}))
+            world_player.notices.clear()
+            behind = connection.is_behind()
+            if send_snapshot:
+                if behind:
+                    # Snapshots are deltas from the last acknowledged one, so a skipped snapshot needs no resend
+                    connection.snapshots_dropped += 1
+                    SNAPSHOTS_DROPPED.inc()
+                    CLIENT_SNAPSHOTS_DROPPED.labels(str(world_player.id)).inc()
+                else:
+                    payload = connection.snapshots.encode(
+                        world.tick, connection.last_seq, connection.last_seq_tick, world.snapshot(world_player))
+                    connection.send(encode_frame(SNAPSHOT, payload))
+            connection.flush()
+            connection.behind_ticks = connection.behind_ticks + 1 if behind else 0
+            if connection.behind_ticks > SLOW_CLIENT_TIMEOUT * self.tick_rate or connection.buffered() >= MAX_SEND_BUFFER:
+                self.disconnect(connection, f"{connection.buffered()} bytes unsent for {connection.behind_ticks} ticks")
+        self.last_tick_duration = time.perf_counter() - started
+        self.tick_durations.append(self.last_tick_duration)
+        TICK_SECONDS.observe(self.last_tick_duration)
+
+    def disconnect(self, connection, reason):
+        """
+        Drop a client that cannot keep up, discarding what it has not received.
+        Its handler sees the connection close and removes the player.
+
+        Args:
+            connection (ClientConnection): The client.
+            reason (str): Why, for the log.
+        """
+        print(f"Dropping slow client {connection.world_player.id}: {reason}")
+        CLIENTS_DROPPED.inc()
+        connection.writer.transport.abort()
+
+    def client_stats(self):
+        """
+        Get the send statistics of every connected client.
+
+        Returns:
+            dict: Player id -> `ClientConnection.stats`.
+        """
+        return {player_id: connection.stats() for player_id, connection in self.connections.items()}
+
+    def hand_off(self, connection, transition):
+        """
+        Move a client's player to the server of another zone.
+
+        The player's state is sent ahead over the zone link under a one-time token, then
+        the client is told where to log in with it and disconnected.
+
+        Args:
+            connection (ClientConnection): The departing client.
+            transition (Transition): The transition the player walked into.
+        """
+        link = self.zone_link
+        if link is None or transition.destination not in link.addresses:
+            return
+        world_player = connection.world_player
+        self.connections.pop(world_player.id)
+        state = self.world.depart(world_player, transition)
+        if self.store is not None:
+            self.store.save(world_player.name, state)
+            self.store.flush()
+        connection.send(self.send_ahead(transition.destination, state))
+        connection.flush()
+        # Closing flushes the handoff; the handler then sees the end of the stream
+        connection.writer.close()
+
+    def send_ahead(self, zone_name, state):
+        """
+        Send a player's state to the server of another zone under a one-time token.
+
+        Args:
+            zone_name (str): The destination zone, one of the zone link's addresses.
+            state (dict): The player's state, as the destination should restore it.
+
+        Returns:
+            bytes: The framed HANDOFF message telling the client where to log in with the token.
+        """
+        token = secrets.token_hex(16)
+        self.zone_link.send(zone_name, token, state)
+        host, port = self.zone_link.addresses[zone_name]
+        return encode_json(HANDOFF, {"zone": zone_name, "host": host, "port": port, "token": token})
+
+    def place_saved_player(self, state):
+        """
+        Make a saved state fit this zone: a player saved in another zone without a server to
+        send them to starts again at the spawn position.
+
+        Args:
+            state (dict): The state loaded for a login; updated in place.
+
+        Returns:
+            str: The zone whose server the player must be sent to instead, or None to log in here.
+        """
+        zone_name = state.get("zone")
+        if zone_name is None or zone_name == self.world.zone_name:
+            return None  # Saved here, or before states recorded their zone
+        if self.zone_link is not None and zone_name in self.zone_link.addresses:
+            return zone_name
+        state["player"]["position"] = list(INITIAL_PLAYER_POSITION)
+        state["zone"] = self.world.zone_name
+        return None
+
+    async def take_arrival(self, token):
+        """
+        Wait for the state of a player handed off by another zone.
+
+        Args:
+            token (str): The token the client presented.
+
+        Returns:
+            dict: The player's state.
+
+        Raises:
+            ProtocolError: If no player arrives under the token in time.
+        """
+        deadline = time.perf_counter() + HANDOFF_TIMEOUT
+        while token not in self.arrivals:
+            if time.perf_counter() > deadline:
+                raise ProtocolError("Unknown handoff token.")
+            await asyncio.sleep(1 / self.tick_rate)
+        return self.arrivals.pop(token)
+
+    async def load_player(self, name):
+        """
+        Load a player's saved state in a worker thread.
+
+        Args:
+            name (str): The name the client logged in with.
+
+        Returns:
+            dict: The state, or None for a new player or without a store.
+
+        Raises:
+            ProtocolError: If the state cannot be read in time. The login is refused rather
+                than starting a new character that would overwrite the save.
+        """
+        if self.store is None:
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(self.store.load, name), LOAD_TIMEOUT)
+        except (asyncio.TimeoutError, sqlite3.Error, ValueError) as e:
+            raise ProtocolError(f"Could not load player {name!r}: {str(e) or 'timed out'}") from None
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve one client: log it in, then queue its commands until it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader): The client's input stream.
+            writer (asyncio.StreamWriter): The client's output stream.
+        """
+        connection = None
+        task = asyncio.current_task()
+        self.handlers[task] = reader
+        try:
+            message_type, payload = await read_frame(reader)
+            if message_type != HELLO:
+                raise ProtocolError(f"Expected HELLO, got message type {message_type}.")
+            hello = decode_json(payload)
+            name = str(hello.get("name", "player"))[:32]
+            state = await self.take_arrival(str(hello["token"])) if "token" in hello else await self.load_player(name)
+            zone_name = self.place_saved_player(state) if state is not None else None
+            if zone_name is not None:
+                # Logged in on the wrong zone's server: hand the player to their own before they enter this zone
+                writer.write(self.send_ahead(zone_name, state))
+                return
+            # Checked after the load, with no await before the player is added, so two logins cannot both pass
+            if any(other.world_player.name == name for other in self.connections.values()):
+                raise ProtocolError(f"Player {name!r} is already logged in.")
+
+            player_id = next(self.player_ids)
+            connection = ClientConnection(self.world.add_player(player_id, name, state), reader, writer)
+            self.connections[player_id] = connection
+            CLIENT_QUEUED_BYTES.labels(str(player_id)).set_function(connection.buffered)
+            CLIENT_SNAPSHOTS_DROPPED.labels(str(player_id))  # Exported from login on, at 0 until a snapshot is skipped
+            connection.send(encode_json(WELCOME, {
+                "player_id": player_id, "tick": self.world.tick, "tick_rate": self.tick_rate, "map": self.world.map_file,
+            }))
+            connection.flush()
+
+            while True:
+                message_type, payload = await read_frame(reader)
+                BYTES_RECEIVED.inc(FRAME.size + len(payload))
+                MESSAGES_RECEIVED.inc()
+                if message_type == ACK:
+                    connection.snapshots.acknowledge(decode_ack(payload))
+                    continue
+                if message_type != COMMAND:
+                    raise ProtocolError(f"Unexpected message type {message_type}.")
+                seq, command = decode_command(payload)
+                if self.world.is_valid_command(connection.world_player, command):
+                    connection.pending.append((seq, command))
+                else:
+                    connection.invalid_commands += 1
+                    COMMANDS_REJECTED.inc()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ProtocolError as e:
+            print(f"Dropping client: {e}")
+        finally:
+            self.handlers.pop(task, None)
+            if connection is not None:
+                world_player = connection.world_player
+                # Players handed off to another zone were saved with their destination state already
+                if self.connections.pop(world_player.id, None) is connection and self.store is not None:
+                    self.store.save(world_player.name, world_player.get_state())
+                    self.store.flush()
+                self.world.remove_player(world_player.id)
+                CLIENT_QUEUED_BYTES.remove(str(world_player.id))
+                CLIENT_SNAPSHOTS_DROPPED.remove(str(world_player.id))
+            writer.close()
@@ -0,0 +1,355 @@
+# src/server/world.py
+import math
+import pygame
+import time
+from src.entities import Player, Enemy, NPC, default_skills
+from src.game_logic import SpawnManager, TransitionManager, WorldItemStore, find_skill_targets
+from src.game_logic.player_manager import step_towards_target, MAP_WIDTH, MAP_HEIGHT
+from src.game_logic.zones import zone_for_map
+from src.game_logic.quest_engine import QuestEngine, compile_quests, load_quest_file, TRIGGER_TALK, TRIGGER_ITEM_GAINED, TRIGGER_REGION_ENTERED
+from src.network import you_record, player_record, enemy_record, item_record
+from src.server.interest import InterestArea, VIEW_RADIUS
+from src.server.lag_compensation import EnemyHistory
+from src.systems import MOVE_TARGET, SELECT_SKILL, USE_SKILL
+from src.utils import EventLog, ItemHandler, SpatialGrid, collides_with_barrier, sim_clock, metrics, ITEM_GAINED
+
+MAP_FILE = "maps/map.json"
+QUEST_FILE = "quests/quests.json"
+PLAYER_COMMANDS = (MOVE_TARGET, SELECT_SKILL, USE_SKILL)  # Debug commands such as SPAWN_ENEMY are not accepted from clients
+
+ENEMY_UPDATE_SECONDS = metrics.histogram("enemy_update_seconds", "Time spent running enemy AI per tick")
+
+class WorldPlayer:
+    """
+    A connected player inside a zone.
+
+    Wraps the same Player entity the client uses, together with the state the
+    client keeps on `Game`: the move target, the current chunk and the quest engine.
+    It is also the quest presenter, queuing dialogues and hints for the client.
+    """
+
+    def __init__(self, player_id, name, world):
+        """
+        Initialize the WorldPlayer.
+
+        Args:
+            player_id (int): The id of the player, unique within the server.
+            name (str): The name the client logged in with.
+            world (ZoneWorld): The zone the player is in.
+        """
+        self.id = player_id
+        self.name = name
+        self.world = world
+        self.player = Player(None, event_log=EventLog(capacity=64))
+        for skill in default_skills():
+            self.player.add_skill(skill)
+        self.item_handler = ItemHandler(self.player)
+        self.target_pos = None
+        self.chunk = None
+        self.interest = InterestArea(world.view_radius)
+        self.notices = []      # (kind, text) waiting to be sent to the client
+        self.quest_items = {}  # WorldItemSpawn -> WorldItem reserved for this player
+        self.engine = QuestEngine(world.quests, self.player, self)
+        self.player.event_log.subscribe(ITEM_GAINED, self.on_item_gained)
+        self.departure = None  # The Transition the player walked into, until the server hands them off
+
+    def get_state(self):
+        """
+        Get everything another zone needs to take the player over.
+
+        Returns:
+            dict: The player's state, quest progress and the zone they are in.
+        """
+        return {"player": self.player.get_state(), "quests": self.engine.get_state(), "zone": self.world.zone_name}
+
+    def set_state(self, state):
+        """
+        Restore state saved by `get_state`.
+
+        Args:
+            state (dict): The saved state.
+        """
+        self.player.set_state(state["player"])
+        self.engine.set_state(state["quests"])
+
+    def on_item_gained(self, event):
+        self.engine.notify(TRIGGER_ITEM_GAINED, event.data["item"])
+
+    def show_dialogue(self, key):
+        self.notices.append(("dialogue", key))
+
+    def show_hint(self, text):
+        self.notices.append(("hint", text))
+
+    def quests_changed(self):
+        spawns = [spawn for spawn in self.engine.active_world_items() if spawn.item not in self.player.inventory]
+        self.world.world_items.sync_spawns(self.quest_items, spawns, owner=self)
+
+class ZoneWorld:
+    """
+    Authoritative simulation of one map, without a display.
+
+    Provides the attributes `SpawnManager`, `Enemy` and `WorldItemStore` expect
+    from `Game`, so the enemy, loot and collision code runs unchanged on the server.
+    """
+
+    def __init__(self, map_file=MAP_FILE, chunk_size=200, quest_file=QUEST_FILE, spawn_enemies=True, view_radius=VIEW_RADIUS, zone=None):
+        """
+        Initialize the ZoneWorld and spawn its enemies.
+
+        Args:
+            map_file (str): The tile map of the zone, if no `zone` is given.
+            chunk_size (int): The size of a map tile in map units.
+            quest_file (str): The quest definitions offered in the zone.
+            spawn_enemies (bool): Whether to place the map's enemies.
+            view_radius (int): The number of grid cells around a player that its client receives entities from.
+            zone (Zone): The entry of `ZONES` to simulate. Its map and enemies are used and players
+                walking into its transitions are reported in `departures`.
+        """
+        self.CHUNK_SIZE = chunk_size
+        self.zone = zone
+        self.map_file = zone.map_file if zone else map_file
+        # Saved with every player, so a login on another zone's server can be sent back here
+        map_zone = zone or zone_for_map(map_file)
+        self.zone_name = map_zone.name if map_zone else None
+        self.view_radius = view_radius
+        self.tick = 0
+        self.event_log = EventLog()
+        self.players = {}  # player id -> WorldPlayer
+        self.player_grid = SpatialGrid(chunk_size)
+        self.enemies = []
+        self.enemy_grid = SpatialGrid(chunk_size)
+        self.enemy_ids = {}  # Enemy -> index in `enemies`, the id clients know it by
+        self.enemy = None
+        self.world_items = WorldItemStore(chunk_size)
+        self.quests = compile_quests(load_quest_file(quest_file)["quests"], chunk_size)
+        self.transition_areas = [(pygame.Rect(transition.area), transition) for transition in zone.transitions] if zone else []
+        self.departures = []  # (WorldPlayer, Transition) for players that walked into a transition this tick
+        self.enemy_history = EnemyHistory()  # Recent enemy positions, to check skills against what clients saw
+
+        TransitionManager(self).load_map(self.map_file)
+        self.spawn_manager = SpawnManager(self)
+        if spawn_enemies:
+            if zone:
+                zone.spawn(self.spawn_manager)
+            else:
+                self.spawn_manager.spawn_enemies()
+        self.index_enemies()
+
+    def index_enemies(self):
+        """Assign snapshot ids to enemies. `enemies` is only ever appended to, so ids stay stable."""
+        for index in range(len(self.enemy_ids), len(self.enemies)):
+            self.enemy_ids[self.enemies[index]] = index
+
+    def add_player(self, player_id, name, state=None):
+        """
+        Place a new player in the zone.
+
+        Args:
+            player_id (int): The id of the player.
+            name (str): The name the client logged in with.
+            state (dict): State from `WorldPlayer.get_state` when the player arrives from another zone.
+
+        Returns:
+            WorldPlayer: The player's zone state.
+        """
+        world_player = WorldPlayer(player_id, name, self)
+        if state is not None:
+            world_player.set_state(state)
+        self.players[player_id] = world_player
+        self.player_grid.insert(world_player, world_player.player._x, world_player.player._y)
+        world_player.interest.update(self.player_grid.cell_of(world_player.player._x, world_player.player._y))
+        world_player.quests_changed()
+        return world_player
+
+    def depart(self, world_player, transition):
+        """
+        Take a player out of the zone through a transition.
+
+        Args:
+            world_player (WorldPlayer): The departing player.
+            transition (Transition): The transition the player walked into.
+
+        Returns:
+            dict: The player's state, placed at the destination and holding the items granted on arrival.
+        """
+        self.remove_player(world_player.id)
+        return self.departure_state(world_player, transition)
+
+    def departure_state(self, world_player, transition):
+        """Get a player's state as it arrives at the destination of a transition, see `depart`."""
+        state = world_player.get_state()
+        state["zone"] = transition.destination
+        player_state = state["player"]
+        player_state["position"] = list(transition.position)
+        for item in transition.items:
+            player_state["inventory"][item] = player_state["inventory"].get(item, 0) + 1
+        return state
+
+    def remove_player(self, player_id):
+        """
+        Take a player out of the zone, along with the quest items reserved for them.
+
+        Args:
+            player_id (int): The id of the player.
+
+        Returns:
+            WorldPlayer: The removed player, or None if the id is unknown.
+        """
+        world_player = self.players.pop(player_id, None)
+        if world_player is not None:
+            self.player_grid.remove(world_player)
+            self.world_items.sync_spawns(world_player.quest_items, ())
+        return world_player
+
+    def collides_with_barrier(self, pos):
+        return collides_with_barrier(pos, self.map_tiles, self.CHUNK_SIZE)
+
+    def entity_counts(self):
+        """
+        Count the zone's entities, for metrics.
+
+        Returns:
+            dict: The number of players, living enemies and items on the ground.
+        """
+        return {
+            "players": len(self.players),
+            "enemies": sum(1 for enemy in self.enemies if enemy.alive),
+            "items": len(self.world_items),
+        }
+
+    def is_valid_command(self, world_player, command):
+        """
+        Check that a command from a client is one a player may send and is within the map.
+
+        Args:
+            world_player (WorldPlayer): The player that sent the command.
+            command (InputCommand): The decoded command.
+
+        Returns:
+            bool: True if the command can be applied.
+        """
+        if command.kind not in PLAYER_COMMANDS:
+            return False
+        if command.kind == SELECT_SKILL:
+            return 0 <= command.index < len(world_player.player.skills)
+        return (math.isfinite(command.x) and math.isfinite(command.y)
+                and 0 <= command.x <= MAP_WIDTH and 0 <= command.y <= MAP_HEIGHT)
+
+    def apply_command(self, world_player, command):
+        """
+        Apply a validated command, as `InputHandler.execute_command` does on the client.
+
+        Skills are checked against the enemies rewound to the tick the client drew
+        them at, so a hit the player saw on screen is a hit on the server.
+
+        Args:
+            world_player (WorldPlayer): The player that sent the command.
+            command (InputCommand): The command to apply.
+        """
+        player = world_player.player
+        if player.is_dead:
+            return
+        if command.kind == MOVE_TARGET:
+            world_player.target_pos = (command.x, command.y)
+        elif command.kind == SELECT_SKILL:
+            player.select_skill(command.index)
+        elif command.kind == USE_SKILL:
+            skill = player.selected_skill
+            reach = max(skill.reach, player.attack_range) if skill else 0
+            with self.enemy_history.rewind(self.enemy_grid, command.view_tick, player._x, player._y, reach):
+                targets = find_skill_targets(self.enemy_grid, player, skill, command.x, command.y)
+            if targets:
+                player.use_selected_skill(targets)
+
+    def nearest_player(self, x, y, radius):
+        """
+        Find the nearest living player within a distance of a point.
+
+        Returns:
+            Player: The nearest player, or None if nobody is in range.
+        """
+        nearest = None
+        nearest_distance = radius
+        for world_player in self.player_grid.query_radius(x, y, radius):
+            player = world_player.player
+            if not player.is_dead:
+                distance = math.hypot(player._x - x, player._y - y)
+                if distance < nearest_distance:
+                    nearest, nearest_distance = player, distance
+        return nearest
+
+    def step(self):
+        """Advance the zone by one tick."""
+        for world_player in self.players.values():
+            player = world_player.player
+            if world_player.target_pos and not player.is_dead:
+                world_player.target_pos = step_towards_target(player, world_player.target_pos, self.collides_with_barrier)
+            player.update()
+            self.player_grid.move(world_player, player._x, player._y)
+            self.check_player_chunk(world_player)
+            self.check_transitions(world_player)
+            self.world_items.pickup_near(player._x, player._y, world_player.item_handler, owner=world_player)
+
+        if len(self.enemy_ids) != len(self.enemies):
+            self.index_enemies()
+        enemies_started = time.perf_counter()
+        for enemy in self.enemies:
+            target = self.nearest_player(enemy.x, enemy.y, Enemy.CHASE_DISTANCE) if enemy.alive else None
+            enemy.update(target)
+            self.enemy_grid.move(enemy, enemy.x, enemy.y)
+        ENEMY_UPDATE_SECONDS.observe(time.perf_counter() - enemies_started)
+
+        self.world_items.remove_expired()
+        sim_clock.advance()
+        self.tick += 1
+        self.enemy_history.record(self.tick, self.enemies)
+
+    def check_player_chunk(self, world_player):
+        """Raise NPC and region quest events when a player walks into a different map chunk."""
+        player = world_player.player
+        chunk = (int(player._x) // self.CHUNK_SIZE, int(player._y) // self.CHUNK_SIZE)
+        if chunk == world_player.chunk:
+            return
+        world_player.chunk = chunk
+        world_player.interest.update(chunk)
+        chunk_x, chunk_y = chunk
+        if 0 <= chunk_y < len(self.map_tiles) and 0 <= chunk_x < len(self.map_tiles[0]):
+            tile_id = self.map_tiles[chunk_y][chunk_x]
+            if tile_id in NPC.POSITIONS:
+                world_player.engine.notify(TRIGGER_TALK, tile_id)
+        world_player.engine.notify(TRIGGER_REGION_ENTERED, chunk)
+
+    def check_transitions(self, world_player):
+        """Report a player walking into one of the zone's transitions, once."""
+        if world_player.departure is not None:
+            return
+        for area, transition in self.transition_areas:
+            if world_player.player.rect.colliderect(area):
+                world_player.departure = transition
+                self.departures.append((world_player, transition))
+                return
+
+    def snapshot(self, world_player):
+        """
+        Describe the part of the zone a player is subscribed to, quantized for `encode_snapshot`.
+
+        Args:
+            world_player (WorldPlayer): The player the snapshot is for.
+
+        Returns:
+            dict: The player's own record and the other players, enemies and items in its interest area, by id.
+        """
+        interest = world_player.interest
+        enemy_ids = self.enemy_ids
+        return {
+            "you": you_record(world_player.player, world_player.player.selected_skill_index),
+            "players": {
+                other.id: player_record(other.player) for other in interest.query(self.player_grid) if other is not world_player
+            },
+            "enemies": {enemy_ids[enemy]: enemy_record(enemy) for enemy in interest.query(self.enemy_grid)},
+            "items": {
+                world_item.id: item_record(world_item) for world_item in interest.query(self.world_items.grid)
+                if world_item.owner is None or world_item.owner is world_player
+            },
+        }
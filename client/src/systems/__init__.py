@@ -1,2 +1,4 @@
 # src/systems/__init__.py
-from .input_handler import InputHandler
\ No newline at end of file
+from .commands import InputCommand, MOVE_TARGET, SELECT_SKILL, USE_SKILL, SPAWN_ENEMY
+from .input_handler import InputHandler
+from .input_recorder import InputRecorder, InputReplayer, compute_state_hash
\ No newline at end of file
@@ -0,0 +1,19 @@
+# src/systems/commands.py
+from collections import namedtuple
+
+# Input command kinds
+MOVE_TARGET = 1   # Walk towards the map position (x, y)
+SELECT_SKILL = 2  # Select the skill at `index`
+USE_SKILL = 3     # Use the selected skill, aiming at the map position (x, y)
+SPAWN_ENEMY = 4   # Spawn an enemy at the map position (x, y)
+
+COMMAND_NAMES = {
+    MOVE_TARGET: "move_target",
+    SELECT_SKILL: "select_skill",
+    USE_SKILL: "use_skill",
+    SPAWN_ENEMY: "spawn_enemy",
+}
+
+# A single player input, already translated from screen space into map space. `view_tick` is the
+# server tick an online client drew the enemies at when it used a skill, for lag compensation.
+InputCommand = namedtuple("InputCommand", ["kind", "x", "y", "index", "view_tick"], defaults=(0.0, 0.0, 0, None))
@@ -1,6 +1,7 @@
 # src/systems/input_handler.py
 import pygame
 from ui import is_exit_button_clicked
+from src.systems.commands import InputCommand, MOVE_TARGET, SELECT_SKILL, USE_SKILL, SPAWN_ENEMY
 
 class InputHandler:
     def __init__(self, game):
@@ -43,9 +44,8 @@ class InputHandler:
         elif button == 1:
             self.game.handle_mouse_click(mouse_pos)
         elif button == 3:
-            enemy = self.game.enemy_within_range(self.game.player._x, self.game.player._y, self.game.player.attack_range)
-            if enemy:
-                self.game.player.use_selected_skill(enemy)
+            aim_x, aim_y = self.game.screen_to_map(mouse_pos)
+            self.dispatch(InputCommand(USE_SKILL, aim_x, aim_y))
 
     def handle_keydown_event(self, event):
         """
@@ -57,12 +57,46 @@ class InputHandler:
         if event.key == pygame.K_e:
             self.handle_e_key_press()
         elif event.key == pygame.K_1:
-            self.game.player.select_skill(0)
+            self.dispatch(InputCommand(SELECT_SKILL, index=0))
         elif event.key == pygame.K_2:
-            self.game.player.select_skill(1)
+            self.dispatch(InputCommand(SELECT_SKILL, index=1))
 
     def handle_e_key_press(self):
         """
         Handle the 'e' key press event to spawn an enemy at the player's location.
         """
-        self.game.spawn_enemy(self.game.player._x, self.game.player._y)
+        self.dispatch(InputCommand(SPAWN_ENEMY, self.game.player._x, self.game.player._y))
+
+    def dispatch(self, command):
+        """
+        Record an input command if a recording is active, then apply it, or send it
+        to the server when playing online.
+
+        Args:
+            command (InputCommand): The command to dispatch.
+        """
+        if self.game.recorder:
+            self.game.recorder.record(self.game.tick, command)
+        if self.game.session:
+            self.game.session.dispatch(command)
+        else:
+            self.execute_command(command)
+
+    def execute_command(self, command):
+        """
+        Apply an input command to the game state.
+
+        Args:
+            command (InputCommand): The command to apply.
+        """
+        player = self.game.player
+        if command.kind == MOVE_TARGET:
+            self.game.target_pos = (command.x, command.y)
+        elif command.kind == SELECT_SKILL:
+            player.select_skill(command.index)
+        elif command.kind == USE_SKILL:
+            targets = self.game.find_skill_targets(player.selected_skill, command.x, command.y)
+            if targets:
+                player.use_selected_skill(targets)
+        elif command.kind == SPAWN_ENEMY:
+            self.game.spawn_enemy(command.x, command.y)
@@ -0,0 +1,183 @@
+# src/systems/input_recorder.py
+import random
+import struct
+import time
+import zlib
+from collections import defaultdict, namedtuple
+
+import pygame
+from src.systems.commands import InputCommand, MOVE_TARGET, SELECT_SKILL, USE_SKILL, SPAWN_ENEMY
+from src.utils import sim_clock
+
+# Log layout: a header followed by records of (tick, kind, payload)
+MAGIC = b"MREC"
+VERSION = 1
+HEADER = struct.Struct("<4sBIHH")  # magic, version, random seed, screen width, screen height
+RECORD = struct.Struct("<IB")      # tick, kind
+POSITION = struct.Struct("<dd")    # map x, map y
+INDEX = struct.Struct("<B")        # skill index
+HASH = struct.Struct("<I")         # crc32 of the simulation state
+
+STATE_HASH = 255  # Record kind marking the end of a tick
+TICK_MS = 1000 / 60
+
+POSITION_COMMANDS = (MOVE_TARGET, USE_SKILL, SPAWN_ENEMY)
+
+ReplayResult = namedtuple("ReplayResult", ["ticks", "elapsed", "mismatches"])
+
+def compute_state_hash(game):
+    """
+    Hash the parts of the game state that input and simulation can change.
+
+    Args:
+        game (Game): The game to hash.
+
+    Returns:
+        int: A crc32 of the player, enemy and world item state.
+    """
+    player = game.player
+    state = bytearray(struct.pack(
+        "<ddfiiii", player._x, player._y, player.health, player.level,
+        player.experience, player.enemy_kill_count, player.selected_skill_index
+    ))
+    state += repr(player.inventory.to_dict()).encode()
+    for enemy in game.enemies:
+        state += struct.pack("<ddf?", enemy.x, enemy.y, enemy.health, enemy.alive)
+    for world_item in game.world_items:
+        state += world_item.item.encode() + struct.pack("<ddi", world_item.x, world_item.y, world_item.quantity)
+    return zlib.crc32(state)
+
+class InputRecorder:
+    """Writes input commands and per-tick state hashes to a compact binary log."""
+
+    def __init__(self, path, screen_size, seed=None):
+        """
+        Initialize the InputRecorder and write the log header.
+
+        Args:
+            path (str): The file to record into.
+            screen_size (tuple): The size of the game screen (width, height).
+            seed (int): The random seed for the session. A new one is picked if None.
+        """
+        self.path = path
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.seed, screen_size[0], screen_size[1]))
+
+    def start(self):
+        """
+        Make the session reproducible. Must be called before the Game is created
+        so that enemy cooldowns are drawn from the recorded seed.
+        """
+        random.seed(self.seed)
+        sim_clock.use_fixed_step(TICK_MS)
+
+    def record(self, tick, command):
+        """
+        Append an input command to the log.
+
+        Args:
+            tick (int): The game tick the command is applied on.
+            command (InputCommand): The command to record.
+        """
+        self.file.write(RECORD.pack(tick, command.kind))
+        if command.kind in POSITION_COMMANDS:
+            self.file.write(POSITION.pack(command.x, command.y))
+        elif command.kind == SELECT_SKILL:
+            self.file.write(INDEX.pack(command.index))
+
+    def record_state(self, tick, state_hash):
+        """
+        Append the state hash that closes a tick.
+
+        Args:
+            tick (int): The tick that just finished.
+            state_hash (int): The hash from `compute_state_hash`.
+        """
+        self.file.write(RECORD.pack(tick, STATE_HASH))
+        self.file.write(HASH.pack(state_hash))
+
+    def close(self):
+        """Flush and close the log file."""
+        if not self.file.closed:
+            self.file.close()
+
+class InputReplayer:
+    """Feeds a recorded input log back through the simulation and checks state hashes."""
+
+    def __init__(self, path):
+        """
+        Load a log recorded by InputRecorder.
+
+        Args:
+            path (str): The log file to replay.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, self.seed, width, height = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{path}' is not a version {VERSION} input log.")
+        self.screen_size = (width, height)
+        self.commands = defaultdict(list)
+        self.hashes = {}
+        self.last_tick = -1
+
+        offset = HEADER.size
+        while offset < len(data):
+            tick, kind = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            if kind == STATE_HASH:
+                self.hashes[tick] = HASH.unpack_from(data, offset)[0]
+                offset += HASH.size
+            elif kind in POSITION_COMMANDS:
+                x, y = POSITION.unpack_from(data, offset)
+                offset += POSITION.size
+                self.commands[tick].append(InputCommand(kind, x, y))
+            elif kind == SELECT_SKILL:
+                index = INDEX.unpack_from(data, offset)[0]
+                offset += INDEX.size
+                self.commands[tick].append(InputCommand(kind, index=index))
+            else:
+                raise ValueError(f"Unknown record kind {kind} at offset {offset - RECORD.size}.")
+            self.last_tick = max(self.last_tick, tick)
+
+    def start(self):
+        """Restore the recorded seed and clock. Must be called before the Game is created."""
+        random.seed(self.seed)
+        sim_clock.use_fixed_step(TICK_MS)
+
+    def run(self, game, realtime=False, fps=60):
+        """
+        Replay every recorded tick.
+
+        Args:
+            game (Game): A freshly created game to drive.
+            realtime (bool): Render and pace the replay at `fps`; otherwise run as fast as possible without rendering.
+            fps (int): The frame rate used in real-time mode.
+
+        Returns:
+            ReplayResult: The number of ticks, wall time in seconds and the ticks whose hash did not match.
+        """
+        game.quest_handler.interactive = False
+        clock = pygame.time.Clock()
+        mismatches = []
+        start = time.perf_counter()
+
+        for tick in range(self.last_tick + 1):
+            for command in self.commands.get(tick, ()):
+                game.input_handler.execute_command(command)
+            game.handle_world_events()
+            game.update()
+
+            expected = self.hashes.get(tick)
+            if expected is not None and expected != compute_state_hash(game):
+                mismatches.append(tick)
+
+            if realtime:
+                pygame.event.pump()
+                game.render()
+                pygame.display.flip()
+                clock.tick(fps)
+
+        return ReplayResult(self.last_tick + 1, time.perf_counter() - start, mismatches)
@@ -1,5 +1,13 @@
 # src/utils/__init__.py
 from .barrier import collides_with_barrier
+from .clock import SimulationClock, sim_clock
+from .event_log import EventLog, GameEvent, format_event, DAMAGE, KILL, LEVEL_UP, RESPAWN, SPAWN, ITEM_GAINED
+from .inventory import Inventory
 from .item_handler import ItemHandler
+from .spatial_grid import SpatialGrid
 from .sprite_sheet import SpriteSheet
-from .stack import Stack
\ No newline at end of file
+from .stack import Stack
+from .assets import AssetStore, assets, MANIFEST_FILE
+from .surface_cache import SurfaceCache, CACHE_DIRECTORY
+from .frame_pacer import FramePacer, frame_pacer, GAMEPLAY_FPS, MENU_FPS
+from .metrics import MetricsRegistry, MetricsDumper, Counter, Gauge, Histogram, metrics
@@ -0,0 +1,188 @@
+# src/utils/assets.py
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from .atlas import load_atlas_index
+
+MANIFEST_FILE = "assets/manifest.json"
+LOAD_WORKERS = 4  # Threads decoding PNGs at startup
+
+class AssetStore:
+    """
+    Images used by the game, decoded in a thread pool at startup.
+
+    `start` queues every image in the manifest for decoding in worker threads.
+    Converting a surface to the display's pixel format has to happen on the
+    thread that owns the display, so `poll`, called by the loading screen every
+    frame, converts the images the workers have finished. Code asking for an
+    image with `image` gets the converted surface, waiting for it or loading it
+    on the spot if it is not ready yet.
+
+    Small sprites are packed into atlas pages by `pack_atlas.py`. The manifest
+    lists the pages' indexes, and an image packed on a page is handed out as a
+    subsurface of the page under its original path, without a copy.
+
+    With a `SurfaceCache`, images decoded on an earlier run are read back from
+    the cache instead of decoding the PNG again.
+    """
+
+    def __init__(self, cache=None):
+        """
+        Initialize an empty AssetStore.
+
+        Args:
+            cache (SurfaceCache): Where decoded images are kept between runs; None to always decode.
+        """
+        self.cache = cache
+        self.images = {}   # path -> converted surface
+        self.alpha = {}    # path -> whether the image keeps per-pixel alpha
+        self.pending = {}  # path -> Future of the decoded surface
+        self.atlases = {}  # atlas page path -> {packed image path: (x, y, width, height)}
+        self.packed = {}   # packed image path -> atlas page path
+        self.executor = None
+        self.total = 0
+
+    def load_manifest(self, manifest_file=MANIFEST_FILE):
+        """
+        Read the image list, with the atlas pages as images of their own.
+
+        Args:
+            manifest_file (str): The JSON manifest listing every image and whether it has alpha,
+                and the indexes of the atlas pages.
+
+        Returns:
+            list: The image entries, each a dict with "path" and "alpha".
+        """
+        with open(manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+        entries = list(manifest["images"])
+        for index_file in manifest.get("atlases", []):
+            try:
+                index = load_atlas_index(index_file)
+            except (OSError, ValueError) as e:
+                print(f"Error loading atlas index {index_file}: {e}")
+                continue  # Its images load from their own files instead
+            self.add_atlas(index["image"], index["sprites"])
+            entries.append({"path": index["image"], "alpha": index["alpha"]})
+        return entries
+
+    def add_atlas(self, path, sprites):
+        """
+        Hand out images packed on an atlas page as subsurfaces of the page.
+
+        Args:
+            path (str): The page's image file.
+            sprites (dict): Packed image path -> [x, y, width, height] on the page.
+        """
+        self.atlases[path] = {sprite: tuple(rect) for sprite, rect in sprites.items()}
+        for sprite in sprites:
+            self.packed[sprite] = path
+
+    def start(self, manifest_file=MANIFEST_FILE, workers=LOAD_WORKERS):
+        """
+        Start decoding every image in the manifest in a thread pool.
+
+        Args:
+            manifest_file (str): The JSON manifest.
+            workers (int): The number of decoding threads.
+        """
+        entries = self.load_manifest(manifest_file)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-loader")
+        for entry in entries:
+            path = entry["path"]
+            self.alpha[path] = entry["alpha"]
+            if path not in self.images and path not in self.pending:
+                self.pending[path] = self.executor.submit(self.decode, path)
+        self.total = len(entries)
+
+    @property
+    def loading(self):
+        """Whether images are still being decoded or waiting to be converted."""
+        return bool(self.pending)
+
+    @property
+    def progress(self):
+        """The share of the manifest's images ready to use, from 0 to 1."""
+        if not self.total:
+            return 1.0
+        return 1 - len(self.pending) / self.total
+
+    def poll(self):
+        """
+        Convert the images the workers have finished decoding. Call on the main thread.
+
+        Returns:
+            float: The progress after converting.
+        """
+        for path, future in list(self.pending.items()):
+            if future.done():
+                del self.pending[path]
+                try:
+                    self.store(path, self.convert(path, future.result()))
+                except (pygame.error, OSError) as e:
+                    print(f"Error loading image {path}: {e}")
+        if not self.pending and self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        return self.progress
+
+    def finish(self):
+        """Wait for every image in the manifest and convert it."""
+        for future in list(self.pending.values()):
+            future.exception()  # Waits; errors are reported by `poll`
+        self.poll()
+
+    def decode(self, path):
+        """Decode an image file, through the cache when there is one. Safe to call from a worker."""
+        if self.cache is None:
+            return pygame.image.load(path)
+        return self.cache.decode(path)
+
+    def convert(self, path, surface):
+        if self.alpha.get(path, True):
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def store(self, path, image):
+        self.images[path] = image
+        for sprite, rect in self.atlases.get(path, {}).items():
+            self.images[sprite] = image.subsurface(rect)
+
+    def is_ready(self, path):
+        """Whether an image is loaded and converted, so `image` returns without waiting."""
+        return path in self.images
+
+    def image(self, path, alpha=None):
+        """
+        Get a converted image, waiting for its worker or loading it now if it is not ready.
+
+        Args:
+            path (str): The image file.
+            alpha (bool): Whether to keep per-pixel alpha for an image not in the manifest; defaults to True.
+
+        Returns:
+            pygame.Surface: The image.
+
+        Raises:
+            pygame.error: If the file cannot be loaded.
+        """
+        image = self.images.get(path)
+        if image is not None:
+            return image
+        atlas = self.packed.get(path)
+        if atlas is not None and atlas not in self.images:
+            try:
+                self.image(atlas)
+            except (pygame.error, OSError) as e:
+                print(f"Error loading atlas {atlas}: {e}")
+                del self.packed[path]  # Falls back to the image's own file
+            else:
+                return self.images[path]
+        future = self.pending.pop(path, None)
+        surface = future.result() if future is not None else self.decode(path)
+        if alpha is not None and path not in self.alpha:
+            self.alpha[path] = alpha
+        self.store(path, self.convert(path, surface))
+        return self.images[path]
+
+assets = AssetStore()
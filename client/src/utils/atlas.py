@@ -0,0 +1,112 @@
+# src/utils/atlas.py
+import json
+import os
+import pygame
+
+ATLAS_DIRECTORY = "assets/atlas"
+ATLAS_SIZE = 1024      # Width and maximum height of an atlas page in pixels
+MAX_SPRITE_SIZE = 256  # Images larger than this either way stay in their own files
+SPRITE_DIRECTORIES = ("assets/items", "assets/quest", "assets/enemy", "assets/player")
+SPRITE_FILES = ("assets/question_mark.png",)
+
+def is_opaque(surface):
+    """Whether every pixel of a surface is fully opaque."""
+    width, height = surface.get_size()
+    return not surface.get_flags() & pygame.SRCALPHA or pygame.mask.from_surface(surface, 254).count() == width * height
+
+def pack_rects(sizes, width=ATLAS_SIZE, height=ATLAS_SIZE):
+    """
+    Place rectangles on pages with shelf packing: tallest first, left to right in rows.
+
+    Args:
+        sizes (list): (width, height) of each rectangle; none larger than a page.
+        width (int): The width of a page.
+        height (int): The height of a page.
+
+    Returns:
+        list: The pages, each a list of (index into sizes, x, y).
+    """
+    pages = []
+    x = y = shelf_height = 0
+    for index in sorted(range(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0], index)):
+        rect_width, rect_height = sizes[index]
+        if x + rect_width > width:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if not pages or y + rect_height > height:
+            pages.append([])
+            x = y = shelf_height = 0
+        pages[-1].append((index, x, y))
+        x += rect_width
+        shelf_height = max(shelf_height, rect_height)
+    return pages
+
+def find_sprites(directories=SPRITE_DIRECTORIES, files=SPRITE_FILES, max_size=MAX_SPRITE_SIZE):
+    """
+    Find the images small enough to pack.
+
+    Returns:
+        list: The image paths, sorted.
+    """
+    paths = list(files)
+    for directory in directories:
+        paths.extend(os.path.join(directory, name).replace(os.sep, "/") for name in os.listdir(directory) if name.endswith(".png"))
+    sprites = []
+    for path in sorted(paths):
+        width, height = pygame.image.load(path).get_size()
+        if width <= max_size and height <= max_size:
+            sprites.append(path)
+    return sprites
+
+def build_atlases(paths, directory=ATLAS_DIRECTORY, size=ATLAS_SIZE):
+    """
+    Pack images into atlas pages and write each page with its JSON index.
+
+    Opaque images and images with transparency go on separate pages, so that
+    opaque sprites can still be converted without per-pixel alpha.
+
+    Args:
+        paths (list): The image files to pack.
+        directory (str): Where to write the pages.
+        size (int): The width and maximum height of a page.
+
+    Returns:
+        list: The paths of the written JSON indexes.
+    """
+    os.makedirs(directory, exist_ok=True)
+    images = {path: pygame.image.load(path) for path in paths}
+    groups = {"opaque": [], "sprites": []}
+    for path in paths:
+        groups["opaque" if is_opaque(images[path]) else "sprites"].append(path)
+
+    indexes = []
+    for name, group in groups.items():
+        sizes = [images[path].get_size() for path in group]
+        for number, page in enumerate(pack_rects(sizes, size, size)):
+            page_height = max(y + sizes[index][1] for index, x, y in page)
+            alpha = name == "sprites"
+            atlas = pygame.Surface((size, page_height), pygame.SRCALPHA if alpha else 0, 32)
+            sprites = {}
+            for index, x, y in page:
+                path = group[index]
+                atlas.blit(images[path], (x, y))
+                sprites[path] = [x, y, *sizes[index]]
+            image_path = f"{directory}/{name}{number}.png"
+            pygame.image.save(atlas, image_path)
+            index_path = f"{directory}/{name}{number}.json"
+            with open(index_path, "w", encoding="utf-8") as f:
+                f.write(f'{{\n    "image": {json.dumps(image_path)},\n    "alpha": {json.dumps(alpha)},\n    "sprites": {{\n')
+                f.write(",\n".join(f"        {json.dumps(path)}: {json.dumps(rect)}" for path, rect in sprites.items()))
+                f.write("\n    }\n}\n")
+            indexes.append(index_path)
+    return indexes
+
+def load_atlas_index(index_file):
+    """
+    Read an atlas page's index.
+
+    Returns:
+        dict: "image", the page's image file; "alpha", whether it keeps per-pixel alpha;
+        and "sprites", each packed image's original path -> [x, y, width, height] on the page.
+    """
+    with open(index_file, encoding="utf-8") as f:
+        return json.load(f)
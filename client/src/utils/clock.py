@@ -0,0 +1,72 @@
+# src/utils/clock.py
+import time
+import pygame
+
+class SimulationClock:
+    """
+    Source of simulation time for entities, skills and respawn timers.
+
+    By default the clock follows wall time (``time.time`` and ``pygame.time.get_ticks``).
+    In fixed-step mode time only moves when the game loop advances a tick, so a
+    recorded session produces the same timers when it is replayed.
+    """
+
+    def __init__(self):
+        """Initialize the clock in real-time mode."""
+        self.fixed_step_ms = None
+        self.steps = 0
+
+    @property
+    def is_fixed_step(self):
+        """Whether the clock is advanced manually by the game loop."""
+        return self.fixed_step_ms is not None
+
+    def use_fixed_step(self, step_ms=1000 / 60):
+        """
+        Switch to fixed-step mode, starting from zero.
+
+        Args:
+            step_ms (float): The simulated time added by every call to `advance`.
+        """
+        self.fixed_step_ms = step_ms
+        self.steps = 0
+
+    def use_realtime(self):
+        """Switch back to following wall time."""
+        self.fixed_step_ms = None
+        self.steps = 0
+
+    def advance(self):
+        """Advance the clock by one tick. Does nothing in real-time mode."""
+        if self.fixed_step_ms is not None:
+            self.steps += 1
+
+    @property
+    def elapsed_ms(self):
+        """Milliseconds simulated since fixed-step mode was entered."""
+        return self.steps * self.fixed_step_ms
+
+    def get_ticks(self):
+        """
+        Get the simulation time in milliseconds.
+
+        Returns:
+            int: Milliseconds, as `pygame.time.get_ticks` would return them.
+        """
+        if self.fixed_step_ms is not None:
+            return int(self.elapsed_ms)
+        return pygame.time.get_ticks()
+
+    def time(self):
+        """
+        Get the simulation time in seconds.
+
+        Returns:
+            float: Seconds, as `time.time` would return them.
+        """
+        if self.fixed_step_ms is not None:
+            return self.elapsed_ms / 1000
+        return time.time()
+
+# Shared by every entity in the process
+sim_clock = SimulationClock()
@@ -0,0 +1,191 @@
+# src/utils/event_log.py
+import json
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+from .clock import sim_clock
+
+# Event kinds
+DAMAGE = "damage"
+KILL = "kill"
+LEVEL_UP = "level_up"
+RESPAWN = "respawn"
+SPAWN = "spawn"
+ITEM_GAINED = "item_gained"
+
+# Text shown for each event kind in the in-game log
+EVENT_FORMATS = {
+    DAMAGE: "{skill} hit {targets} enemies for {damage}",
+    KILL: "Killed {kills} enemies, +{experience} XP",
+    LEVEL_UP: "Level up! Level {level}, max health {max_health}, attack damage {attack_damage}",
+    RESPAWN: "Respawned with full health",
+    SPAWN: "Level {level} enemy spawned at ({x:.0f}, {y:.0f})",
+    ITEM_GAINED: "Gained {item}",
+}
+
+GameEvent = namedtuple("GameEvent", ["sequence", "time", "kind", "data"])
+
+def format_event(event):
+    """
+    Format an event as a line of text for display.
+
+    Args:
+        event (GameEvent): The event to format.
+
+    Returns:
+        str: The formatted text.
+    """
+    template = EVENT_FORMATS.get(event.kind)
+    if template is None:
+        return f"{event.kind}: {event.data}"
+    return template.format(**event.data)
+
+class EventLog:
+    """
+    Ring buffer of typed game events.
+
+    Emitting an event is an append to a bounded deque plus, when a file drain is
+    running, a non-blocking hand-off to the writer thread. Nothing on the game
+    loop waits on terminal or disk I/O.
+    """
+
+    def __init__(self, capacity=256):
+        """
+        Initialize the EventLog.
+
+        Args:
+            capacity (int): The number of most recent events kept in memory.
+        """
+        self.events = deque(maxlen=capacity)
+        self.sequence = 0
+        self.writer = None
+        self.listeners = {}  # kind -> callbacks
+
+    def emit(self, kind, **data):
+        """
+        Record an event.
+
+        Args:
+            kind (str): One of the event kind constants.
+            **data: The event's fields, used by `format_event` and written to the drain file.
+
+        Returns:
+            GameEvent: The recorded event.
+        """
+        self.sequence += 1
+        event = GameEvent(self.sequence, sim_clock.time(), kind, data)
+        self.events.append(event)
+        if self.writer is not None:
+            self.writer.submit(event)
+        for callback in self.listeners.get(kind, ()):
+            callback(event)
+        return event
+
+    def subscribe(self, kind, callback):
+        """
+        Call a function with every future event of a kind.
+
+        Args:
+            kind (str): The event kind to listen for.
+            callback (callable): Called with the GameEvent right after it is recorded.
+        """
+        self.listeners.setdefault(kind, []).append(callback)
+
+    def recent(self, count, kinds=None):
+        """
+        Get the most recent events, oldest first.
+
+        Args:
+            count (int): The maximum number of events to return.
+            kinds (set): Only return events of these kinds, or every kind if None.
+
+        Returns:
+            list: The matching events.
+        """
+        found = []
+        for event in reversed(self.events):
+            if kinds is None or event.kind in kinds:
+                found.append(event)
+                if len(found) == count:
+                    break
+        found.reverse()
+        return found
+
+    def start_file_drain(self, path, flush_interval=1.0, max_pending=4096):
+        """
+        Start writing every new event to a JSON-lines file from a background thread.
+
+        Args:
+            path (str): The file to append events to.
+            flush_interval (float): The maximum time in seconds events wait before being flushed.
+            max_pending (int): Events queued beyond this are dropped rather than blocking the game.
+
+        Returns:
+            EventLogWriter: The running writer thread.
+        """
+        self.stop_file_drain()
+        self.writer = EventLogWriter(path, flush_interval, max_pending)
+        self.writer.start()
+        return self.writer
+
+    def stop_file_drain(self):
+        """Flush and stop the background writer if one is running."""
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
+
+class EventLogWriter(threading.Thread):
+    """Background thread that appends submitted events to a file."""
+
+    _STOP = object()
+
+    def __init__(self, path, flush_interval=1.0, max_pending=4096):
+        """
+        Initialize the EventLogWriter.
+
+        Args:
+            path (str): The file to append events to.
+            flush_interval (float): The maximum time in seconds events wait before being flushed.
+            max_pending (int): The size of the hand-off queue.
+        """
+        super().__init__(name="EventLogWriter", daemon=True)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.dropped = 0
+
+    def submit(self, event):
+        """
+        Queue an event for writing without blocking.
+
+        Args:
+            event (GameEvent): The event to write.
+        """
+        try:
+            self.pending.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Write the remaining events and wait for the thread to finish."""
+        self.pending.put(self._STOP)
+        self.join()
+
+    def run(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    event = self.pending.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    event = None
+                if event is self._STOP:
+                    break
+                if event is not None:
+                    f.write(json.dumps({"sequence": event.sequence, "time": event.time, "kind": event.kind, **event.data}) + "\n")
+                if time.monotonic() - last_flush >= self.flush_interval:
+                    f.flush()
+                    last_flush = time.monotonic()
+            if self.dropped:
+                f.write(json.dumps({"kind": "dropped", "count": self.dropped}) + "\n")
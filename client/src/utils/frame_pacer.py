@@ -0,0 +1,65 @@
+# src/utils/frame_pacer.py
+import pygame
+
+GAMEPLAY_FPS = 60     # Frames per second while playing; the simulation advances one step per frame
+MENU_FPS = 30         # Most frames per second a menu is redrawn at, e.g. while the mouse hovers buttons
+UNFOCUSED_FPS = 5     # Frames per second drawn while the window is in the background or minimized
+IDLE_TIMEOUT = 1000   # Milliseconds a static screen sleeps waiting for input before checking again
+
+class FramePacer:
+    """
+    Decides how often the client draws, so screens that are not changing do not spin a CPU core.
+
+    Menus and dialogues only change on input, so they sleep in `wait` until an
+    event arrives. Gameplay runs at the full rate, because the world advances one
+    step per frame, but while the window is in the background only a few of
+    those frames are drawn.
+    """
+
+    def __init__(self):
+        """Initialize the FramePacer."""
+        self.clock = pygame.time.Clock()
+        self.last_render = None  # Ticks of the last frame drawn in the background
+
+    def is_focused(self):
+        """Whether the window has input focus and is not minimized."""
+        return pygame.key.get_focused() and pygame.display.get_active()
+
+    def tick(self, fps=GAMEPLAY_FPS):
+        """
+        Sleep for the rest of the frame.
+
+        Args:
+            fps (int): The frame rate to keep.
+
+        Returns:
+            int: Milliseconds since the previous tick.
+        """
+        return self.clock.tick(fps)
+
+    def wait(self, timeout=IDLE_TIMEOUT):
+        """
+        Sleep until an event arrives or the timeout passes.
+
+        Args:
+            timeout (int): The longest to sleep, in milliseconds.
+
+        Returns:
+            list: Every pending event, empty if the timeout passed without one.
+        """
+        event = pygame.event.wait(timeout)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        return events
+
+    def should_render(self):
+        """Whether to draw this gameplay frame: always while focused, at `UNFOCUSED_FPS` otherwise."""
+        if self.is_focused():
+            return True
+        now = pygame.time.get_ticks()
+        if self.last_render is not None and now - self.last_render < 1000 / UNFOCUSED_FPS:
+            return False
+        self.last_render = now
+        return True
+
+frame_pacer = FramePacer()
@@ -0,0 +1,165 @@
+# src/utils/inventory.py
+class Inventory:
+    """
+    Counted inventory with a limited number of slots.
+
+    Items are stored in a dict of item -> quantity, so membership and counts are
+    O(1) and duplicates stack in one slot. Dicts keep insertion order, which is
+    the order slots are displayed in.
+    """
+
+    def __init__(self, capacity=20, max_stack=99):
+        """
+        Initialize the Inventory.
+
+        Args:
+            capacity (int): The maximum number of distinct items (slots).
+            max_stack (int): The maximum quantity of one item in its slot.
+        """
+        self.capacity = capacity
+        self.max_stack = max_stack
+        self.slots = {}
+        self.listeners = []
+
+    def __contains__(self, item):
+        return item in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    @property
+    def items(self):
+        """
+        Get the item names in display order.
+
+        Returns:
+            list: One entry per slot.
+        """
+        return list(self.slots)
+
+    def count(self, item):
+        """
+        Get the quantity held of an item.
+
+        Returns:
+            int: The quantity, 0 if the item is not held.
+        """
+        return self.slots.get(item, 0)
+
+    def is_full(self):
+        """Whether every slot is taken."""
+        return len(self.slots) >= self.capacity
+
+    def is_empty(self):
+        """Whether no item is held."""
+        return not self.slots
+
+    def add(self, item, quantity=1):
+        """
+        Add items, stacking them onto an existing slot when possible.
+
+        Args:
+            item (str): The item to add.
+            quantity (int): How many to add.
+
+        Returns:
+            int: How many were added; less than `quantity` when the stack or the inventory is full.
+        """
+        current = self.slots.get(item)
+        if current is None:
+            if self.is_full():
+                return 0
+            current = 0
+        added = min(quantity, self.max_stack - current)
+        if added <= 0:
+            return 0
+        self.slots[item] = current + added
+        self._notify(item, current + added)
+        return added
+
+    def remove(self, item, quantity=1):
+        """
+        Remove items, freeing the slot when its quantity reaches zero.
+
+        Args:
+            item (str): The item to remove.
+            quantity (int): How many to remove.
+
+        Returns:
+            bool: True if enough items were held and removed, False otherwise.
+        """
+        current = self.slots.get(item, 0)
+        if current < quantity:
+            return False
+        remaining = current - quantity
+        if remaining:
+            self.slots[item] = remaining
+        else:
+            del self.slots[item]
+        self._notify(item, remaining)
+        return True
+
+    def peek(self):
+        """
+        Get the item in the last slot.
+
+        Returns:
+            str: The item, or None if the inventory is empty.
+        """
+        if not self.slots:
+            return None
+        return next(reversed(self.slots))
+
+    def pop(self):
+        """
+        Remove one of the item in the last slot.
+
+        Returns:
+            str: The removed item, or None if the inventory is empty.
+        """
+        item = self.peek()
+        if item is not None:
+            self.remove(item)
+        return item
+
+    def subscribe(self, callback):
+        """
+        Call a function after every change.
+
+        Args:
+            callback (callable): Called with (item, new quantity).
+        """
+        self.listeners.append(callback)
+
+    def to_dict(self):
+        """
+        Get the contents in display order.
+
+        Returns:
+            dict: Item -> quantity.
+        """
+        return dict(self.slots)
+
+    def load(self, slots):
+        """
+        Replace the contents, for example with a saved or server-side inventory.
+        Listeners are told about every slot that changes.
+
+        Args:
+            slots (dict): Item -> quantity.
+        """
+        for item in [item for item in self.slots if item not in slots]:
+            self.remove(item, self.slots[item])
+        for item, quantity in slots.items():
+            held = self.count(item)
+            if quantity > held:
+                self.add(item, quantity - held)
+            elif quantity < held:
+                self.remove(item, held - quantity)
+
+    def _notify(self, item, quantity):
+        for callback in self.listeners:
+            callback(item, quantity)
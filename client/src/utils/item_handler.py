@@ -11,12 +11,15 @@ class ItemHandler:
         """
         self.player = player
 
-    def pickup_axe(self):
-        """Pick up the axe item and add it to the player's inventory."""
-        quest_item = "Axe Head"  # Example reward
-        self.player.add_to_inventory(quest_item)
+    def pickup(self, item, quantity=1):
+        """
+        Pick up an item lying in the world and add it to the player's inventory.
+
+        Args:
+            item (str): The name of the item.
+            quantity (int): How many items the picked up stack holds.
 
-    def pickup_vial(self):
-        """Pick up the vial item and add it to the player's inventory."""
-        quest_item = "Empty vial"  # Example reward
-        self.player.add_to_inventory(quest_item)
\ No newline at end of file
+        Returns:
+            int: How many fit in the inventory.
+        """
+        return self.player.add_to_inventory(item, quantity)
\ No newline at end of file
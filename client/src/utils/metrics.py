@@ -0,0 +1,290 @@
+# src/utils/metrics.py
+import os
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+# Upper bounds in seconds of the histogram buckets, from a tenth of a millisecond to a whole tick and beyond
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.0167, 0.025, 0.05, 0.1, 0.25)
+
+def _escape_label_value(value):
+    # Backslash, double quote and newline must be escaped inside a quoted label value
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric(ABC):
+    """
+    A named metric, optionally split into children by label values.
+
+    Updating a metric is an attribute increment on the game loop; formatting
+    happens only when the registry is rendered.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labels=()):
+        """
+        Initialize the Metric.
+
+        Args:
+            name (str): The metric name, in Prometheus naming style.
+            help_text (str): One line describing the metric.
+            labels (tuple): Label names; the metric is then updated through `labels`.
+        """
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.children = {}  # label values -> metric of the same kind without labels
+
+    def labels(self, *values):
+        """
+        Get the child metric for a set of label values, creating it on first use.
+
+        Args:
+            *values: One value for each label name.
+
+        Returns:
+            Metric: The child, updated like an unlabelled metric.
+        """
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = type(self)(self.name, self.help)
+        return child
+
+    def remove(self, *values):
+        """
+        Drop the child for a set of label values, e.g. when what it describes goes away.
+
+        Args:
+            *values: One value for each label name.
+        """
+        self.children.pop(values, None)
+
+    def samples(self):
+        """
+        Get the metric's current values.
+
+        Returns:
+            list: (name suffix, label names, label values, value) tuples.
+        """
+        if not self.label_names:
+            return self.own_samples((), ())
+        found = []
+        for values, child in list(self.children.items()):
+            found.extend(child.own_samples(self.label_names, values))
+        return found
+
+    @abstractmethod
+    def own_samples(self, names, values):
+        """
+        Get the samples of this metric alone, ignoring its children.
+
+        Args:
+            names (tuple): Label names to attach to every sample.
+            values (tuple): The matching label values.
+
+        Returns:
+            list: (name suffix, label names, label values, value) tuples.
+        """
+
+class Counter(Metric):
+    """A value that only goes up, such as events handled or bytes sent."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self.value = 0
+
+    def inc(self, amount=1):
+        """Add to the counter."""
+        self.value += amount
+
+    def own_samples(self, names, values):
+        return [("", names, values, self.value)]
+
+class Gauge(Metric):
+    """A value that goes up and down, either set directly or read from a function when rendered."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labels=()):
+        super().__init__(name, help_text, labels)
+        self.value = 0
+        self.function = None
+
+    def set(self, value):
+        """Set the gauge."""
+        self.value = value
+
+    def set_function(self, function):
+        """
+        Read the gauge from a function whenever the registry is rendered, so it costs nothing on the game loop.
+
+        Args:
+            function (callable): Returns the current value; None to go back to `set`.
+        """
+        self.function = function
+
+    def own_samples(self, names, values):
+        return [("", names, values, self.function() if self.function is not None else self.value)]
+
+class Histogram(Metric):
+    """
+    Distribution of observed values, such as durations, in cumulative buckets.
+
+    An observation is a binary search over the bucket bounds and two additions.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # The last count is above every bound
+        self.sum = 0.0
+
+    def labels(self, *values):
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = Histogram(self.name, self.help, buckets=self.buckets)
+        return child
+
+    def observe(self, value):
+        """Record one value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        """The number of values observed."""
+        return sum(self.counts)
+
+    def own_samples(self, names, values):
+        found = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            found.append(("_bucket", names + ("le",), values + (_format_value(bound),), cumulative))
+        found.append(("_sum", names, values, self.sum))
+        found.append(("_count", names, values, cumulative))
+        return found
+
+class MetricsRegistry:
+    """
+    The metrics of a process, rendered in the Prometheus text format.
+
+    Modules declare their metrics once at import; asking for a name that is
+    already registered returns the existing metric.
+    """
+
+    def __init__(self):
+        """Initialize an empty MetricsRegistry."""
+        self.metrics = {}  # name -> Metric, in registration order
+
+    def register(self, metric_type, name, help_text, labels=(), **options):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = metric_type(name, help_text, labels, **options)
+        elif not isinstance(metric, metric_type):
+            raise ValueError(f"Metric {name!r} is already registered as a {metric.kind}.")
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        """Get the Counter of a name, registering it on first use."""
+        return self.register(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        """Get the Gauge of a name, registering it on first use."""
+        return self.register(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DURATION_BUCKETS):
+        """Get the Histogram of a name, registering it on first use."""
+        return self.register(Histogram, name, help_text, labels, buckets=buckets)
+
+    def render(self):
+        """
+        Format every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, names, values, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Write the rendered metrics to a file, replacing it in one step so readers never see half a file.
+
+        Args:
+            path (str): The file to write.
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+    def start_file_dump(self, path, interval=10.0):
+        """
+        Start rewriting a file with the metrics from a background thread.
+
+        Args:
+            path (str): The file to write, in the Prometheus text format.
+            interval (float): Seconds between writes.
+
+        Returns:
+            MetricsDumper: The running thread; `stop` it to write the final values.
+        """
+        dumper = MetricsDumper(self, path, interval)
+        dumper.start()
+        return dumper
+
+class MetricsDumper(threading.Thread):
+    """Background thread writing a registry to a file at a fixed interval."""
+
+    def __init__(self, registry, path, interval=10.0):
+        """
+        Initialize the MetricsDumper.
+
+        Args:
+            registry (MetricsRegistry): The metrics to write.
+            path (str): The file to write.
+            interval (float): Seconds between writes.
+        """
+        super().__init__(name="MetricsDumper", daemon=True)
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def stop(self):
+        """Write the final values and wait for the thread to finish."""
+        self.stopped.set()
+        self.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.dump()
+        self.dump()
+
+    def dump(self):
+        try:
+            self.registry.write(self.path)
+        except OSError as e:
+            print(f"Error: Could not write metrics to {self.path}: {e}")
+
+metrics = MetricsRegistry()
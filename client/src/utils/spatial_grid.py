@@ -0,0 +1,168 @@
+# src/utils/spatial_grid.py
+class SpatialGrid:
+    """
+    Uniform grid that buckets objects by map cell so area queries only look at nearby objects.
+
+    Cells are dicts used as insertion-ordered sets, which keeps query results in a
+    stable order from run to run.
+    """
+
+    def __init__(self, cell_size):
+        """
+        Initialize the SpatialGrid.
+
+        Args:
+            cell_size (int): The width and height of a cell in map units, usually CHUNK_SIZE.
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}  # object -> (x, y, cell)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, obj):
+        return obj in self.entries
+
+    def cell_of(self, x, y):
+        """
+        Get the cell containing a map position.
+
+        Returns:
+            tuple: The cell coordinates (cell_x, cell_y).
+        """
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, obj, x, y):
+        """
+        Add an object at a map position, or move it there if it is already in the grid.
+
+        Args:
+            obj: The object to store. Must be hashable.
+            x (float): The x-coordinate of the object.
+            y (float): The y-coordinate of the object.
+        """
+        self.move(obj, x, y)
+
+    def move(self, obj, x, y):
+        """
+        Update an object's position. Only touches the cell buckets when the object changes cell.
+
+        Args:
+            obj: The object to move.
+            x (float): The new x-coordinate.
+            y (float): The new y-coordinate.
+        """
+        cell = self.cell_of(x, y)
+        entry = self.entries.get(obj)
+        if entry is None or entry[2] != cell:
+            if entry is not None:
+                self._remove_from_cell(obj, entry[2])
+            self.cells.setdefault(cell, {})[obj] = None
+        self.entries[obj] = (x, y, cell)
+
+    def remove(self, obj):
+        """
+        Remove an object from the grid if present.
+
+        Args:
+            obj: The object to remove.
+        """
+        entry = self.entries.pop(obj, None)
+        if entry is not None:
+            self._remove_from_cell(obj, entry[2])
+
+    def clear(self):
+        """Remove every object."""
+        self.cells.clear()
+        self.entries.clear()
+
+    def rebuild(self, objects):
+        """
+        Replace the grid contents with objects exposing `x` and `y` attributes.
+
+        Args:
+            objects (iterable): The objects to index.
+        """
+        self.clear()
+        for obj in objects:
+            self.move(obj, obj.x, obj.y)
+
+    def position_of(self, obj):
+        """
+        Get the position an object was last stored at.
+
+        Returns:
+            tuple: The position (x, y), or None if the object is not in the grid.
+        """
+        entry = self.entries.get(obj)
+        return (entry[0], entry[1]) if entry else None
+
+    def query_cells(self, min_cell_x, min_cell_y, max_cell_x, max_cell_y):
+        """
+        Get every object in an inclusive range of cells.
+
+        Returns:
+            list: The objects in those cells.
+        """
+        found = []
+        cells = self.cells
+        for cell_y in range(min_cell_y, max_cell_y + 1):
+            for cell_x in range(min_cell_x, max_cell_x + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def query_rect(self, left, top, width, height):
+        """
+        Get every object whose position lies inside a rectangle.
+
+        Args:
+            left (float): The left edge of the rectangle.
+            top (float): The top edge of the rectangle.
+            width (float): The width of the rectangle.
+            height (float): The height of the rectangle.
+
+        Returns:
+            list: The objects inside the rectangle.
+        """
+        right = left + width
+        bottom = top + height
+        min_cell_x, min_cell_y = self.cell_of(left, top)
+        max_cell_x, max_cell_y = self.cell_of(right, bottom)
+        entries = self.entries
+        return [
+            obj for obj in self.query_cells(min_cell_x, min_cell_y, max_cell_x, max_cell_y)
+            if left <= entries[obj][0] <= right and top <= entries[obj][1] <= bottom
+        ]
+
+    def query_radius(self, x, y, radius):
+        """
+        Get every object within a distance of a point.
+
+        Args:
+            x (float): The x-coordinate of the centre.
+            y (float): The y-coordinate of the centre.
+            radius (float): The maximum distance.
+
+        Returns:
+            list: The objects within `radius`.
+        """
+        min_cell_x, min_cell_y = self.cell_of(x - radius, y - radius)
+        max_cell_x, max_cell_y = self.cell_of(x + radius, y + radius)
+        entries = self.entries
+        radius_squared = radius * radius
+        found = []
+        for obj in self.query_cells(min_cell_x, min_cell_y, max_cell_x, max_cell_y):
+            obj_x, obj_y, _ = entries[obj]
+            if (obj_x - x) ** 2 + (obj_y - y) ** 2 <= radius_squared:
+                found.append(obj)
+        return found
+
+    def _remove_from_cell(self, obj, cell):
+        bucket = self.cells.get(cell)
+        if bucket is not None:
+            bucket.pop(obj, None)
+            if not bucket:
+                del self.cells[cell]
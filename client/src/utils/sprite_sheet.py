@@ -1,16 +1,39 @@
 # src/utils/sprite_sheet.py
 import pygame
+from .assets import assets
 
 class SpriteSheet:
+    # file path -> SpriteSheet, so every user of a sheet shares its frames
+    sheets = {}
+
     def __init__(self, file_path):
-        self.sheet = pygame.image.load(file_path).convert_alpha()
-    
+        self.sheet = assets.image(file_path)
+        self.frames = {}      # (frame, row, width, height, scale) -> frame surface
+        self.animations = {}  # (row, steps, width, height, scale) -> list of frames
+
+    @classmethod
+    def get(cls, file_path):
+        # One instance per file, built on first use
+        sprite_sheet = cls.sheets.get(file_path)
+        if sprite_sheet is None:
+            sprite_sheet = cls.sheets[file_path] = cls(file_path)
+        return sprite_sheet
+
     def get_image(self, frame, row, width, height, scale):
-        # Create a new blank image with transparency
-        image = pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
-        # Copy the sprite from the sheet onto the new image
-        image.blit(self.sheet, (0, 0), (frame * width, row * height, width, height))
-        # Scale the image
-        image = pygame.transform.scale(image, (int(width * scale), int(height * scale)))
+        key = (frame, row, width, height, scale)
+        image = self.frames.get(key)
+        if image is None:
+            # Unscaled frames are views into the sheet; scaled ones are copied once
+            image = self.sheet.subsurface((frame * width, row * height, width, height))
+            if scale != 1:
+                image = pygame.transform.scale(image, (int(width * scale), int(height * scale)))
+            self.frames[key] = image
+        return image
 
-        return image
\ No newline at end of file
+    def get_animation(self, row, steps, width, height, scale):
+        # The returned list is shared by every player animating this row, so it must not be modified
+        key = (row, steps, width, height, scale)
+        animation = self.animations.get(key)
+        if animation is None:
+            animation = self.animations[key] = [self.get_image(x, row, width, height, scale) for x in range(steps)]
+        return animation
@@ -0,0 +1,147 @@
+# src/utils/surface_cache.py
+import hashlib
+import json
+import os
+import pygame
+from .metrics import metrics
+
+CACHE_DIRECTORY = "cache/surfaces"
+CACHE_VERSION = 1  # Bumped when the entry layout changes, so old entries are decoded again
+
+CACHE_LOOKUPS = metrics.counter("asset_cache_lookups_total", "Images looked up in the decoded surface cache", labels=("result",))
+
+def file_hash(path):
+    """The SHA-1 of a file's contents, as hex."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class SurfaceCache:
+    """
+    Directory of decoded images, so that startup can skip PNG decoding.
+
+    Each entry is one file: a JSON header line with the source file's size,
+    modification time and hash and the image's size and pixel format, followed
+    by the raw pixels. An entry is used while the source has the same size and
+    either the same modification time or, when only the time changed, the same
+    hash; otherwise the image is decoded again and the entry replaced.
+
+    Pixels are kept as RGB or RGBA rather than in the display's format, so the
+    entries stay valid on any display; converting them is the same cheap copy
+    a freshly decoded image needs.
+    """
+
+    def __init__(self, directory=CACHE_DIRECTORY):
+        """
+        Initialize the SurfaceCache.
+
+        Args:
+            directory (str): Where the entries are kept; created on the first store.
+        """
+        self.directory = directory
+
+    def entry_file(self, path):
+        name = path.replace(os.sep, "/").replace("/", "--")
+        return os.path.join(self.directory, f"{name}.surface")
+
+    def load(self, path):
+        """
+        Rebuild an image from its entry, if the entry matches the file on disk.
+
+        Args:
+            path (str): The image file.
+
+        Returns:
+            pygame.Surface: The decoded image, not yet converted, or None on a miss.
+        """
+        try:
+            stat = os.stat(path)
+            with open(self.entry_file(path), "rb") as f:
+                header = json.loads(f.readline())
+                if header["version"] != CACHE_VERSION or header["size"] != stat.st_size:
+                    CACHE_LOOKUPS.labels("stale").inc()
+                    return None
+                touched = header["mtime"] != stat.st_mtime_ns
+                if touched and header["hash"] != file_hash(path):
+                    CACHE_LOOKUPS.labels("stale").inc()
+                    return None
+                pixels = f.read()
+            surface = pygame.image.frombuffer(pixels, header["dimensions"], header["format"])
+        except FileNotFoundError:
+            CACHE_LOOKUPS.labels("miss").inc()
+            return None
+        except (OSError, ValueError, KeyError, pygame.error) as e:
+            print(f"Error reading cached image {path}: {e}")
+            return None
+        if touched:
+            # Same contents under a new time, e.g. after a checkout: record the time so later starts skip the hash
+            header["mtime"] = stat.st_mtime_ns
+            self.write_entry(path, header, pixels)
+        CACHE_LOOKUPS.labels("hit").inc()
+        return surface
+
+    def store(self, path, surface):
+        """
+        Save a freshly decoded image, replacing its entry in one step.
+
+        Args:
+            path (str): The image file the surface was decoded from.
+            surface (pygame.Surface): The decoded image.
+        """
+        pixel_format = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+        try:
+            stat = os.stat(path)
+            header = {
+                "version": CACHE_VERSION,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "hash": file_hash(path),
+                "dimensions": surface.get_size(),
+                "format": pixel_format,
+            }
+            pixels = pygame.image.tobytes(surface, pixel_format)
+        except (OSError, pygame.error) as e:
+            print(f"Error caching image {path}: {e}")
+            return
+        self.write_entry(path, header, pixels)
+
+    def write_entry(self, path, header, pixels):
+        """
+        Write an entry through a temporary file, so a reader never sees half of one.
+
+        Args:
+            path (str): The image file the entry is for.
+            header (dict): The entry's header.
+            pixels (bytes): The raw pixels in the header's format.
+        """
+        entry = self.entry_file(path)
+        temporary = f"{entry}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                f.write(pixels)
+            os.replace(temporary, entry)
+        except OSError as e:
+            print(f"Error caching image {path}: {e}")
+
+    def decode(self, path):
+        """
+        Decode an image, from its entry when it is current and from the file otherwise.
+
+        Args:
+            path (str): The image file.
+
+        Returns:
+            pygame.Surface: The decoded image, not yet converted.
+
+        Raises:
+            pygame.error: If the file cannot be loaded.
+        """
+        surface = self.load(path)
+        if surface is None:
+            surface = pygame.image.load(path)
+            self.store(path, surface)
+        return surface
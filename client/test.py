@@ -1,6 +1,39 @@
+import asyncio
+import json
+import random
+from collections import deque
+import os
+import queue
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 from src.entities.enemy import Enemy
+from src.entities.player import Player, INITIAL_PLAYER_POSITION
+from src.entities.skill import Skill, SHAPE_CIRCLE, SHAPE_CONE, SHAPE_LINE
+from src.game_logic.world_items import WorldItemStore, LootEntry, LOOT_LIFETIME
+from src.game_logic.prediction import PlayerPrediction
+from src.game_logic.network_session import NetworkSession
+from src.game_logic.player_manager import PlayerManager, LOCAL_PLAYER_ID
+from src.game_logic.zones import ZONES
+from src.game_logic.game import Game
+from src.game_logic.transition_manager import TransitionManager
+from src.game_logic.quest_engine import QuestEngine, compile_quests, COMPLETED, TRIGGER_TALK, TRIGGER_ITEM_GAINED, TRIGGER_REGION_ENTERED
+from src.network.bot import Bot
+from src.network import (
+    HELLO, SNAPSHOT, NOTICE, encode_json, decode_json, read_frame, encode_command, SnapshotEncoder, SnapshotDecoder,
+    InterpolationBuffer, NetworkClient, describe_record, you_record, enemy_record, YOU,
+)
+from src.server import GameServer, ClientConnection, ZoneWorld, ZoneLink, RegionLayout, RegionWorld, PlayerStore
+from src.server.server import SEND_BUFFER_LIMIT, SLOW_CLIENT_TIMEOUT
+from src.server.regions import empty_orders
+from src.server.lag_compensation import EnemyHistory
+from src.rendering import RenderScaler, QUALITY_PRESETS
+from src.rendering.map_renderer import load_animated_tiles, current_tile_images, TILE_GRASS_BODY, TILE_WATERFALL
+from src.rendering.render_scaler import SLOW_FRAMES
+from src.systems import InputRecorder, InputReplayer, InputCommand, MOVE_TARGET, SELECT_SKILL, USE_SKILL, SPAWN_ENEMY
+from src.utils import AssetStore, EventLog, FramePacer, Inventory, ItemHandler, SpatialGrid, SpriteSheet, SurfaceCache, MetricsRegistry, sim_clock, DAMAGE, KILL
+from src.utils.atlas import pack_rects, build_atlases
+import pygame
 import time
 
 class TestEnemy(unittest.TestCase):
@@ -49,6 +82,7 @@ class TestEnemy(unittest.TestCase):
         self.enemy.take_damage(100)
         self.assertFalse(self.enemy.alive)
         self.assertEqual(self.enemy.health, 0)
+        self.game.world_items.drop_loot.assert_called_once_with(self.enemy)
 
     @patch('time.time', return_value=1000)
     def test_attack_player(self, mock_time) -> None:
@@ -113,5 +147,924 @@ class TestEnemy(unittest.TestCase):
         self.assertTrue(self.enemy._is_within_range(0, 0, 1))
         self.assertFalse(self.enemy._is_within_range(10, 10, 5))
 
+class TestAreaSkills(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Place enemies around the origin in a spatial grid."""
+        self.game = Mock()
+        self.ahead = Enemy(x=100, y=0, game=self.game)
+        self.behind = Enemy(x=-100, y=0, game=self.game)
+        self.side = Enemy(x=0, y=100, game=self.game)
+        self.far = Enemy(x=1000, y=0, game=self.game)
+        self.enemies = [self.ahead, self.behind, self.side, self.far]
+        self.grid = SpatialGrid(200)
+        self.grid.rebuild(self.enemies)
+
+    def resolve(self, skill):
+        candidates = self.grid.query_radius(0, 0, skill.reach)
+        return skill.select_targets(0, 0, 500, 0, candidates)
+
+    def test_grid_query_radius(self) -> None:
+        """Test that the grid returns only objects within the radius and follows moves."""
+        self.assertEqual(self.grid.query_radius(0, 0, 150), [self.behind, self.ahead, self.side])
+        self.grid.move(self.far, 50, 50)
+        self.assertIn(self.far, self.grid.query_radius(0, 0, 150))
+        self.grid.remove(self.far)
+        self.assertNotIn(self.far, self.grid.query_radius(0, 0, 150))
+
+    def test_circle(self) -> None:
+        """Test that a circle hits every enemy within its radius."""
+        skill = Skill("nova", None, cooldown=0, damage=10, shape=SHAPE_CIRCLE, radius=150)
+        self.assertCountEqual(self.resolve(skill), [self.ahead, self.behind, self.side])
+
+    def test_cone(self) -> None:
+        """Test that a cone only hits enemies in the aim direction."""
+        skill = Skill("cleave", None, cooldown=0, damage=10, shape=SHAPE_CONE, radius=150, angle=90)
+        self.assertEqual(self.resolve(skill), [self.ahead])
+
+    def test_line(self) -> None:
+        """Test that a line reaches far along the aim direction but stays narrow."""
+        skill = Skill("lance", None, cooldown=0, damage=10, shape=SHAPE_LINE, length=1200, width=40)
+        self.assertCountEqual(self.resolve(skill), [self.ahead, self.far])
+
+    def test_kill_rewards_are_returned_once(self) -> None:
+        """Test that a killing hit reports the kill and later hits on the corpse do not."""
+        self.assertTrue(self.ahead.take_damage(self.ahead.max_health))
+        self.assertFalse(self.ahead.take_damage(10))
+        self.game.player.increase_kill_count.assert_not_called()
+
+class TestEventLog(unittest.TestCase):
+
+    def test_ring_buffer_keeps_latest_events(self) -> None:
+        """Test that the log keeps only the newest events up to its capacity."""
+        log = EventLog(capacity=3)
+        for damage in range(5):
+            log.emit(DAMAGE, skill="attack_1", targets=1, damage=damage)
+        self.assertEqual([event.data["damage"] for event in log.events], [2, 3, 4])
+        self.assertEqual(log.sequence, 5)
+
+    def test_recent_filters_by_kind(self) -> None:
+        """Test that recent events can be limited to some kinds."""
+        log = EventLog()
+        log.emit(DAMAGE, skill="attack_1", targets=1, damage=10)
+        log.emit(KILL, kills=1, experience=10)
+        log.emit(DAMAGE, skill="attack_2", targets=2, damage=50)
+        self.assertEqual([event.kind for event in log.recent(2)], [KILL, DAMAGE])
+        self.assertEqual([event.sequence for event in log.recent(5, {DAMAGE})], [1, 3])
+
+    def test_file_drain(self) -> None:
+        """Test that the background writer appends every event as a JSON line."""
+        handle, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(handle)
+        try:
+            log = EventLog()
+            log.start_file_drain(path)
+            log.emit(KILL, kills=2, experience=25)
+            log.stop_file_drain()
+            with open(path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(lines[0]["kind"], KILL)
+            self.assertEqual(lines[0]["experience"], 25)
+        finally:
+            os.remove(path)
+
+class TestMetrics(unittest.TestCase):
+    def test_registry_renders_prometheus_text(self) -> None:
+        """Test that counters, labelled gauges and histograms render as Prometheus samples."""
+        registry = MetricsRegistry()
+        registry.counter("spawns_total", "Spawns").inc(3)
+        self.assertIs(registry.counter("spawns_total", "Spawns"), registry.metrics["spawns_total"])
+        registry.gauge("entities", "Entities", labels=("kind",)).labels("enemies").set_function(lambda: 7)
+        registry.gauge("names", "Names", labels=("name",)).labels('a\\b"c\nd').set(1)
+        histogram = registry.histogram("tick_seconds", "Tick time", buckets=(0.01, 0.1))
+        for value in (0.005, 0.05, 0.5):
+            histogram.observe(value)
+
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE spawns_total counter", lines)
+        self.assertIn("spawns_total 3", lines)
+        self.assertIn('entities{kind="enemies"} 7', lines)
+        self.assertIn('names{name="a\\\\b\\"c\\nd"} 1', lines)
+        self.assertIn('tick_seconds_bucket{le="0.1"} 2', lines)
+        self.assertIn('tick_seconds_bucket{le="+Inf"} 3', lines)
+        self.assertIn("tick_seconds_count 3", lines)
+        with self.assertRaises(ValueError):
+            registry.gauge("spawns_total", "Spawns")
+
+class TestAssetStore(unittest.TestCase):
+    def test_manifest_images_are_decoded_in_workers_and_converted_once(self) -> None:
+        """Test that every manifest image ends up converted, with alpha only where the manifest asks for it."""
+        pygame.display.set_mode((1, 1))
+        with tempfile.TemporaryDirectory() as directory:
+            entries = []
+            for name, alpha in (("tile", False), ("icon", True)):
+                path = os.path.join(directory, f"{name}.png")
+                pygame.image.save(pygame.Surface((4, 4), pygame.SRCALPHA), path)
+                entries.append({"path": path, "alpha": alpha})
+            manifest = os.path.join(directory, "manifest.json")
+            with open(manifest, "w", encoding="utf-8") as f:
+                json.dump({"images": entries}, f)
+
+            store = AssetStore()
+            store.start(manifest, workers=2)
+            self.assertTrue(store.loading)
+            store.finish()
+            tile, icon = (entry["path"] for entry in entries)
+            self.assertEqual((store.loading, store.progress), (False, 1.0))
+            self.assertIsNone(store.executor)
+            self.assertEqual(store.image(tile).get_flags() & pygame.SRCALPHA, 0)
+            self.assertTrue(store.image(icon).get_flags() & pygame.SRCALPHA)
+            self.assertIs(store.image(icon), store.images[icon])
+
+    def test_packed_sprites_are_views_of_their_atlas_page(self) -> None:
+        """Test that packing keeps rectangles apart on a page and packed images are served as subsurfaces."""
+        pages = pack_rects([(60, 40), (50, 50), (30, 20)], width=100, height=100)
+        self.assertEqual(pages, [[(1, 0, 0), (0, 0, 50), (2, 60, 50)]])
+        self.assertEqual(len(pack_rects([(80, 80), (80, 80)], width=100, height=100)), 2)
+
+        pygame.display.set_mode((1, 1))
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for name, color in (("red", (255, 0, 0, 255)), ("blue", (0, 0, 255, 128))):
+                sprite = pygame.Surface((8, 6), pygame.SRCALPHA)
+                sprite.fill(color)
+                paths.append(os.path.join(directory, f"{name}.png"))
+                pygame.image.save(sprite, paths[-1])
+            indexes = build_atlases(paths, os.path.join(directory, "atlas"))
+            manifest = os.path.join(directory, "manifest.json")
+            with open(manifest, "w", encoding="utf-8") as f:
+                json.dump({"atlases": indexes, "images": []}, f)
+
+            store = AssetStore()
+            store.start(manifest)
+            self.assertEqual(store.total, 2)
+            red, blue = (store.image(path) for path in paths)
+            self.assertEqual(red.get_parent().get_flags() & pygame.SRCALPHA, 0)
+            self.assertIsNotNone(blue.get_parent())
+            self.assertEqual((red.get_size(), tuple(red.get_at((7, 5)))), ((8, 6), (255, 0, 0, 255)))
+            self.assertEqual(tuple(blue.get_at((0, 0))), (0, 0, 255, 128))
+
+    def test_surface_cache_serves_decoded_pixels_until_the_file_changes(self) -> None:
+        """Test that a cached image matches the PNG, survives a touch without rehashing and is decoded again once the PNG is rewritten."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "icon.png")
+            icon = pygame.Surface((5, 3), pygame.SRCALPHA)
+            icon.fill((10, 20, 30, 40))
+            pygame.image.save(icon, path)
+            cache = SurfaceCache(os.path.join(directory, "cache"))
+            self.assertIsNone(cache.load(path))
+            cache.decode(path)
+
+            cached = cache.load(path)
+            self.assertEqual((cached.get_size(), tuple(cached.get_at((4, 2)))), ((5, 3), (10, 20, 30, 40)))
+            os.utime(path, ns=(0, 0))  # Touched, but the same pixels
+            self.assertIsNotNone(cache.load(path))
+            with patch("src.utils.surface_cache.file_hash") as file_hash:
+                self.assertIsNotNone(cache.load(path))  # The entry took the new time, so no hash is needed
+            file_hash.assert_not_called()
+
+            icon.fill((50, 60, 70, 255))
+            pygame.image.save(icon, path)
+            os.utime(path, ns=(10 ** 9, 10 ** 9))
+            self.assertIsNone(cache.load(path))
+            self.assertEqual(tuple(cache.decode(path).get_at((0, 0))), (50, 60, 70, 255))
+            self.assertEqual(tuple(cache.load(path).get_at((0, 0))), (50, 60, 70, 255))
+
+class TestMapRenderer(unittest.TestCase):
+    def test_animated_tiles_follow_the_animation_clock(self) -> None:
+        """Test that animated tiles are cut once and show the frame for the current tick while static tiles stay put."""
+        pygame.display.set_mode((1, 1))
+        animations = load_animated_tiles()
+        frames, frame_duration = animations[TILE_WATERFALL]
+        self.assertEqual(frames[0].get_size(), (600, 600))
+        self.assertIsNotNone(frames[0].get_parent())
+
+        grass, first, second = pygame.Surface((1, 1)), pygame.Surface((1, 1)), pygame.Surface((1, 1))
+        images = {TILE_GRASS_BODY: grass}
+        animations = {TILE_WATERFALL: ([first, second], 150)}
+        self.assertIs(current_tile_images(images, animations, ticks=149)[TILE_WATERFALL], first)
+        self.assertIs(current_tile_images(images, animations, ticks=150)[TILE_WATERFALL], second)
+        self.assertIs(current_tile_images(images, animations, ticks=300)[TILE_WATERFALL], first)
+        self.assertIs(current_tile_images(images, animations, ticks=150)[TILE_GRASS_BODY], grass)
+        self.assertNotIn(TILE_WATERFALL, images)
+
+    def test_world_renders_at_the_preset_scale_and_steps_down_when_slow(self) -> None:
+        """Test that the internal surface and reused images follow the scale, which only drops over budget in dynamic mode."""
+        screen = pygame.display.set_mode((100, 100))
+        image = pygame.Surface((40, 20))
+        high = RenderScaler(screen, QUALITY_PRESETS["high"])
+        self.assertIs(high.surface, screen)
+        self.assertIs(high.image(image), image)
+
+        low = RenderScaler(screen, QUALITY_PRESETS["low"])
+        self.assertEqual(low.surface.get_size(), (50, 50))
+        self.assertEqual(low.image(image).get_size(), (20, 10))
+        self.assertIs(low.image(image), low.image(image))
+
+        for _ in range(SLOW_FRAMES):
+            high.adjust(1.0)
+        self.assertEqual(high.scale, 1.0)
+        dynamic = RenderScaler(screen, QUALITY_PRESETS["high"], dynamic=True)
+        for _ in range(SLOW_FRAMES):
+            dynamic.adjust(1.0)
+        self.assertEqual(dynamic.scale, 0.75)
+        self.assertEqual(dynamic.surface.get_size(), (75, 75))
+
+class TestFramePacer(unittest.TestCase):
+    def test_static_screens_sleep_until_input_and_background_frames_are_throttled(self) -> None:
+        """Test that waiting returns queued input or nothing after the timeout, and unfocused frames are mostly skipped."""
+        pygame.display.set_mode((1, 1))
+        pygame.event.clear()
+        pacer = FramePacer()
+        self.assertEqual(pacer.wait(timeout=10), [])
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(0, 0)))
+        self.assertEqual([event.type for event in pacer.wait(timeout=10)], [pygame.MOUSEBUTTONDOWN])
+
+        with patch.object(pacer, "is_focused", return_value=True):
+            self.assertTrue(all(pacer.should_render() for _ in range(3)))
+        with patch.object(pacer, "is_focused", return_value=False):
+            self.assertEqual([pacer.should_render() for _ in range(3)], [True, False, False])
+
+class TestPlayerManager(unittest.TestCase):
+    def test_players_walk_to_their_own_targets_and_off_screen_ones_are_culled(self) -> None:
+        """Test that every player follows its own target and only players in view are returned, top to bottom."""
+        manager = PlayerManager(Mock(CHUNK_SIZE=200, collides_with_barrier=lambda pos: False))
+        local = manager.add_player(Player(None))
+        near, far = manager.add_player(Player(None), 7), manager.add_player(Player(None), 8)
+        manager.place_player(7, 5100, 4900)
+        manager.place_player(8, 9000, 9000)
+        manager.set_target(LOCAL_PLAYER_ID, (5000, 5020))
+        manager.set_target(7, (5100, 4800))
+        for _ in range(10):
+            manager.update()
+        self.assertEqual((local.position, near.position), ((5000, 5020), (5100, 4850)))
+        self.assertIsNone(manager.get_target(LOCAL_PLAYER_ID))
+        self.assertEqual(manager.visible_players(4000, 4000, 2000, 2000), [near, local])
+
+        manager.remove_player(7)
+        self.assertEqual(list(manager.remote_players()), [8])
+
+    def test_players_share_the_frames_of_their_sprite_sheet(self) -> None:
+        """Test that players on one sheet share frames, unscaled frames are views of the sheet and scaled ones are cached."""
+        pygame.display.set_mode((1, 1))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sheet.png")
+            pygame.image.save(pygame.Surface((1000, 700), pygame.SRCALPHA), path)
+            sprite_sheet = SpriteSheet.get(path)
+            self.addCleanup(SpriteSheet.sheets.pop, path)
+            self.assertIs(SpriteSheet.get(path), sprite_sheet)
+
+            first, second = Player(sprite_sheet), Player(sprite_sheet)
+            self.assertIs(first.animation_list[0], second.animation_list[0])
+            self.assertIs(first.image, second.image)
+            self.assertIs(first.image.get_parent(), sprite_sheet.sheet)
+            self.assertEqual(first.image.get_offset(), (0, 0))
+            scaled = sprite_sheet.get_image(1, 6, 100, 100, 0.5)
+            self.assertEqual((scaled.get_size(), scaled.get_parent()), ((50, 50), None))
+            self.assertIs(sprite_sheet.get_image(1, 6, 100, 100, 0.5), scaled)
+
+class TestInventory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Create a small inventory that records its change notifications."""
+        self.inventory = Inventory(capacity=2, max_stack=3)
+        self.changes = []
+        self.inventory.subscribe(lambda item, quantity: self.changes.append((item, quantity)))
+
+    def test_items_stack_up_to_the_limit(self) -> None:
+        """Test that duplicates share a slot and stop at max_stack."""
+        self.assertEqual(self.inventory.add("Stick", 2), 2)
+        self.assertEqual(self.inventory.add("Stick", 2), 1)
+        self.assertEqual(self.inventory.count("Stick"), 3)
+        self.assertEqual(len(self.inventory), 1)
+        self.assertEqual(self.changes, [("Stick", 2), ("Stick", 3)])
+
+    def test_capacity_and_removal(self) -> None:
+        """Test that a full inventory rejects new items until a slot is freed."""
+        self.inventory.add("Stick")
+        self.inventory.add("Gold Coin", 2)
+        self.assertEqual(self.inventory.add("Axe Head"), 0)
+        self.assertFalse(self.inventory.remove("Gold Coin", 3))
+        self.assertTrue(self.inventory.remove("Stick"))
+        self.assertNotIn("Stick", self.inventory)
+        self.assertEqual(self.inventory.add("Axe Head"), 1)
+        self.assertEqual(self.inventory.items, ["Gold Coin", "Axe Head"])
+        self.assertEqual(self.inventory.pop(), "Axe Head")
+
+class TestWorldItems(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Create a store that always drops two coins, and a player with a real inventory."""
+        sim_clock.use_fixed_step(1000)
+        self.store = WorldItemStore(200, loot_table=(LootEntry("Gold Coin", 1.0, 2, 2),))
+        self.player = Mock()
+        self.player.inventory = Inventory(max_stack=3)
+        self.player.add_to_inventory.side_effect = self.player.inventory.add
+        self.item_handler = ItemHandler(self.player)
+
+    def tearDown(self) -> None:
+        """Put the shared clock back in real-time mode."""
+        sim_clock.use_realtime()
+
+    def test_loot_is_picked_up_near_the_player(self) -> None:
+        """Test that drops land near the enemy and only items in reach are collected."""
+        enemy = Enemy(x=1000, y=1000, game=Mock())
+        self.store.drop_loot(enemy)
+        self.store.spawn("Stick", 5000, 5000)
+        self.assertEqual(len(self.store.visible(900, 900, 200, 200)), 1)
+
+        self.store.pickup_near(1000, 1000, self.item_handler)
+        self.assertEqual(self.player.inventory.count("Gold Coin"), 2)
+        self.assertEqual([world_item.item for world_item in self.store], ["Stick"])
+
+    def test_partial_pickup_and_expiry(self) -> None:
+        """Test that the remainder of a stack stays on the ground until its lifetime ends."""
+        self.player.inventory.add("Gold Coin", 2)
+        coins = self.store.spawn("Gold Coin", 0, 0, quantity=2, lifetime=LOOT_LIFETIME)
+        self.store.pickup_near(0, 0, self.item_handler)
+        self.assertEqual(coins.quantity, 1)
+
+        for _ in range(LOOT_LIFETIME // 1000):
+            sim_clock.advance()
+        self.store.remove_expired()
+        self.assertEqual(len(self.store), 0)
+
+    def test_zone_change_leaves_loot_behind(self) -> None:
+        """Test that changing zone offline clears dropped loot and places the quest items again."""
+        self.store.drop_loot(Enemy(x=1000, y=1000, game=Mock()))
+        game = Mock(transitioning=False, world_items=self.store)
+        game.quest_handler.quests_changed.side_effect = lambda: self.store.spawn("Quest Scroll", 300, 300)
+        TransitionManager(game).transition(ZONES["map"].transitions[0])
+
+        self.assertEqual([world_item.item for world_item in self.store], ["Quest Scroll"])
+        self.assertEqual(len(self.store.expiring), 0)
+        self.assertEqual(game.zone, ZONES["map2"])
+
+class TestQuestEngine(unittest.TestCase):
+
+    QUESTS = [
+        {
+            "id": "fetch",
+            "giver": 20,
+            "stages": [
+                {"id": "accept", "trigger": {"type": "talk", "npc": 20}, "dialogue": "start"},
+                {"id": "explore", "trigger": {"type": "region_entered", "region": [400, 400, 400, 200]}},
+                {"id": "find", "trigger": {"type": "item_gained", "item": "Relic"}, "hint": {"npc": 20, "text": "Find the relic."}},
+                {
+                    "id": "return", "trigger": {"type": "talk", "npc": 20}, "requires": ["Relic"], "consume": ["Relic"],
+                    "rewards": {"items": ["Gold Coin"], "flags": ["fetched"]}, "dialogue": "done",
+                },
+            ],
+        },
+        {"id": "sequel", "giver": 21, "prerequisites": ["fetch"], "stages": [
+            {"id": "accept", "trigger": {"type": "talk", "npc": 21}},
+        ]},
+    ]
+
+    def setUp(self) -> None:
+        """Create a quest engine with a mock player holding a real inventory."""
+        self.player = Mock()
+        self.player.inventory = Inventory()
+        self.player.add_to_inventory.side_effect = self.player.inventory.add
+        self.player.remove_item_from_inventory.side_effect = self.player.inventory.remove
+        self.presenter = Mock()
+        self.engine = QuestEngine(compile_quests(self.QUESTS, 200), self.player, self.presenter)
+
+    def test_quest_advances_only_on_matching_events(self) -> None:
+        """Test a quest moving through talk, region, item and turn-in stages."""
+        self.engine.notify(TRIGGER_TALK, 21)
+        self.engine.notify(TRIGGER_ITEM_GAINED, "Relic")
+        self.assertEqual(self.engine.progress, {"fetch": 0, "sequel": 0})
+
+        self.engine.notify(TRIGGER_TALK, 20)
+        self.presenter.show_dialogue.assert_called_with("start")
+        self.engine.notify(TRIGGER_REGION_ENTERED, (0, 0))
+        self.assertEqual(self.engine.current_stage("fetch").id, "explore")
+        self.engine.notify(TRIGGER_REGION_ENTERED, (3, 2))
+        self.assertEqual(self.engine.current_stage("fetch").id, "find")
+
+        self.engine.notify(TRIGGER_TALK, 20)
+        self.presenter.show_hint.assert_called_with("Find the relic.")
+        self.engine.notify(TRIGGER_ITEM_GAINED, "Relic")
+        self.player.inventory.add("Relic")
+        self.engine.notify(TRIGGER_TALK, 20)
+
+        self.assertTrue(self.engine.is_completed("fetch"))
+        self.assertEqual(self.player.inventory.items, ["Gold Coin"])
+        self.assertTrue(self.engine.has_flag("fetched"))
+        self.assertEqual(self.engine.quest_givers(), [21])
+
+    def test_state_round_trip(self) -> None:
+        """Test that restored progress resumes listening at the saved stage."""
+        self.engine.set_state({"progress": {"fetch": COMPLETED, "sequel": 0}, "flags": ["fetched"]})
+        self.assertEqual(list(self.engine.listeners), [(TRIGGER_TALK, 21)])
+        self.engine.notify(TRIGGER_TALK, 21)
+        self.assertEqual(self.engine.get_state(), {"progress": {"fetch": COMPLETED, "sequel": COMPLETED}, "flags": ["fetched"]})
+
+class TestInputRecorder(unittest.TestCase):
+
+    def setUp(self) -> None:
+        """Create a temporary file for the input log."""
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+
+    def tearDown(self) -> None:
+        """Remove the input log and restore the real-time clock."""
+        os.remove(self.path)
+        sim_clock.use_realtime()
+
+    def test_log_round_trip(self) -> None:
+        """Test that recorded commands and state hashes are read back unchanged."""
+        recorder = InputRecorder(self.path, (800, 600), seed=7)
+        recorder.record(0, InputCommand(MOVE_TARGET, 4300.25, 4350.5))
+        recorder.record_state(0, 123)
+        recorder.record(2, InputCommand(SELECT_SKILL, index=1))
+        recorder.record(2, InputCommand(USE_SKILL, 10.0, 20.0))
+        recorder.record_state(2, 456)
+        recorder.close()
+
+        replayer = InputReplayer(self.path)
+        self.assertEqual(replayer.seed, 7)
+        self.assertEqual(replayer.screen_size, (800, 600))
+        self.assertEqual(replayer.last_tick, 2)
+        self.assertEqual(replayer.commands[0], [InputCommand(MOVE_TARGET, 4300.25, 4350.5)])
+        self.assertEqual(replayer.commands[2], [InputCommand(SELECT_SKILL, index=1), InputCommand(USE_SKILL, 10.0, 20.0)])
+        self.assertEqual(replayer.hashes, {0: 123, 2: 456})
+
+    def test_fixed_step_clock(self) -> None:
+        """Test that the simulation clock only moves when advanced in fixed-step mode."""
+        InputRecorder(self.path, (800, 600), seed=7).start()
+        self.assertEqual(sim_clock.get_ticks(), 0)
+        for _ in range(60):
+            sim_clock.advance()
+        self.assertEqual(sim_clock.get_ticks(), 1000)
+        self.assertAlmostEqual(sim_clock.time(), 1.0)
+
+    def test_recorded_session_replays_without_divergence(self) -> None:
+        """Test that a recorded game of moves, spawns and skills replays with every tick's state hash matching."""
+        pygame.init()
+        pygame.display.set_mode((800, 600))
+        recorder = InputRecorder(self.path, (800, 600), seed=11)
+        recorder.start()
+        game = Game((800, 600), pygame.display.get_surface())
+        game.recorder = recorder
+        game.quest_handler.interactive = False
+        script = {
+            0: [InputCommand(SPAWN_ENEMY, 5200, 5000), InputCommand(SPAWN_ENEMY, 4800, 5100)],
+            5: [InputCommand(SELECT_SKILL, index=0), InputCommand(USE_SKILL, 5200, 5000)],
+            40: [InputCommand(MOVE_TARGET, 5150, 5050)],
+            90: [InputCommand(SELECT_SKILL, index=1), InputCommand(USE_SKILL, 4800, 5100)],
+            150: [InputCommand(MOVE_TARGET, 4700, 4900), InputCommand(USE_SKILL, 4800, 5100)],
+            220: [InputCommand(SELECT_SKILL, index=0), InputCommand(USE_SKILL, 5200, 5000)],
+        }
+        for tick in range(300):
+            for command in script.get(tick, ()):
+                game.input_handler.dispatch(command)
+            game.handle_world_events()
+            game.update()
+        recorder.close()
+        recorded = (game.player.position, [(enemy.x, enemy.y, enemy.health) for enemy in game.enemies])
+        self.assertTrue(any(enemy.health < enemy.max_health for enemy in game.enemies))
+
+        replayer = InputReplayer(self.path)
+        self.assertEqual(len(replayer.hashes), 300)
+        replayer.start()
+        replay = Game((800, 600), pygame.display.get_surface())
+        result = replayer.run(replay)
+        self.assertEqual(result.ticks, 300)
+        self.assertEqual(result.mismatches, [])
+        self.assertEqual((replay.player.position, [(enemy.x, enemy.y, enemy.health) for enemy in replay.enemies]), recorded)
+        self.assertNotEqual(recorded[0], (5000, 5000))
+
+class TestGameServer(unittest.TestCase):
+
+    def tearDown(self) -> None:
+        """Put the shared clock back in real-time mode."""
+        sim_clock.use_realtime()
+
+    def test_client_commands_drive_the_server_simulation(self) -> None:
+        """Test that a connected client's move is applied and debug commands are rejected."""
+        async def scenario():
+            server = GameServer(ZoneWorld(), port=0, snapshot_interval=1)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(encode_json(HELLO, {"name": "tester"}))
+            _, payload = await read_frame(reader)
+            connection = server.connections[decode_json(payload)["player_id"]]
+
+            writer.write(encode_command(0, InputCommand(SPAWN_ENEMY, 5000, 5000)))
+            writer.write(encode_command(1, InputCommand(MOVE_TARGET, 5010, 5000)))
+            await writer.drain()
+            while not connection.pending:
+                await asyncio.sleep(0.01)
+            server.tick()
+            server.tick()
+
+            decoder = SnapshotDecoder()
+            snapshot = None
+            while snapshot is None or snapshot.tick < 2:
+                message_type, payload = await read_frame(reader)
+                if message_type == SNAPSHOT:
+                    snapshot = decoder.decode(payload)
+            writer.close()
+            await server.stop()
+            return connection, snapshot
+
+        connection, (_, ack, _, state) = asyncio.run(scenario())
+        self.assertEqual(connection.invalid_commands, 1)
+        self.assertEqual(ack, 1)
+        you = describe_record(YOU, state["you"])
+        self.assertEqual((you["x"], you["y"]), (5010, 5000))
+        world = ZoneWorld()
+        interest_cells = world.add_player(2, "observer").interest.cells
+        visible = {index for index, enemy in enumerate(world.enemies)
+                   if interest_cells[0] <= enemy.x // world.CHUNK_SIZE <= interest_cells[2]
+                   and interest_cells[1] <= enemy.y // world.CHUNK_SIZE <= interest_cells[3]}
+        self.assertEqual(set(state["enemies"]), visible)
+
+    def test_only_a_serving_server_steps_the_shared_clock(self) -> None:
+        """Test that creating a server leaves the clock alone and serving uses fixed steps until stopped."""
+        async def scenario():
+            server = GameServer(ZoneWorld(spawn_enemies=False), port=0, tick_rate=10)
+            created = sim_clock.is_fixed_step
+            serving = asyncio.create_task(server.serve_forever())
+            while not server.running:
+                await asyncio.sleep(0.01)
+            during = sim_clock.is_fixed_step
+            await server.stop()
+            await serving
+            return created, during, sim_clock.is_fixed_step
+
+        self.assertEqual(asyncio.run(scenario()), (False, True, False))
+
+    def test_a_connected_name_cannot_log_in_twice(self) -> None:
+        """Test that a second login under a connected player's name is refused, so two sessions never share a save."""
+        async def scenario():
+            server = GameServer(ZoneWorld(spawn_enemies=False), port=0)
+            await server.start()
+            first_reader, first_writer = await asyncio.open_connection("127.0.0.1", server.port)
+            first_writer.write(encode_json(HELLO, {"name": "twin"}))
+            await read_frame(first_reader)
+            second_reader, second_writer = await asyncio.open_connection("127.0.0.1", server.port)
+            second_writer.write(encode_json(HELLO, {"name": "twin"}))
+            with self.assertRaises(asyncio.IncompleteReadError):
+                await read_frame(second_reader)
+            names = [connection.world_player.name for connection in server.connections.values()]
+            first_writer.close()
+            second_writer.close()
+            await server.stop()
+            return names
+
+        self.assertEqual(asyncio.run(scenario()), ["twin"])
+
+    def test_metrics_endpoint_serves_server_metrics(self) -> None:
+        """Test that the metrics endpoint answers an HTTP scrape with tick times and entity counts."""
+        async def scenario():
+            server = GameServer(ZoneWorld(), port=0, tick_rate=10, metrics_port=0)
+            await server.start()
+            server.tick()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.metrics_endpoint.port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+            await server.stop()
+            return response.decode(), len(server.world.enemies)
+
+        response, enemies = asyncio.run(scenario())
+        head, _, body = response.partition("\r\n\r\n")
+        self.assertTrue(head.startswith("HTTP/1.1 200 OK"))
+        lines = body.splitlines()
+        self.assertIn('server_world_entities{kind="enemies"} ' + str(enemies), lines)
+        self.assertIn("server_world_tick 1", lines)
+        self.assertTrue(any(line.startswith("server_tick_seconds_count ") and int(line.split()[1]) >= 1 for line in lines))
+
+    def test_metrics_endpoint_exports_each_connected_client(self) -> None:
+        """Test that a scrape shows the send queue and dropped snapshots of each client until it disconnects."""
+        async def scrape(server):
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.metrics_endpoint.port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+            return response.decode().partition("\r\n\r\n")[2].splitlines()
+
+        async def scenario():
+            server = GameServer(ZoneWorld(spawn_enemies=False), port=0, tick_rate=10, metrics_port=0)
+            await server.start()
+            clients = []
+            for name in ("first", "second"):
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                writer.write(encode_json(HELLO, {"name": name}))
+                await read_frame(reader)
+                clients.append(writer)
+            both = await scrape(server)
+            clients[0].close()
+            while len(server.connections) > 1:
+                await asyncio.sleep(0.01)
+            one = await scrape(server)
+            clients[1].close()
+            await server.stop()
+            return both, one
+
+        both, one = asyncio.run(scenario())
+        for client in ("1", "2"):
+            self.assertIn(f'server_client_queued_bytes{{client="{client}"}} 0', both)
+            self.assertIn(f'server_client_snapshots_dropped_total{{client="{client}"}} 0', both)
+        self.assertFalse(any('client="1"' in line for line in one))
+        self.assertIn('server_client_queued_bytes{client="2"} 0', one)
+
+    def test_delta_snapshot_bandwidth(self) -> None:
+        """Report bytes per client per tick for eight players wandering map.json, and check deltas decode exactly."""
+        world = ZoneWorld()
+        clients = []
+        for player_id in range(1, 9):
+            world_player = world.add_player(player_id, f"bot{player_id}")
+            world_player.target_pos = (4000 + player_id * 150, 4500)
+            clients.append((world_player, SnapshotEncoder(), SnapshotDecoder()))
+
+        ticks, interval, total_bytes = 600, 3, 0
+        for _ in range(ticks):
+            world.step()
+            if world.tick % interval:
+                continue
+            for world_player, encoder, decoder in clients:
+                state = world.snapshot(world_player)
+                payload = encoder.encode(world.tick, 0, None, state)
+                total_bytes += len(payload)
+                tick, _, _, decoded = decoder.decode(payload)
+                self.assertEqual(decoded, state)
+                encoder.acknowledge(tick)
+
+        per_client_tick = total_bytes / (len(clients) * ticks)
+        print(f"\n{len(world.enemies)} enemies, {len(clients)} clients: {per_client_tick:.1f} bytes per client per tick")
+        self.assertLess(per_client_tick, 100)
+
+    def test_interest_area_adds_and_removes_players(self) -> None:
+        """Test that players only appear in each other's snapshots while within the view radius."""
+        world = ZoneWorld(spawn_enemies=False, view_radius=2)
+        near, far = world.add_player(1, "near"), world.add_player(2, "far")
+        far.player._x = far.player._y = 1000
+        encoder, decoder = SnapshotEncoder(), SnapshotDecoder()
+
+        def receive():
+            tick, _, _, state = decoder.decode(encoder.encode(world.tick, 0, None, world.snapshot(near)))
+            encoder.acknowledge(tick)
+            return state
+
+        world.step()
+        self.assertEqual(receive()["players"], {})
+        far.player._x, far.player._y = near.player._x + 300, near.player._y
+        world.step()
+        self.assertIn(2, receive()["players"])
+        far.player._x = near.player._x + 1000
+        world.step()
+        self.assertEqual(receive()["players"], {})
+
+    def test_player_handed_off_between_zones(self) -> None:
+        """Test that a player walking into a transition leaves the zone with their state and arrives in the destination."""
+        source = ZoneWorld(spawn_enemies=False, zone=ZONES["map"])
+        world_player = source.add_player(1, "traveller")
+        world_player.player.add_to_inventory("Wood", 3)
+        world_player.player.level = 4
+        world_player.player.position = (9850, 250)
+        source.step()
+        self.assertEqual(source.departures, [(world_player, ZONES["map"].transitions[0])])
+
+        state = source.depart(world_player, ZONES["map"].transitions[0])
+        self.assertNotIn(1, source.players)
+        destination = ZoneWorld(spawn_enemies=False, zone=ZONES["map2"])
+        arrived = destination.add_player(7, "traveller", json.loads(json.dumps(state)))
+        self.assertEqual(arrived.player.position, (9800, 9800))
+        self.assertEqual(arrived.player.level, 4)
+        self.assertEqual(arrived.player.inventory.to_dict(), {"Wood": 3, "Health Potion": 1})
+        self.assertEqual(destination.map_file, "maps/map2.json")
+
+    def test_regions_migrate_players_and_forward_ghost_hits(self) -> None:
+        """Test that a player crossing a region border migrates and that hits on a ghost enemy kill it in its region."""
+        sim_clock.use_fixed_step(1000)  # Every tick is past the skill cooldown
+        self.addCleanup(sim_clock.use_realtime)
+        layout = RegionLayout(2, 1)
+        left, right = RegionWorld(ZONES["map"], layout, 0), RegionWorld(ZONES["map"], layout, 1)
+        enemy = right.enemies[0]
+        enemy.x, enemy.y, enemy.health = 5040, 5000, 10
+        enemy_id = right.enemy_ids[enemy]
+
+        orders = empty_orders()
+        orders["players"].append((1, "crosser", None, None))
+        orders["commands"].append((1, InputCommand(MOVE_TARGET, 4900, 5000)))
+        report = right.run_tick(orders)
+        player_id, name, state, target_pos, destination = report["emigrants"][0]
+        self.assertEqual((player_id, destination), (1, 0))
+        self.assertNotIn(1, right.players)
+
+        orders = empty_orders()
+        orders["players"].append((player_id, name, state, target_pos))
+        orders["ghost_enemies"].append((enemy_id, enemy.x, enemy.y, True))
+        orders["commands"].append((1, InputCommand(USE_SKILL, enemy.x, enemy.y)))
+        report = left.run_tick(orders)
+        self.assertIn(1, left.players)
+        self.assertEqual(report["hits"], [(enemy_id, 10, 1)])
+
+        orders = empty_orders()
+        orders["hits"] = report["hits"]
+        report = right.run_tick(orders)
+        self.assertFalse(enemy.alive)
+        self.assertEqual(report["rewards"], [(1, enemy.get_experience_reward())])
+
+    def test_skill_hits_enemy_where_the_client_saw_it(self) -> None:
+        """Test that a skill is checked against enemies rewound to the client's view tick, and only then."""
+        sim_clock.use_fixed_step(1000)  # Every tick is past the skill cooldown
+        self.addCleanup(sim_clock.use_realtime)
+        world = ZoneWorld(spawn_enemies=False)
+        world_player = world.add_player(1, "shooter")
+        world.spawn_manager.spawn_enemy(5090, 5000)
+        enemy = world.enemies[0]
+        enemy.speed = 0  # Walked by hand below
+        world.step()
+        seen_tick = world.tick  # The client drew the enemy in reach at this tick
+        for _ in range(10):
+            enemy.x += 2
+            world.step()
+
+        world.apply_command(world_player, InputCommand(USE_SKILL, enemy.x, 5000))
+        self.assertEqual(enemy.health, enemy.max_health)
+        world.apply_command(world_player, InputCommand(USE_SKILL, 5090, 5000, view_tick=seen_tick))
+        self.assertLess(enemy.health, enemy.max_health)
+        self.assertEqual(enemy.x, 5110)
+        self.assertIn(enemy, world.enemy_grid.query_radius(5110, 5000, 1))
+
+    def test_enemy_history_is_bounded_and_interpolated(self) -> None:
+        """Test that the history keeps only its capacity of ticks and samples between them."""
+        history = EnemyHistory(capacity=4)
+        enemy = Mock(x=0.0, y=0.0, alive=True)
+        for tick in range(1, 11):
+            enemy.x = tick * 10.0
+            history.record(tick, [enemy])
+        self.assertEqual((len(history), history.oldest_tick(), history.newest_tick()), (4, 7, 10))
+        self.assertEqual(history.find(8.5), 1)
+        before, after, fraction = history.sample(8.5)
+        self.assertEqual((before[enemy][0], after[enemy][0], fraction), (80.0, 90.0, 0.5))
+        before, _, _ = history.sample(2)  # Older than kept: the oldest tick
+        self.assertEqual(before[enemy][0], 70.0)
+
+    def test_player_store_writes_behind_and_restores(self) -> None:
+        """Test that a saved player is served from memory before the write and from the file after a restart."""
+        world = ZoneWorld(spawn_enemies=False)
+        world_player = world.add_player(1, "saver")
+        world_player.player.level = 3
+        world_player.player.add_to_inventory("Wood", 2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "players.db")
+            store = PlayerStore(path, flush_interval=60)
+            store.start()
+            store.save("saver", world_player.get_state())
+            self.assertEqual(store.load("saver")["player"]["level"], 3)
+            store.close()
+            self.assertEqual(store.writes, 1)
+
+            restored = world.add_player(2, "saver", PlayerStore(path).load("saver"))
+        self.assertEqual(restored.player.level, 3)
+        self.assertEqual(restored.player.inventory.to_dict(), {"Wood": 2})
+
+    def test_login_is_sent_to_the_zone_the_player_was_saved_in(self) -> None:
+        """Test that a player saved on the second map is handed to its server, or respawned here without one."""
+        world = ZoneWorld(spawn_enemies=False, zone=ZONES["map"])
+        state = world.departure_state(world.add_player(1, "wanderer"), ZONES["map"].transitions[0])
+        self.assertEqual(state["zone"], "map2")
+
+        async def scenario(directory):
+            store = PlayerStore(os.path.join(directory, "players.db"))
+            store.start()
+            store.save("wanderer", state)
+            addresses, inboxes = {}, {"map": queue.Queue(), "map2": queue.Queue()}
+            servers = {
+                name: GameServer(ZoneWorld(spawn_enemies=False, zone=ZONES[name]), port=0, tick_rate=60,
+                                 zone_link=ZoneLink(name, addresses, inboxes), store=store)
+                for name in ("map", "map2")
+            }
+            for name, server in servers.items():
+                await server.start()
+                addresses[name] = (server.host, server.port)
+            ticking = [asyncio.create_task(server.run()) for server in servers.values()]
+            client = NetworkClient(port=servers["map"].port, name="wanderer")
+            await asyncio.to_thread(client.connect)
+            arrived = [connection.world_player.player.position for connection in servers["map2"].connections.values()]
+            client.close()
+            alone = GameServer(ZoneWorld(spawn_enemies=False, zone=ZONES["map"]), port=0, store=store)
+            await alone.start()
+            respawned = NetworkClient(port=alone.port, name="wanderer")
+            await asyncio.to_thread(respawned.connect)
+            reset = [connection.world_player.player.position for connection in alone.connections.values()]
+            respawned.close()
+            for server in (*servers.values(), alone):
+                await server.stop()
+            await asyncio.gather(*ticking)
+            store.close()
+            return client.map_file, arrived, respawned.map_file, reset
+
+        with tempfile.TemporaryDirectory() as directory:
+            map_file, arrived, respawned_map, reset = asyncio.run(scenario(directory))
+        self.assertEqual((map_file, arrived), ("maps/map2.json", [(9800, 9800)]))
+        self.assertEqual((respawned_map, reset), ("maps/map.json", [INITIAL_PLAYER_POSITION]))
+
+    def test_slow_client_loses_snapshots_then_connection(self) -> None:
+        """Test that messages go out in one write per tick, and a client that stops reading is dropped."""
+        server = GameServer(ZoneWorld(spawn_enemies=False), port=0, tick_rate=10, snapshot_interval=1)
+        writer = Mock()
+        writer.is_closing.return_value = False
+        writer.transport.get_write_buffer_size.return_value = 0
+        connection = ClientConnection(server.world.add_player(1, "slow"), Mock(), writer)
+        server.connections[1] = connection
+        connection.world_player.notices.append(("hint", "Hello"))
+        server.tick()
+        self.assertEqual((writer.write.call_count, connection.writes), (1, 1))
+
+        writer.transport.get_write_buffer_size.return_value = SEND_BUFFER_LIMIT + 1
+        for _ in range(int(SLOW_CLIENT_TIMEOUT * server.tick_rate)):
+            server.tick()
+        self.assertEqual(connection.stats()["snapshots_dropped"], SLOW_CLIENT_TIMEOUT * server.tick_rate)
+        self.assertEqual(writer.write.call_count, 1)
+        writer.transport.abort.assert_not_called()
+        server.tick()
+        writer.transport.abort.assert_called_once()
+
+class TestNetworkClient(unittest.TestCase):
+    def test_prediction_matches_server_under_latency(self) -> None:
+        """Test that the predicted player stays on the server's path with 150 ms of latency each way."""
+        world = ZoneWorld(spawn_enemies=False)
+        remote = world.add_player(1, "remote")
+        player = Player(None)
+        prediction = PlayerPrediction(player, world.collides_with_barrier)
+        latency = 9  # Ticks each way
+        to_server, to_client, errors = deque(), deque(), []
+        last_seq, last_seq_tick, next_seq = -1, None, 0
+        clicks = {5: (5300, 5000), 40: (5300, 5300), 42: (5200, 5350), 90: (4800, 5100)}
+
+        for tick in range(300):
+            if tick in clicks:
+                command = InputCommand(MOVE_TARGET, *clicks[tick])
+                prediction.apply(next_seq, command)
+                to_server.append((tick + latency, next_seq, command))
+                next_seq += 1
+            prediction.step()
+
+            while to_server and to_server[0][0] <= tick:
+                _, last_seq, command = to_server.popleft()
+                world.apply_command(remote, command)
+                last_seq_tick = world.tick
+            world.step()
+            if world.tick % 3 == 0:
+                you = describe_record(YOU, you_record(remote.player, 0))
+                to_client.append((tick + latency, world.tick, last_seq, last_seq_tick, you["x"], you["y"]))
+
+            while to_client and to_client[0][0] <= tick:
+                _, snapshot_tick, ack, ack_tick, x, y = to_client.popleft()
+                prediction.reconcile(x, y, ack, snapshot_tick - ack_tick if ack_tick is not None else None)
+                errors.append(prediction.last_error)
+
+        self.assertLess(max(errors), 1)
+        self.assertEqual(player.position, remote.player.position)
+
+    def test_interpolation_between_snapshots(self) -> None:
+        """Test that remote enemies are drawn between the two snapshots around the render time."""
+        class Spot:
+            def __init__(self, x):
+                self.x, self.y, self.health, self.level, self.alive = x, 100, 100, 1, True
+
+        buffer = InterpolationBuffer(tick_rate=60)
+        for tick, x in ((3, 100), (6, 130)):
+            buffer.add(tick, {"players": {}, "enemies": {7: enemy_record(Spot(x))}}, now=tick / 60 - 3 / 60)
+        # Drawn `delay` ticks behind the newest snapshot: tick 4.5 is halfway between them
+        now = (4.5 + buffer.delay - 3) / 60
+        x, y, _ = buffer.sample(now)["enemies"][7]
+        self.assertAlmostEqual(x, 115)
+        self.assertEqual(y, 100)
+
+    def test_dialogue_keeps_reading_from_the_server(self) -> None:
+        """Test that messages arriving while a quest dialogue blocks are read at once and applied after it."""
+        client = Mock(tick_rate=60, connected=False)
+        client.poll.side_effect = [[(NOTICE, {"dialogue": "intro"})], [(NOTICE, {"hint": "Later"})]]
+        game = Mock()
+        session = NetworkSession(game, client)
+        self.assertEqual(game.quest_handler.idle, session.keep_alive)
+        # The dialogue polls through `idle` while it waits for a click, as QuestHandler does
+        game.quest_handler.show_dialogue.side_effect = lambda key: game.quest_handler.idle()
+        session.update()
+        self.assertEqual(client.poll.call_count, 2)
+        game.quest_handler.show_hint.assert_called_once_with("Later")
+
+    def test_bot_fights_enemy_in_reach(self) -> None:
+        """Test that a load test bot switches to the cone skill and aims it at a nearby enemy."""
+        client = Mock()
+        client.poll.return_value = [(SNAPSHOT, Mock(tick=12, state={
+            "you": you_record(Player(None), 0),
+            "players": {},
+            "enemies": {3: enemy_record(Enemy(5150, 5000, Mock()))},
+            "items": {},
+        }))]
+        bot = Bot(client, random.Random(0))
+        bot.update(now=1.0)
+        sent = [call.args[0] for call in client.send_command.call_args_list]
+        self.assertEqual(sent, [InputCommand(SELECT_SKILL, index=1), InputCommand(USE_SKILL, 5150, 5000, view_tick=12)])
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,10 @@
 # ui/main.py
 import pygame
 from ui.button import Button
+from src.utils import assets
+
+BACKGROUND_IMAGE = "assets/mountain.png"
+PROGRESS_BAR_SIZE = (400, 24)
 
 class Menu:
     """
@@ -27,18 +31,34 @@ class Menu:
         ]
         self.title_text = self.font.render("Welcome to Maras", True, (255, 255, 255))
         self.title_rect = self.title_text.get_rect(center=(self.width // 2, self.height // 4))
-        self.background_image = pygame.image.load("assets/mountain.png").convert()
+        self.loading_text = self.button_font.render("Loading...", True, (255, 255, 255))
+        self.background_image = None  # Scaled once the asset loader has it
+
+    def get_background(self, wait=True):
+        """
+        Gets the background scaled to the screen.
+
+        Args:
+            wait (bool): Whether to wait for the image if it is still loading.
 
-        self.background_image = pygame.transform.scale(self.background_image, (self.width, self.height))
+        Returns:
+            pygame.Surface: The background, or None if it is not loaded yet and `wait` is False.
+        """
+        if self.background_image is None and (wait or assets.is_ready(BACKGROUND_IMAGE)):
+            self.background_image = pygame.transform.scale(assets.image(BACKGROUND_IMAGE), (self.width, self.height))
+        return self.background_image
     
-    def handle_events(self):
+    def handle_events(self, events=None):
         """
         Handles events such as mouse clicks and window close events.
 
+        Args:
+            events (list): The events to handle; defaults to the events pending in the queue.
+
         Returns:
             str or None: The choice made by the user ('play game', 'exit', or 'quit') or None if no choice was made.
         """
-        for event in pygame.event.get():
+        for event in events if events is not None else pygame.event.get():
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left mouse button
                 choice = self.handle_button_click(event.pos)
                 if choice:
@@ -64,7 +84,28 @@ class Menu:
         """
         Renders the menu on the screen.
         """
-        self.screen.blit(self.background_image, (0, 0))
+        self.screen.blit(self.get_background(), (0, 0))
         self.screen.blit(self.title_text, self.title_rect)
         for button in self.buttons:
             button.render(self.screen)
+
+    def render_progress(self, progress):
+        """
+        Renders the loading screen with a progress bar.
+
+        Args:
+            progress (float): The share of the assets loaded, from 0 to 1.
+        """
+        background = self.get_background(wait=False)
+        if background is not None:
+            self.screen.blit(background, (0, 0))
+        else:
+            self.screen.fill((0, 0, 0))
+        self.screen.blit(self.title_text, self.title_rect)
+
+        bar_width, bar_height = PROGRESS_BAR_SIZE
+        bar_rect = pygame.Rect(0, 0, bar_width, bar_height)
+        bar_rect.center = (self.width // 2, self.height // 2)
+        pygame.draw.rect(self.screen, (255, 255, 255), (bar_rect.x, bar_rect.y, int(bar_width * progress), bar_height))
+        pygame.draw.rect(self.screen, (255, 255, 255), bar_rect, 2)
+        self.screen.blit(self.loading_text, self.loading_text.get_rect(midbottom=(bar_rect.centerx, bar_rect.top - 10)))